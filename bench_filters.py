@@ -0,0 +1,67 @@
+"""Accuracy and speed benchmark for the landmark filters (landmark_filters.py).
+
+Runs each filter over synthetic traces with known ground truth
+(synthetic_traces.py): every landmark either moves on a circle (about a
+curl's speed) or stands still, and Gaussian jitter is added to the detected
+x, y, z:
+
+    python bench_filters.py --jitter 0.005
+
+prints the RMS error against the ground truth and the time per frame.
+--sweep also tries a grid of filter parameters around the defaults.
+"""
+import argparse
+import itertools
+import time
+
+from landmark_filters import SMOOTHING_METHODS, make_filter, smooth_trace
+from synthetic_traces import rms_error, synthetic_trace
+
+SWEEP = {
+    'one_euro': {'min_cutoff': (0.3, 1.0, 3.0), 'beta': (10.0, 30.0, 60.0, 100.0)},
+    'kalman': {'process_noise': (0.01, 0.1, 1.0), 'measurement_noise': (1e-5, 1e-4, 1e-3)},
+}
+
+
+def measure(method, truth, noisy, fps, **params):
+    """(RMS error, seconds per frame) of one filter over a trace"""
+    landmark_filter = make_filter(method, fps, **params)
+    if landmark_filter is None:
+        return rms_error(noisy, truth), 0.0
+    start = time.perf_counter()
+    smoothed = smooth_trace(noisy, landmark_filter)
+    elapsed = time.perf_counter() - start
+    return rms_error(smoothed, truth), elapsed / len(noisy)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--jitter', type=float, default=0.005, help="std of the detection noise")
+    parser.add_argument('--sweep', action='store_true', help="Also try a grid of filter parameters")
+    args = parser.parse_args(argv)
+
+    traces = {label: synthetic_trace(args.frames, args.fps, moving, args.jitter)
+              for label, moving in (('moving', True), ('still', False))}
+
+    print(f"{'':24}{'moving':>10}{'still':>10}{'us/frame':>10}")
+    for method in SMOOTHING_METHODS:
+        results = [measure(method, truth, noisy, args.fps) for truth, noisy in traces.values()]
+        label = 'raw' if method == 'none' else method
+        print(f"{label:24}{results[0][0]:10.4f}{results[1][0]:10.4f}{results[0][1] * 1e6:10.1f}")
+
+    if not args.sweep:
+        return
+    for method, grid in SWEEP.items():
+        print(f"\n{method} sweep")
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid, values))
+            errors = [measure(method, truth, noisy, args.fps, **params)[0] for truth, noisy in traces.values()]
+            label = ", ".join(f"{key}={value:g}" for key, value in params.items())
+            print(f"  {label:44}{errors[0]:10.4f}{errors[1]:10.4f}")
+
+
+if __name__ == "__main__":
+    main()
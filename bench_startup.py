@@ -0,0 +1,105 @@
+"""Startup-time benchmark for the GUI and the headless CLI.
+
+Every measurement runs in a fresh interpreter so module imports are cold
+(as far as the OS file cache allows):
+
+    python bench_startup.py --runs 5
+
+gui: time to first window (process start -> window mapped) and time to
+first inference (process start -> first pose result on a blank frame, as
+when the user first clicks an analysis action). cli: time to import
+pose_engine, and whether that pulled in tkinter, PIL or mediapipe.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _child_gui(preload_model):
+    start = time.perf_counter()
+    import tkinter as tk
+    from smartan_task import PoseAnalysisGUI
+    imported = time.perf_counter()
+
+    root = tk.Tk()
+    app = PoseAnalysisGUI(root, preload_model=preload_model)
+    while not root.winfo_viewable():
+        root.update()
+    root.update()
+    first_window = time.perf_counter()
+
+    import numpy as np
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    with app.pose_pool.lease(static_image_mode=True) as pose:
+        app.detect_pose(frame, pose)
+    first_inference = time.perf_counter()
+
+    root.destroy()
+    return {'import': imported - start, 'first_window': first_window - start,
+            'first_inference': first_inference - start}
+
+
+def _child_cli():
+    start = time.perf_counter()
+    import pose_engine  # noqa: F401
+    imported = time.perf_counter()
+    return {'import': imported - start,
+            'tkinter_loaded': 'tkinter' in sys.modules,
+            'pil_loaded': 'PIL' in sys.modules,
+            'mediapipe_loaded': 'mediapipe' in sys.modules}
+
+
+def run_child(mode, preload_model=True):
+    args = [sys.executable, __file__, '--child', mode]
+    if not preload_model:
+        args.append('--no-preload')
+    process = subprocess.run(args, capture_output=True, text=True)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()
+        raise RuntimeError(f"{mode} benchmark failed: {error[-1] if error else process.returncode}")
+    # The measurement is the last line; anything before it is library noise
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help="Fresh processes per measurement")
+    parser.add_argument('--skip-gui', action='store_true', help="Only measure the CLI (e.g. without a display)")
+    parser.add_argument('--child', choices=['gui', 'cli'], help=argparse.SUPPRESS)
+    parser.add_argument('--no-preload', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child == 'gui':
+        print(json.dumps(_child_gui(not args.no_preload)))
+        return
+    if args.child == 'cli':
+        print(json.dumps(_child_cli()))
+        return
+
+    cli_runs = [run_child('cli') for _ in range(args.runs)]
+    print(f"CLI: import pose_engine {statistics.median(r['import'] for r in cli_runs) * 1000:.0f} ms "
+          f"(median of {args.runs})")
+    for module in ('tkinter', 'pil', 'mediapipe'):
+        if any(r[f'{module}_loaded'] for r in cli_runs):
+            print(f"  warning: importing pose_engine loaded {module}")
+
+    if args.skip_gui:
+        return
+    for preload_model in (True, False):
+        try:
+            runs = [run_child('gui', preload_model) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"GUI: {e}")
+            return
+        label = "model preloaded in background" if preload_model else "model loaded on first use"
+        print(f"GUI ({label}, median of {args.runs}):")
+        for key in ('import', 'first_window', 'first_inference'):
+            print(f"  {key.replace('_', ' ')}: {statistics.median(r[key] for r in runs) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
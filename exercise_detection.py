@@ -0,0 +1,125 @@
+"""Detect which exercise is performed in a clip from its landmarks.
+
+Uploads are not labeled with their exercise, and scoring a clip once per
+exercise mode would mean running inference once per mode. Instead the
+landmarks are scored against every exercise in one RuleEvaluator pass and
+the clip is classified in fixed windows of a few seconds. Within a window,
+an exercise matches to the degree that
+
+- its rep angle moves through the range between its rep thresholds
+  (10th to 90th percentile, relative to high - low), and
+- the torso is in the exercise's orientation (upright or horizontal),
+
+so a curl (elbow moves, torso upright), a push-up (elbow moves, torso
+horizontal) and a squat (knee moves, torso upright) separate cleanly.
+Windows where nothing matches at least min_score are labeled general_pose.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from exercise_rules import EXERCISES, GENERAL_POSE, compiled_rules
+from pose_math import LEFT_HIP, LEFT_SHOULDER, RIGHT_HIP, RIGHT_SHOULDER, pixel_coords
+
+# Frames start_frame to end_frame (exclusive) classified as exercise with
+# the given match score (0-1)
+ExerciseSegment = namedtuple('ExerciseSegment', ['exercise', 'start_frame', 'end_frame', 'score'])
+
+# Torso tilt from vertical (degrees) above which a body counts as horizontal
+HORIZONTAL_TORSO_ANGLE = 45.0
+
+
+def torso_tilt(landmarks, frame_shape):
+    """(N,) angle of the shoulder-to-hip line from vertical in degrees"""
+    points = pixel_coords(landmarks, frame_shape)
+    shoulders = (points[:, LEFT_SHOULDER] + points[:, RIGHT_SHOULDER]) / 2
+    hips = (points[:, LEFT_HIP] + points[:, RIGHT_HIP]) / 2
+    dx, dy = np.abs(shoulders - hips).T
+    return np.degrees(np.arctan2(dx, dy))
+
+
+def window_bounds(frames, window):
+    """Start frames of consecutive windows plus the end frame.
+
+    A trailing window shorter than half a window is merged into the one
+    before it.
+    """
+    bounds = list(range(0, frames, window)) + [frames]
+    if len(bounds) > 2 and bounds[-1] - bounds[-2] < window // 2:
+        del bounds[-2]
+    return bounds
+
+
+def window_scores(landmarks, frame_shape, bounds, exercises=None, min_detected=0.5, side='visible',
+                  space='2d', scores=None):
+    """Match score of every exercise in each window between bounds.
+
+    Returns (exercise names, (W, E) scores). Windows with fewer than
+    min_detected of their frames with a pose score 0 for every exercise.
+    scores, the RuleEvaluator.evaluate result for these landmarks if the
+    caller already has it, saves evaluating them again.
+    """
+    evaluator = compiled_rules(exercises if exercises is not None else EXERCISES, side, space)
+    names = [rule.name for rule in evaluator.rules]
+    # One pass over all frames and exercises; windows only slice the result
+    angles = scores if scores is not None else evaluator.evaluate(landmarks, frame_shape)
+    horizontal = torso_tilt(landmarks, frame_shape) > HORIZONTAL_TORSO_ANGLE
+    detected = ~np.isnan(landmarks[:, 0, 0])
+
+    scores = np.zeros((len(bounds) - 1, len(names)))
+    for w, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        valid = detected[start:end]
+        if not valid.any() or valid.mean() < min_detected:
+            continue
+        horizontal_share = horizontal[start:end][valid].mean()
+        for e, rule in enumerate(evaluator.rules):
+            angle = angles[rule.name]['angles'][rule.rep.key][start:end][valid]
+            # Angles are NaN on detected frames without the landmarks they
+            # need (e.g. world landmarks with space='3d')
+            if np.isnan(angle).all():
+                continue
+            low, high = np.nanpercentile(angle, (10, 90))
+            motion = min(max((high - low) / (rule.rep.high - rule.rep.low), 0.0), 1.0)
+            orientation = horizontal_share if rule.torso == 'horizontal' else 1.0 - horizontal_share
+            scores[w, e] = motion * orientation
+    return names, scores
+
+
+def detect_exercise(landmarks, frame_shape, fps=30.0, window_seconds=3.0, min_score=0.5,
+                    exercises=None, side='visible', space='2d', scores=None):
+    """ExerciseSegments covering an (N, 33, C) landmark trace.
+
+    Consecutive windows with the same label are merged into one segment
+    whose score is the mean of theirs.
+    """
+    if not len(landmarks):
+        return []
+    window = max(1, int(round(window_seconds * (fps if fps and fps > 0 else 30.0))))
+    bounds = window_bounds(len(landmarks), window)
+    names, scores = window_scores(landmarks, frame_shape, bounds, exercises, side=side, space=space,
+                                  scores=scores)
+
+    segments = []
+    window_count = 0
+    for w, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        best = int(np.argmax(scores[w])) if names else 0
+        score = float(scores[w, best]) if names else 0.0
+        exercise = names[best] if names and score >= min_score else GENERAL_POSE
+        if segments and segments[-1].exercise == exercise:
+            last = segments[-1]
+            window_count += 1
+            segments[-1] = last._replace(end_frame=end,
+                                         score=last.score + (score - last.score) / window_count)
+        else:
+            window_count = 1
+            segments.append(ExerciseSegment(exercise, start, end, score))
+    return segments
+
+
+def dominant_exercise(segments):
+    """Exercise covering the most frames, or general_pose if none was recognized"""
+    frames = {}
+    for segment in segments:
+        if segment.exercise != GENERAL_POSE:
+            frames[segment.exercise] = frames.get(segment.exercise, 0) + segment.end_frame - segment.start_frame
+    return max(frames, key=frames.get) if frames else GENERAL_POSE
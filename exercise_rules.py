@@ -0,0 +1,210 @@
+"""Exercises defined as data and compiled into vectorized evaluators.
+
+An exercise is the joint angles it checks (a joint with a good-form range
+each; joints are named without a side, e.g. 'elbow'), the primary angle
+and hysteresis thresholds used for rep counting, and the coaching hints the
+live view shows. Everything that scores, counts or describes an exercise
+(VideoAnalysisEngine, RepDetector, StreamingSummary, the GUI) reads it from
+EXERCISES, so adding an exercise is one entry here.
+
+RuleEvaluator compiles a set of exercises once into index arrays: every
+distinct joint angle is computed a single time for all frames, and all
+range checks of all exercises are one broadcast comparison followed by a
+per-exercise logical-and reduction.
+
+Both sides of every joint are measured in the same batch_angles call. The
+side used per frame is picked by landmark visibility (or the two are
+visibility-weighted, see SIDE_MODES), so an occluded arm or leg does not
+ruin the score, and the left/right difference is reported as asymmetry.
+
+Angles are measured on the image by default, or on the metric world
+landmarks with space='3d' (see pose_math.ANGLE_SPACES). The good-form
+ranges are the same in both spaces.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from pose_math import ANGLE_SPACES, JOINT_TRIPLETS, batch_angles, batch_angles_3d, pixel_coords, world_coords
+
+# How the left and right angle of a joint are combined:
+# visible - the side whose three landmarks are more visible, per frame
+# weighted - visibility-weighted mean of both sides
+# left, right - always that side
+SIDE_MODES = ('visible', 'weighted', 'left', 'right')
+# Both sides must be at least this visible for an asymmetry measurement
+MIN_ASYMMETRY_VISIBILITY = 0.5
+# Left/right difference in degrees that live feedback points out
+ASYMMETRY_WARNING = 15.0
+
+# Result key (e.g. 'elbow_angle'), joint ('elbow', 'hip' or 'knee') and
+# good-form range in degrees
+AngleCheck = namedtuple('AngleCheck', ['key', 'joint', 'low', 'high', 'label'])
+# Primary angle and (low, high) hysteresis thresholds of the rep state machine
+RepRule = namedtuple('RepRule', ['key', 'low', 'high'])
+# Shown with off-form feedback when the angle is below `below` or above `above`
+Hint = namedtuple('Hint', ['key', 'below', 'above', 'text'])
+# torso is the body orientation the exercise is done in, 'upright' or
+# 'horizontal' (used by exercise_detection.py to tell curls from push-ups)
+ExerciseRule = namedtuple('ExerciseRule', ['name', 'title', 'torso', 'checks', 'rep', 'hints', 'good_form_message'])
+
+EXERCISES = {
+    'bicep_curl': ExerciseRule(
+        name='bicep_curl', title="Bicep Curl", torso='upright',
+        checks=(AngleCheck('elbow_angle', 'elbow', 30, 170, "Elbow Angle"),),
+        rep=RepRule('elbow_angle', 50, 160),
+        hints=(Hint('elbow_angle', 30, None, "Angle too small, extend more"),
+               Hint('elbow_angle', None, 170, "Lower the weight, bring curl closer")),
+        good_form_message="Keep it up! Excellent form!"),
+    'pushup': ExerciseRule(
+        name='pushup', title="Push-up", torso='horizontal',
+        checks=(AngleCheck('elbow_angle', 'elbow', 70, 180, "Elbow Angle"),
+                AngleCheck('body_angle', 'hip', 160, 180, "Body Angle")),
+        rep=RepRule('elbow_angle', 90, 160),
+        hints=(Hint('elbow_angle', 70, None, "Go deeper for a full push-up"),
+               Hint('body_angle', 160, None, "Keep your body straight")),
+        good_form_message="Excellent form! Keep going!"),
+    'squat': ExerciseRule(
+        name='squat', title="Squat", torso='upright',
+        checks=(AngleCheck('knee_angle', 'knee', 70, 180, "Knee Angle"),
+                AngleCheck('hip_angle', 'hip', 70, 180, "Hip Angle")),
+        rep=RepRule('knee_angle', 90, 160),
+        hints=(Hint('knee_angle', 70, None, "Great depth! Keep it up"),
+               Hint('knee_angle', None, 160, "Go deeper for better results"),
+               Hint('hip_angle', 160, None, "Keep chest up and back straight")),
+        good_form_message="Perfect squat form!"),
+}
+
+# Pose-only mode without exercise rules
+GENERAL_POSE = 'general_pose'
+EXERCISE_MODES = list(EXERCISES) + [GENERAL_POSE]
+# Batch mode that detects the exercise of a clip (exercise_detection.py)
+AUTO_DETECT = 'auto'
+
+
+def asymmetry_key(joint):
+    """Result key of a joint's left/right angle difference"""
+    return f"{joint}_asymmetry"
+
+
+def check_for(rule, key):
+    """The AngleCheck of a rule with the given result key"""
+    for check in rule.checks:
+        if check.key == key:
+            return check
+    raise ValueError(f"{rule.name} has no angle {key}")
+
+
+def hints_for(rule, angles):
+    """Hint texts that apply to one frame's {key: angle}"""
+    return [hint.text for hint in rule.hints
+            if (hint.below is not None and angles[hint.key] < hint.below) or
+            (hint.above is not None and angles[hint.key] > hint.above)]
+
+
+class RuleEvaluator:
+    """A set of exercises compiled for vectorized scoring"""
+
+    def __init__(self, exercises=None, side='visible', space='2d'):
+        if side not in SIDE_MODES:
+            raise ValueError(f"Unknown side mode: {side}")
+        if space not in ANGLE_SPACES:
+            raise ValueError(f"Unknown angle space: {space}")
+        self.side = side
+        self.space = space
+        names = list(EXERCISES) if exercises is None else list(exercises)
+        self.rules = [EXERCISES[name] for name in names if name in EXERCISES]
+
+        # Every distinct joint angle is computed once, whichever exercises use it
+        self.joints = []
+        for rule in self.rules:
+            for check in rule.checks:
+                if check.joint not in self.joints:
+                    self.joints.append(check.joint)
+        # Left triplets of all joints, then right ones: (2J, 3)
+        self._triplets = np.array([JOINT_TRIPLETS[f"{s}_{joint}"] for s in ('left', 'right') for joint in self.joints],
+                                  dtype=np.intp).reshape(-1, 3)
+
+        # All checks of all exercises side by side; exercise i owns the
+        # columns from _offsets[i] to the next offset
+        checks = [check for rule in self.rules for check in rule.checks]
+        self._check_joints = np.array([self.joints.index(check.joint) for check in checks], dtype=np.intp)
+        self._low = np.array([check.low for check in checks], dtype=np.float32)
+        self._high = np.array([check.high for check in checks], dtype=np.float32)
+        self._offsets = np.cumsum([0] + [len(rule.checks) for rule in self.rules[:-1]])
+
+    def side_angles(self, landmarks, frame_shape):
+        """(N, 2, J) left and right angles of self.joints and their visibility.
+
+        A triplet's visibility is that of its least visible landmark; without
+        a visibility field both sides count as fully visible.
+        """
+        if self.space == '3d':
+            points, angle = world_coords(landmarks), batch_angles_3d
+        else:
+            points, angle = pixel_coords(landmarks, frame_shape), batch_angles
+        t = self._triplets
+        angles = angle(points[..., t[:, 0], :], points[..., t[:, 1], :], points[..., t[:, 2], :])
+        if landmarks.shape[-1] > 3:
+            visibility = landmarks[..., t, 3].min(axis=-1)
+        else:
+            visibility = np.ones_like(angles)
+        shape = angles.shape[:-1] + (2, len(self.joints))
+        return angles.reshape(shape), visibility.reshape(shape)
+
+    def joint_angles(self, landmarks, frame_shape):
+        """(N, J) angles of self.joints and (N, J) left/right differences"""
+        angles, visibility = self.side_angles(landmarks, frame_shape)
+        left, right = angles[..., 0, :], angles[..., 1, :]
+        left_vis, right_vis = visibility[..., 0, :], visibility[..., 1, :]
+
+        if self.side == 'left':
+            combined = left
+        elif self.side == 'right':
+            combined = right
+        elif self.side == 'visible':
+            combined = np.where(right_vis > left_vis, right, left)
+        else:
+            total = left_vis + right_vis
+            combined = np.where(total > 0, (left * left_vis + right * right_vis) / np.where(total > 0, total, 1),
+                                (left + right) / 2)
+
+        both_visible = np.minimum(left_vis, right_vis) >= MIN_ASYMMETRY_VISIBILITY
+        asymmetry = np.where(both_visible, np.abs(left - right), np.nan)
+        return combined, asymmetry
+
+    def evaluate(self, landmarks, frame_shape):
+        """Score (N, 33, C) landmarks against every compiled exercise.
+
+        Returns {exercise: {'angles': {key: (N,)}, 'asymmetry': {key: (N,)},
+        'good_form': (N,) bool}}, with asymmetry keyed by asymmetry_key(joint)
+        and NaN where a side is not visible enough.
+        """
+        angles, asymmetry = self.joint_angles(landmarks, frame_shape)
+        if not self.rules:
+            return {}
+        checked = angles[..., self._check_joints]
+        within = (self._low <= checked) & (checked <= self._high)
+        good_form = np.logical_and.reduceat(within, self._offsets, axis=-1)
+
+        results = {}
+        for i, rule in enumerate(self.rules):
+            results[rule.name] = {
+                'angles': {check.key: angles[..., self.joints.index(check.joint)] for check in rule.checks},
+                'asymmetry': {asymmetry_key(check.joint): asymmetry[..., self.joints.index(check.joint)]
+                              for check in rule.checks},
+                'good_form': good_form[..., i],
+            }
+        return results
+
+
+_compiled = {}
+
+
+def compiled_rules(exercises, side='visible', space='2d'):
+    """Cached RuleEvaluator for a tuple of exercise names, side mode and angle space"""
+    key = (tuple(exercises), side, space)
+    evaluator = _compiled.get(key)
+    if evaluator is None:
+        evaluator = _compiled[key] = RuleEvaluator(*key)
+    return evaluator
@@ -0,0 +1,42 @@
+"""Reusable output buffers for per-frame OpenCV conversions.
+
+cv2.cvtColor and cv2.resize allocate a new array on every call unless given
+a dst of the right shape. FrameBuffers keeps one array per named use and
+hands it back as dst, so steady-state frame processing does not allocate.
+A FrameBuffers instance must only be used from one thread, and each result
+is overwritten by the next call with the same name.
+"""
+import cv2
+import numpy as np
+
+
+class FrameBuffers:
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    def bgr_to_rgb(self, frame, name='rgb'):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.get(name, frame.shape))
+
+    def resize(self, frame, size, name='resized'):
+        """Resize to size=(width, height); area interpolation when shrinking"""
+        width, height = size
+        interpolation = cv2.INTER_AREA if width < frame.shape[1] else cv2.INTER_LINEAR
+        dst = self.get(name, (height, width) + frame.shape[2:], frame.dtype)
+        return cv2.resize(frame, size, dst=dst, interpolation=interpolation)
+
+    def resize_to_rgb(self, frame, size):
+        """BGR frame resized to size=(width, height) and converted to RGB.
+
+        Converts whichever of the two images has fewer pixels, i.e. resizes
+        first when shrinking.
+        """
+        if size[0] * size[1] <= frame.shape[0] * frame.shape[1]:
+            return self.bgr_to_rgb(self.resize(frame, size, 'resized_bgr'), 'resized_rgb')
+        return self.resize(self.bgr_to_rgb(frame, 'rgb'), size, 'resized_rgb')
@@ -0,0 +1,94 @@
+"""Temporal subsampling of pose inference for long clips.
+
+FrameSampler decides which decoded frames get full pose inference. Frames
+in between are filled by linear interpolation of the neighbouring keyframe
+landmarks, unless the exercise's rep phase changes across the gap (a turning
+point), in which case every skipped frame is inferred after all. When the
+exercise is auto-detected, a phase change of any exercise counts.
+"""
+import cv2
+import numpy as np
+
+from exercise_rules import AUTO_DETECT, compiled_rules
+from rep_detector import REP_THRESHOLDS
+
+MOTION_THUMBNAIL_SIZE = (64, 36)
+
+
+class FrameSampler:
+    """Chooses keyframes by fixed stride and, optionally, by motion.
+
+    stride is the largest gap between inferred frames. With motion_threshold
+    set, a frame is also inferred as soon as its mean absolute difference
+    from the last keyframe (0-1, on a small grayscale thumbnail) reaches the
+    threshold, so static segments are skipped and fast movement is not.
+    """
+
+    def __init__(self, stride=3, motion_threshold=None, exercise_mode=None, side='visible'):
+        if stride < 1:
+            raise ValueError("stride must be at least 1")
+        self.stride = stride
+        self.motion_threshold = motion_threshold
+        # A gap whose end points fall in different rep phases (see
+        # rep_detector.py) contains a turning point and is densified. The
+        # exercise isn't known yet in auto mode, so every one is watched
+        names = list(REP_THRESHOLDS) if exercise_mode == AUTO_DETECT else [exercise_mode]
+        self.turning = {name: REP_THRESHOLDS[name] for name in names if name in REP_THRESHOLDS}
+        self.exercise_mode = exercise_mode
+        self.side = side
+        self.reset()
+
+    def reset(self):
+        self.inferred = 0
+        self.interpolated = 0
+        self.densified = 0
+        self._key_thumbnail = None
+
+    def _thumbnail(self, frame):
+        small = cv2.resize(frame, MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def should_infer(self, frame, frames_since_keyframe):
+        if frames_since_keyframe >= self.stride:
+            return True
+        if self.motion_threshold is None or self._key_thumbnail is None:
+            return False
+        motion = cv2.absdiff(self._thumbnail(frame), self._key_thumbnail).mean() / 255.0
+        return motion >= self.motion_threshold
+
+    def mark_keyframe(self, frame):
+        self.inferred += 1
+        if self.motion_threshold is not None:
+            self._key_thumbnail = self._thumbnail(frame)
+
+    def _phases(self, landmarks, frame_shape):
+        """Rep phase of every watched exercise"""
+        scores = compiled_rules(tuple(self.turning), self.side).evaluate(landmarks, frame_shape)
+        phases = []
+        for name, turning in self.turning.items():
+            angle = scores[name]['angles'][turning.result_key]
+            phases.append('down' if angle < turning.low else 'up' if angle > turning.high else 'mid')
+        return phases
+
+    def needs_densify(self, start_landmarks, end_landmarks, frame_shape):
+        """True if the gap between two keyframes cannot be interpolated.
+
+        A gap between two keyframes without a pose is taken as pose-less.
+        """
+        if start_landmarks is None and end_landmarks is None:
+            return False
+        if start_landmarks is None or end_landmarks is None:
+            # Pose appears or disappears inside the gap
+            return True
+        if not self.turning:
+            return False
+        return self._phases(start_landmarks, frame_shape) != self._phases(end_landmarks, frame_shape)
+
+    def stats(self):
+        return {'inferred': self.inferred, 'interpolated': self.interpolated, 'densified': self.densified}
+
+
+def interpolate_landmarks(start_landmarks, end_landmarks, count):
+    """count evenly spaced (33, C) landmark arrays strictly between two keyframes"""
+    t = (np.arange(1, count + 1, dtype=np.float32) / (count + 1))[:, np.newaxis, np.newaxis]
+    return start_landmarks + (end_landmarks - start_landmarks) * t
@@ -0,0 +1,212 @@
+"""Binary landmark traces and the on-disk landmark cache built on them.
+
+Trace file layout (little-endian):
+
+    8 bytes   magic b"SMTRACE1"
+    4 bytes   uint32 length of the JSON header that follows
+    n bytes   JSON header (fps, width, height, exercise, model settings),
+              space-padded so the records start on a 64-byte boundary
+    records   one float32 (33, 7) array per frame: x, y, z, visibility in
+              normalized image coordinates, then x, y, z world coordinates
+              (meters, origin between the hips); NaN where no pose was
+              detected
+
+Version 1 traces have 4 fields per landmark (no world coordinates); they
+can still be read, but the landmark cache treats them as misses.
+
+Records have a fixed stride, so the frame count follows from the file size
+and read_trace can map a multi-hour session with np.memmap without parsing.
+
+Landmarks depend only on the video content and the MediaPipe settings, not
+on the exercise being scored, so re-scoring a clip for another exercise can
+read them from the cache instead of re-running inference.
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+# x, y, z (normalized image coordinates), visibility, then world x, y, z
+LANDMARK_FIELDS = 7
+VISIBILITY_FIELD = 3
+WORLD_FIELDS = slice(4, 7)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "smartan", "landmarks")
+
+TRACE_MAGIC = b"SMTRACE1"
+TRACE_VERSION = 2
+TRACE_ALIGN = 64
+
+
+class LandmarkTrace:
+    """Per-frame landmarks of a clip; rows are NaN where no pose was detected"""
+
+    def __init__(self, landmarks, fps, width, height):
+        self.landmarks = landmarks
+        self.fps = fps
+        self.width = width
+        self.height = height
+
+    @property
+    def frame_shape(self):
+        return (self.height, self.width)
+
+    @property
+    def detected(self):
+        return ~np.isnan(self.landmarks[:, 0, 0])
+
+    @property
+    def has_world(self):
+        """True if the trace carries world coordinates (not a version 1 trace)"""
+        return self.landmarks.shape[-1] >= LANDMARK_FIELDS
+
+    def __len__(self):
+        return len(self.landmarks)
+
+
+def landmarks_to_array(landmarks, world_landmarks=None):
+    """(33, 7) float32 array from MediaPipe image and world landmark lists.
+
+    World columns are NaN when world_landmarks is None.
+    """
+    array = empty_landmarks()
+    array[:, :VISIBILITY_FIELD + 1] = [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks]
+    if world_landmarks is not None:
+        array[:, WORLD_FIELDS] = [(lm.x, lm.y, lm.z) for lm in world_landmarks]
+    return array
+
+
+def empty_landmarks():
+    return np.full((NUM_LANDMARKS, LANDMARK_FIELDS), np.nan, dtype=np.float32)
+
+
+class TraceWriter:
+    """Streams landmark records to a trace file, one frame at a time.
+
+    Data goes to a uniquely named temporary file next to path and is renamed
+    into place by close(), so readers never see a half-written trace under
+    the final name and concurrent writers of the same trace don't share a
+    file. Used as a context manager, an exception discards the partial file.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.frames = 0
+        header = dict(header, version=TRACE_VERSION,
+                      num_landmarks=NUM_LANDMARKS, landmark_fields=LANDMARK_FIELDS)
+        header_bytes = json.dumps(header).encode('utf-8')
+        prefix_size = len(TRACE_MAGIC) + 4
+        padded_size = -(-(prefix_size + len(header_bytes)) // TRACE_ALIGN) * TRACE_ALIGN - prefix_size
+
+        fd, self._part_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                               suffix=".part", dir=os.path.dirname(path) or ".")
+        self._file = os.fdopen(fd, 'wb')
+        self._file.write(TRACE_MAGIC)
+        self._file.write(struct.pack('<I', padded_size))
+        self._file.write(header_bytes.ljust(padded_size))
+
+    def write(self, landmarks):
+        """Append one frame's (33, 7) landmarks, or an (N, 33, 7) block of frames"""
+        records = np.ascontiguousarray(landmarks, dtype='<f4')
+        self._file.write(records.tobytes())
+        self.frames += records.size // (NUM_LANDMARKS * LANDMARK_FIELDS)
+
+    def close(self):
+        self._file.close()
+        os.replace(self._part_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def trace_header(fps, width, height, exercise=None, settings=None):
+    header = {'fps': fps, 'width': width, 'height': height, 'exercise': exercise}
+    if settings is not None:
+        header.update(zip(('min_detection_confidence', 'min_tracking_confidence', 'model_complexity',
+                           'roi_size'), settings))
+    return header
+
+
+def write_trace(path, header, landmarks):
+    with TraceWriter(path, header) as writer:
+        writer.write(landmarks)
+
+
+def read_trace(path):
+    """(LandmarkTrace, header) for a trace file; landmarks are a read-only np.memmap"""
+    with open(path, 'rb') as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"Not a landmark trace file: {path}")
+        (header_size,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_size))
+
+    offset = len(TRACE_MAGIC) + 4 + header_size
+    fields = header.get('landmark_fields', 4)
+    frames = (os.path.getsize(path) - offset) // (NUM_LANDMARKS * fields * 4)
+    shape = (frames, NUM_LANDMARKS, fields)
+    if frames:
+        landmarks = np.memmap(path, dtype='<f4', mode='r', offset=offset, shape=shape)
+    else:
+        landmarks = np.empty(shape, dtype=np.float32)
+
+    trace = LandmarkTrace(landmarks, header['fps'], header['width'], header['height'])
+    return trace, header
+
+
+def file_digest(path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class LandmarkCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        # (path, size, mtime) -> content hash, so a clip is hashed once per process
+        self._digests = {}
+
+    def _digest(self, video_path):
+        st = os.stat(video_path)
+        memo_key = (os.path.abspath(video_path), st.st_size, st.st_mtime_ns)
+        if memo_key not in self._digests:
+            self._digests[memo_key] = file_digest(video_path)
+        return self._digests[memo_key]
+
+    def path_for(self, video_path, settings):
+        """Cache file for a clip; settings is (min_detection_confidence,
+        min_tracking_confidence, model_complexity, roi_size)"""
+        settings_key = "_".join(str(s) for s in settings)
+        return os.path.join(self.cache_dir, f"{self._digest(video_path)}_{settings_key}.smtrace")
+
+    def load(self, video_path, settings):
+        path = self.path_for(video_path, settings)
+        if not os.path.exists(path):
+            return None
+        try:
+            trace, _ = read_trace(path)
+            # Entries from before world coordinates were stored are re-extracted
+            return trace if trace.has_world else None
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable landmark cache {path}: {e}")
+            return None
+
+    def writer(self, video_path, settings, header):
+        """TraceWriter that fills the cache entry for a clip as frames are analyzed"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return TraceWriter(self.path_for(video_path, settings), header)
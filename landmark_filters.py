@@ -0,0 +1,170 @@
+"""Temporal smoothing of pose landmarks.
+
+Per-frame landmarks jitter by a few pixels even when the person is still,
+which makes angle-based form checks flicker and rep phases chatter. The
+filters here smooth the image and world x, y, z of all 33 landmarks at once
+as (33, 6) NumPy arrays, so a frame costs a few tens of microseconds of
+vectorized arithmetic (bench_filters.py measures speed and accuracy):
+
+- OneEuroFilter: adaptive low-pass (Casiez et al., 2012). Heavy smoothing
+  when a landmark is slow, little lag when it moves fast.
+- KalmanFilter: constant-velocity Kalman filter per coordinate.
+
+Both take one frame at a time (live) via update(); smooth_trace() runs one
+over a stored (N, 33, 7) trace (batch). Visibility passes through
+unfiltered, and a frame without a pose resets the filter.
+"""
+import numpy as np
+
+from landmark_cache import VISIBILITY_FIELD
+
+SMOOTHING_METHODS = ('none', 'one_euro', 'kalman')
+
+
+def filtered_fields(landmarks):
+    """Mask of the landmark columns that are filtered: all but visibility"""
+    return np.arange(landmarks.shape[-1]) != VISIBILITY_FIELD
+
+
+class OneEuroFilter:
+    """One-Euro filter over all landmarks.
+
+    min_cutoff (Hz) sets the smoothing of a still landmark; beta scales how
+    much the cutoff rises with speed (in normalized frame units per second).
+    The defaults come from bench_filters.py --sweep: a lower beta lags
+    behind a curl by more than the jitter it removes.
+    """
+
+    def __init__(self, fps=30.0, min_cutoff=1.0, beta=60.0, d_cutoff=1.0):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self._value = None
+        self._derivative = None
+        self._timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, landmarks, timestamp=None):
+        """Smoothed copy of one (33, C) landmark array.
+
+        timestamp is in seconds; by default frames are 1 / fps apart. A frame
+        without a pose (None or NaN) is returned as is.
+        """
+        if landmarks is None or np.isnan(landmarks[0, 0]):
+            self.reset()
+            return landmarks
+
+        if timestamp is None:
+            timestamp = 0.0 if self._timestamp is None else self._timestamp + 1.0 / self.fps
+        fields = filtered_fields(landmarks)
+        values = landmarks[:, fields].astype(np.float64)
+        if self._value is None:
+            self._value = values
+            self._derivative = np.zeros_like(values)
+        else:
+            dt = max(timestamp - self._timestamp, 1e-6)
+            a_d = self._alpha(self.d_cutoff, dt)
+            self._derivative += a_d * ((values - self._value) / dt - self._derivative)
+            cutoff = self.min_cutoff + self.beta * np.abs(self._derivative)
+            self._value += self._alpha(cutoff, dt) * (values - self._value)
+        self._timestamp = timestamp
+
+        smoothed = landmarks.copy()
+        smoothed[:, fields] = self._value
+        return smoothed
+
+
+class KalmanFilter:
+    """Constant-velocity Kalman filter, independent per landmark coordinate.
+
+    process_noise is the spectral density of the unmodelled acceleration and
+    measurement_noise the variance of the per-frame detection error, both in
+    normalized frame units. The 2x2 covariances of all 33 x 3 coordinates are
+    kept as three arrays (P00, P01, P11).
+    """
+
+    def __init__(self, fps=30.0, process_noise=0.1, measurement_noise=1e-4):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self._position = None
+        self._velocity = None
+        self._p00 = self._p01 = self._p11 = None
+        self._timestamp = None
+
+    def update(self, landmarks, timestamp=None):
+        """Filtered copy of one (33, C) landmark array; see OneEuroFilter.update"""
+        if landmarks is None or np.isnan(landmarks[0, 0]):
+            self.reset()
+            return landmarks
+
+        if timestamp is None:
+            timestamp = 0.0 if self._timestamp is None else self._timestamp + 1.0 / self.fps
+        fields = filtered_fields(landmarks)
+        z = landmarks[:, fields].astype(np.float64)
+        if self._position is None:
+            self._position = z
+            self._velocity = np.zeros_like(z)
+            self._p00 = np.full_like(z, self.measurement_noise)
+            self._p01 = np.zeros_like(z)
+            self._p11 = np.full_like(z, 1.0)
+        else:
+            dt = max(timestamp - self._timestamp, 1e-6)
+            q = self.process_noise
+            # Predict
+            self._position += dt * self._velocity
+            self._p00 += 2 * dt * self._p01 + dt * dt * self._p11 + q * dt ** 3 / 3
+            self._p01 += dt * self._p11 + q * dt ** 2 / 2
+            self._p11 += q * dt
+            # Correct with the measured position
+            s = self._p00 + self.measurement_noise
+            k0 = self._p00 / s
+            k1 = self._p01 / s
+            residual = z - self._position
+            self._position += k0 * residual
+            self._velocity += k1 * residual
+            self._p11 -= k1 * self._p01
+            self._p00 *= 1 - k0
+            self._p01 *= 1 - k0
+        self._timestamp = timestamp
+
+        filtered = landmarks.copy()
+        filtered[:, fields] = self._position
+        return filtered
+
+
+def make_filter(method, fps=30.0, **params):
+    """New landmark filter for one of SMOOTHING_METHODS; None for 'none'"""
+    if method in (None, 'none'):
+        return None
+    if method == 'one_euro':
+        return OneEuroFilter(fps, **params)
+    if method == 'kalman':
+        return KalmanFilter(fps, **params)
+    raise ValueError(f"Unknown smoothing method: {method}")
+
+
+def smooth_trace(landmarks, landmark_filter, reset=True):
+    """Run a filter forward over (N, 33, C) landmarks; returns a new array.
+
+    Frames without a pose (NaN) stay NaN and restart the filter. With
+    reset=False the filter continues from its current state, so a trace can
+    be smoothed block by block.
+    """
+    smoothed = np.array(landmarks, copy=True)
+    if reset:
+        landmark_filter.reset()
+    for i in range(len(smoothed)):
+        smoothed[i] = landmark_filter.update(smoothed[i])
+    return smoothed
@@ -0,0 +1,178 @@
+"""Staged capture -> inference -> render pipeline for live webcam analysis.
+
+Stages run concurrently and hand frames over through bounded queues that
+drop the oldest item when full, so a slow stage never builds up latency:
+the display always shows the freshest analyzed frame.
+"""
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class DropOldestQueue:
+    """Bounded queue that discards the oldest item instead of blocking the producer"""
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Oldest queued item, or None once closed or after timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            return self._items.popleft() if self._items else None
+
+    def get_nowait(self):
+        with self._cond:
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class StageStats:
+    """Frame counter with FPS measured over a rolling window"""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.frames = 0
+        self.fps = 0.0
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+
+    def tick(self):
+        self.frames += 1
+        self._window_frames += 1
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_frames = 0
+
+
+class LivePipeline:
+    """Runs capture and inference on their own threads and renders on the UI thread.
+
+    process_frame(frame) runs on the inference thread and returns the frame to
+    show. present_frame(frame) is called on the UI thread; schedule(delay_ms,
+    callback) must run callback there later (e.g. tkinter's root.after).
+    on_exit(), if given, runs on the inference thread after its last frame,
+    so resources only that thread uses (the Pose model) are released by it
+    even when stop() times out waiting for it.
+    """
+
+    def __init__(self, cap, process_frame, present_frame, schedule,
+                 mirror=True, queue_size=1, render_interval_ms=10, on_exit=None):
+        self.cap = cap
+        self.process_frame = process_frame
+        self.on_exit = on_exit
+        self.present_frame = present_frame
+        self.schedule = schedule
+        self.mirror = mirror
+        self.render_interval_ms = render_interval_ms
+
+        # With one slot inference always starts on the newest capture; every
+        # extra slot would delay the shown frame by one capture interval
+        self.capture_queue = DropOldestQueue(queue_size)
+        self.render_queue = DropOldestQueue(1)
+        self.capture_stats = StageStats()
+        self.inference_stats = StageStats()
+        self.render_stats = StageStats()
+
+        self.running = False
+        self._threads = []
+
+    def start(self):
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, daemon=True),
+            threading.Thread(target=self._inference_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.schedule(self.render_interval_ms, self._render_tick)
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        self.capture_queue.close()
+        self.render_queue.close()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    @property
+    def stopped(self):
+        """True once the capture and inference threads have exited"""
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def stats(self):
+        """Per-stage FPS, queue depth and dropped-frame counters"""
+        return {
+            'capture': {'fps': self.capture_stats.fps, 'frames': self.capture_stats.frames,
+                        'queue_depth': len(self.capture_queue), 'dropped': self.capture_queue.dropped},
+            'inference': {'fps': self.inference_stats.fps, 'frames': self.inference_stats.frames,
+                          'queue_depth': len(self.render_queue), 'dropped': self.render_queue.dropped},
+            'render': {'fps': self.render_stats.fps, 'frames': self.render_stats.frames},
+        }
+
+    def _capture_loop(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+
+            # Flip frame horizontally for mirror effect, in place
+            if self.mirror:
+                cv2.flip(frame, 1, dst=frame)
+
+            self.capture_queue.put(frame)
+            self.capture_stats.tick()
+
+        self.running = False
+        self.capture_queue.close()
+
+    def _inference_loop(self):
+        try:
+            while self.running:
+                frame = self.capture_queue.get(timeout=0.5)
+                if frame is None:
+                    continue
+
+                try:
+                    analyzed_frame = self.process_frame(frame)
+                except Exception as e:
+                    print(f"Inference error: {e}")
+                    continue
+
+                self.render_queue.put(analyzed_frame)
+                self.inference_stats.tick()
+        finally:
+            if self.on_exit:
+                self.on_exit()
+
+    def _render_tick(self):
+        frame = self.render_queue.get_nowait()
+        if frame is not None:
+            self.present_frame(frame)
+            self.render_stats.tick()
+
+        if self.running:
+            self.schedule(self.render_interval_ms, self._render_tick)
@@ -0,0 +1,241 @@
+"""Multi-person pose analysis with per-person identities.
+
+mp.solutions.pose only ever returns the most salient person, so in a group
+class rep counts jump between people. MultiPoseDetector uses the MediaPipe
+Tasks PoseLandmarker instead, which runs a person detector and a landmark
+model per detected person and returns up to num_poses poses per frame (in
+video mode the detector is skipped while people are being tracked).
+PersonTracker gives every pose a stable ID across frames by matching
+landmark bounding boxes (IoU), and each tracked person has their own rep
+counter and summary.
+
+Per-frame work on top of inference is batched over people: bounding boxes,
+the IoU matrix and exercise scoring are each one NumPy call on
+a (people, 33, 7) array rather than one pass per person.
+
+    python multi_person.py class.mp4 --model pose_landmarker_full.task --num-poses 6 --exercise squat
+
+The .task model bundles are downloaded separately from the MediaPipe site.
+"""
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+from frame_buffers import FrameBuffers
+from landmark_cache import LANDMARK_FIELDS, NUM_LANDMARKS, landmarks_to_array
+from pose_engine import EXERCISE_MODES, VideoAnalysisEngine
+from pose_math import ANGLE_SPACES
+from video_summary import StreamingSummary
+
+
+class MultiPoseDetector:
+    """MediaPipe Tasks PoseLandmarker in video mode returning up to num_poses people"""
+
+    def __init__(self, model_path, num_poses=4, min_detection_confidence=0.5,
+                 min_presence_confidence=0.5, min_tracking_confidence=0.5):
+        if not os.path.exists(model_path):
+            raise IOError(f"Pose landmarker model not found: {model_path}")
+        # Imported here so the rest of the package never pays for mediapipe.tasks
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        self._mp = mp
+        options = vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.VIDEO,
+            num_poses=num_poses,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_pose_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence)
+        self._landmarker = vision.PoseLandmarker.create_from_options(options)
+        self.buffers = FrameBuffers()
+
+    def detect(self, frame, timestamp_ms):
+        """(P, 33, 7) landmarks of every person in a BGR frame; timestamps must increase"""
+        rgb = self.buffers.bgr_to_rgb(frame)
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb)
+        result = self._landmarker.detect_for_video(image, int(timestamp_ms))
+        if not result.pose_landmarks:
+            return np.empty((0, NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        world = result.pose_world_landmarks or [None] * len(result.pose_landmarks)
+        return np.stack([landmarks_to_array(pose, pose_world) for pose, pose_world in zip(result.pose_landmarks, world)])
+
+    def close(self):
+        self._landmarker.close()
+
+
+def landmark_boxes(landmarks, min_visibility=0.5):
+    """(P, 4) normalized x0, y0, x1, y1 boxes around each person's visible landmarks"""
+    visible = landmarks[:, :, 3] >= min_visibility
+    # People with too few visible points fall back to all of their landmarks
+    visible |= (visible.sum(axis=1) < 4)[:, np.newaxis]
+    x = np.where(visible, landmarks[:, :, 0], np.nan)
+    y = np.where(visible, landmarks[:, :, 1], np.nan)
+    return np.stack([np.nanmin(x, axis=1), np.nanmin(y, axis=1),
+                     np.nanmax(x, axis=1), np.nanmax(y, axis=1)], axis=1)
+
+
+def box_iou(a, b):
+    """(A, B) intersection over union of two sets of x0, y0, x1, y1 boxes"""
+    x0 = np.maximum(a[:, np.newaxis, 0], b[np.newaxis, :, 0])
+    y0 = np.maximum(a[:, np.newaxis, 1], b[np.newaxis, :, 1])
+    x1 = np.minimum(a[:, np.newaxis, 2], b[np.newaxis, :, 2])
+    y1 = np.minimum(a[:, np.newaxis, 3], b[np.newaxis, :, 3])
+    intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, np.newaxis] + area_b[np.newaxis, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+class TrackedPerson:
+    def __init__(self, person_id, exercise_mode, fps):
+        self.id = person_id
+        self.box = None
+        self.landmarks = None
+        self.missing = 0
+        self.first_frame = None
+        self.last_frame = None
+        # Counts reps too (summary.reps)
+        self.summary = StreamingSummary(exercise_mode, fps)
+
+
+class PersonTracker:
+    """Assigns stable IDs to the poses found in consecutive frames.
+
+    Each frame, poses are matched to existing tracks greedily by descending
+    bounding-box IoU (pairs below min_iou never match). Unmatched poses start
+    new tracks; tracks unseen for more than max_missing frames are dropped.
+    """
+
+    def __init__(self, exercise_mode, fps=30.0, min_iou=0.3, max_missing=15):
+        self.exercise_mode = exercise_mode
+        self.fps = fps
+        self.min_iou = min_iou
+        self.max_missing = max_missing
+        self.tracks = []
+        self.finished = []
+        self._next_id = 1
+
+    def update(self, landmarks, frame_idx):
+        """Match (P, 33, 7) poses to tracks; returns the TrackedPerson of each pose"""
+        boxes = landmark_boxes(landmarks) if len(landmarks) else np.empty((0, 4))
+        assigned = [None] * len(landmarks)
+
+        if self.tracks and len(landmarks):
+            iou = box_iou(np.array([track.box for track in self.tracks]), boxes)
+            for flat in np.argsort(iou, axis=None)[::-1]:
+                t, p = np.unravel_index(flat, iou.shape)
+                if iou[t, p] < self.min_iou:
+                    break
+                if assigned[p] is None and self.tracks[t].last_frame != frame_idx:
+                    assigned[p] = self.tracks[t]
+                    self.tracks[t].last_frame = frame_idx
+
+        for p, track in enumerate(assigned):
+            if track is None:
+                track = assigned[p] = TrackedPerson(self._next_id, self.exercise_mode, self.fps)
+                self._next_id += 1
+                self.tracks.append(track)
+                track.first_frame = frame_idx
+            track.box = boxes[p]
+            track.landmarks = landmarks[p]
+            track.last_frame = frame_idx
+            track.missing = 0
+
+        alive = []
+        for track in self.tracks:
+            if track.last_frame != frame_idx:
+                track.missing += 1
+            (alive if track.missing <= self.max_missing else self.finished).append(track)
+        self.tracks = alive
+        return assigned
+
+    def people(self):
+        """Every person seen so far, current and dropped, by ID"""
+        return sorted(self.finished + self.tracks, key=lambda track: track.id)
+
+
+class MultiPersonAnalyzer:
+    """Detect, track and score every person in a stream of frames"""
+
+    def __init__(self, detector, exercise_mode="bicep_curl", fps=30.0, angle_space="2d", **tracker_options):
+        self.detector = detector
+        self.fps = fps
+        self.engine = VideoAnalysisEngine(exercise_mode, angle_space=angle_space)
+        self.tracker = PersonTracker(exercise_mode, fps, **tracker_options)
+        self.frame_idx = 0
+
+    def analyze(self, frame):
+        """[(TrackedPerson, result dict)] for the people in one frame"""
+        frame_idx = self.frame_idx
+        landmarks = self.detector.detect(frame, frame_idx * 1000.0 / self.fps)
+        people = self.tracker.update(landmarks, frame_idx)
+        self.frame_idx += 1
+        if not people:
+            return []
+
+        # One vectorized scoring pass for everyone in the frame
+        columns = self.engine.score_landmarks(landmarks, frame.shape)
+
+        results = []
+        for p, person in enumerate(people):
+            result = {'pose_detected': True, 'person_id': person.id}
+            result.update({key: values[p] for key, values in columns.items()})
+            # A person is only scored on the frames they were matched in, so
+            # reps are numbered by the clip's frame index
+            person.summary.update(result, frame_idx)
+            results.append((person, result))
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-person pose analysis of a workout video")
+    parser.add_argument("video", help="video file to analyze")
+    parser.add_argument("--model", required=True, help="PoseLandmarker .task model bundle")
+    parser.add_argument("--num-poses", type=int, default=4, help="most people to track per frame")
+    parser.add_argument("--exercise", choices=EXERCISE_MODES, default="bicep_curl")
+    parser.add_argument("--angles", choices=ANGLE_SPACES, default="2d",
+                        help="measure joint angles on the image (2d) or on metric world landmarks (3d)")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.5)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.5)
+    parser.add_argument("--min-iou", type=float, default=0.3, help="least box overlap to keep an ID")
+    parser.add_argument("--max-missing", type=int, default=15,
+                        help="frames a person may be undetected before their ID is retired")
+    parser.add_argument("--min-frames", type=int, default=10,
+                        help="leave out people seen in fewer frames than this")
+    args = parser.parse_args(argv)
+
+    cap = cv2.VideoCapture(args.video)
+    if not cap.isOpened():
+        print(f"Could not open video: {args.video}")
+        return 1
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    detector = MultiPoseDetector(args.model, args.num_poses,
+                                 min_detection_confidence=args.min_detection_confidence,
+                                 min_tracking_confidence=args.min_tracking_confidence)
+    analyzer = MultiPersonAnalyzer(detector, args.exercise, fps, args.angles,
+                                   min_iou=args.min_iou, max_missing=args.max_missing)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            analyzer.analyze(frame)
+    finally:
+        cap.release()
+        detector.close()
+
+    for person in analyzer.tracker.people():
+        if person.summary.frames < args.min_frames:
+            continue
+        print(f"Person {person.id} (frames {person.first_frame}-{person.last_frame}, "
+              f"reps {person.summary.reps.count})\n{person.summary.render()}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
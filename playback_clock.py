@@ -0,0 +1,55 @@
+"""Presentation clock for clip playback.
+
+Each frame of a clip has a presentation time, start + index / fps, on the
+monotonic clock. The player sleeps until a frame's time instead of for a
+fixed 1 / fps after processing it, so inference time is absorbed rather
+than added on, and when processing falls behind the frames whose time has
+already passed are skipped (see due_frame) to get back in sync.
+"""
+import time
+
+from live_pipeline import StageStats
+
+
+class PlaybackClock:
+    def __init__(self, fps, start_frame=0, clock=time.monotonic):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.fps = float(fps)
+        self.start_frame = start_frame
+        self._clock = clock
+        self.start_time = clock()
+        self.presented = StageStats()
+        self.dropped = 0
+
+    def presentation_time(self, frame_idx):
+        return self.start_time + (frame_idx - self.start_frame) / self.fps
+
+    def due_frame(self):
+        """Index of the frame that should be on screen now"""
+        return self.start_frame + int((self._clock() - self.start_time) * self.fps)
+
+    def frames_behind(self, frame_idx):
+        """How many frames before frame_idx are already past their presentation time"""
+        return max(0, self.due_frame() - frame_idx)
+
+    def wait_until(self, frame_idx):
+        """Sleep until frame_idx is due; returns how late it is in seconds (0 if on time)"""
+        delay = self.presentation_time(frame_idx) - self._clock()
+        if delay > 0:
+            time.sleep(delay)
+            return 0.0
+        return -delay
+
+    def present(self):
+        self.presented.tick()
+
+    def drop(self, count=1):
+        self.dropped += count
+
+    def stats(self):
+        """Target and achieved FPS and frame counters"""
+        elapsed = self._clock() - self.start_time
+        return {'target_fps': self.fps, 'fps': self.presented.fps,
+                'average_fps': self.presented.frames / elapsed if elapsed > 0 else 0.0,
+                'presented': self.presented.frames, 'dropped': self.dropped}
@@ -0,0 +1,698 @@
+"""Headless pose analysis engine shared by the GUI and the batch CLI.
+
+Nothing in this module touches tkinter, so it can run on servers without
+a display:
+
+    python pose_engine.py clip1.mp4 clip2.mp4 --exercise squat --output-dir results/
+
+Pass --workers N to split each clip across N processes. Raw landmarks are
+cached on disk (see landmark_cache.py), so re-running a clip with another
+--exercise only re-scores the cached landmarks. --exercise auto detects the
+exercise of each clip from its landmarks (see exercise_detection.py) and
+scores every detected segment as its own exercise.
+--angles 3d measures joint angles on MediaPipe's metric world landmarks
+instead of the image, so they do not depend on the camera's position.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from frame_buffers import FrameBuffers
+from frame_sampling import FrameSampler, interpolate_landmarks
+from roi_tracking import RoiTracker
+from landmark_filters import SMOOTHING_METHODS, make_filter, smooth_trace
+from landmark_cache import (LandmarkCache, LandmarkTrace, TraceWriter, empty_landmarks,
+                            landmarks_to_array, trace_header, write_trace)
+from result_store import VideoResultStore
+from video_summary import StreamingSummary
+from pose_pool import pose_solution
+from pose_math import ANGLE_SPACES, LEFT_HIP, LEFT_SHOULDER, RIGHT_HIP, RIGHT_SHOULDER, pixel_coords
+from exercise_rules import AUTO_DETECT, EXERCISE_MODES, EXERCISES, SIDE_MODES, compiled_rules
+from exercise_detection import detect_exercise, dominant_exercise
+
+# Clips shorter than this are analyzed on one process even with workers > 1:
+# spawning the workers and loading a model in each takes longer than the
+# few chunks such a clip splits into save
+MIN_PARALLEL_FRAMES = 600
+
+
+def calculate_angle(a, b, c):
+    a = np.array(a)
+    b = np.array(b)
+    c = np.array(c)
+    radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - \
+              np.arctan2(a[1] - b[1], a[0] - b[0])
+    angle = np.abs(radians * 180.0 / np.pi)
+    if angle > 180.0:
+        angle = 360 - angle
+    return angle
+
+
+class VideoAnalysisEngine:
+    def __init__(self, exercise_mode="bicep_curl", min_detection_confidence=0.7,
+                 min_tracking_confidence=0.7, model_complexity=1, cache=None, roi_size=None,
+                 pose_pool=None, smoothing=None, side="visible", angle_space="2d"):
+        if exercise_mode not in EXERCISE_MODES and exercise_mode != AUTO_DETECT:
+            raise ValueError(f"Unknown exercise mode: {exercise_mode}")
+        if side not in SIDE_MODES:
+            raise ValueError(f"Unknown side mode: {side}")
+        if angle_space not in ANGLE_SPACES:
+            raise ValueError(f"Unknown angle space: {angle_space}")
+        self.exercise_mode = exercise_mode
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self.cache = cache
+        # With roi_size set, inference runs on a crop around the tracked person
+        # downscaled to roi_size pixels instead of the full frame
+        self.roi_size = roi_size
+        self.roi_tracker = RoiTracker(roi_size) if roi_size else None
+        # Temporal landmark filter applied before scoring (landmark_filters.py);
+        # the cache always holds raw landmarks
+        self.smoothing = smoothing
+        # Which body side each joint angle is taken from (exercise_rules.SIDE_MODES)
+        self.side = side
+        # Joint angles from image ('2d') or world ('3d') landmarks
+        self.angle_space = angle_space
+        self.buffers = FrameBuffers()
+        # With a PosePool the model is leased from it instead of built here
+        self.pose_pool = pose_pool
+        self._pose = None
+        # Static-image model for frames inferred out of order (densified gaps)
+        self._still_pose = None
+
+    @property
+    def settings(self):
+        """Model settings the landmarks depend on (the landmark cache key)"""
+        return (self.min_detection_confidence, self.min_tracking_confidence, self.model_complexity,
+                self.roi_size)
+
+    @property
+    def pose(self):
+        # Created on first use so scoring cached landmarks never loads the model
+        if self._pose is None:
+            self._pose = self._open_pose(static_image_mode=False)
+        return self._pose
+
+    @property
+    def still_pose(self):
+        if self._still_pose is None:
+            self._still_pose = self._open_pose(static_image_mode=True)
+        return self._still_pose
+
+    def _open_pose(self, static_image_mode):
+        if self.pose_pool is not None:
+            return self.pose_pool.acquire(static_image_mode=static_image_mode,
+                                          model_complexity=self.model_complexity,
+                                          min_detection_confidence=self.min_detection_confidence,
+                                          min_tracking_confidence=self.min_tracking_confidence)
+        return pose_solution().Pose(static_image_mode=static_image_mode,
+                                    min_detection_confidence=self.min_detection_confidence,
+                                    min_tracking_confidence=self.min_tracking_confidence,
+                                    model_complexity=self.model_complexity)
+
+    def _close_pose(self, pose):
+        if pose is not None:
+            if self.pose_pool is not None:
+                self.pose_pool.release(pose)
+            else:
+                pose.close()
+
+    def reset_tracking(self):
+        """Drop tracking state so the next frame starts with a fresh detection"""
+        self._close_pose(self._pose)
+        self._pose = None
+        if self.roi_tracker:
+            self.roi_tracker.reset()
+
+    def close(self):
+        self._close_pose(self._pose)
+        self._close_pose(self._still_pose)
+        self._pose = self._still_pose = None
+
+    def detect_landmarks(self, frame):
+        """(33, 7) landmark array for a BGR frame, or None if no pose was found"""
+        if self.roi_tracker is None:
+            return self._process(frame)
+
+        image, transform = self.roi_tracker.crop(frame)
+        landmarks = self._process(image)
+        if transform is not None:
+            if landmarks is not None:
+                landmarks = transform.map_array(landmarks)
+            else:
+                # Lost the person inside the crop; search the full frame
+                self.roi_tracker.reset()
+                image, _ = self.roi_tracker.crop(frame)
+                landmarks = self._process(image)
+        self.roi_tracker.update(landmarks, frame.shape)
+        return landmarks
+
+    def detect_landmarks_still(self, frame):
+        """detect_landmarks() for a frame outside the tracked sequence.
+
+        Uses the static-image model and leaves the ROI tracker untouched, so
+        the tracking state still follows the frames in capture order.
+        """
+        if self.roi_tracker is not None:
+            image, transform = self.roi_tracker.crop(frame)
+            if transform is not None:
+                landmarks = self._process(image, self.still_pose)
+                if landmarks is not None:
+                    return transform.map_array(landmarks)
+        return self._process(frame, self.still_pose)
+
+    def _process(self, image, pose=None):
+        results = (pose or self.pose).process(self.buffers.bgr_to_rgb(image))
+
+        if results.pose_landmarks:
+            world = results.pose_world_landmarks
+            return landmarks_to_array(results.pose_landmarks.landmark, world.landmark if world else None)
+        return None
+
+    def analyze_frame_for_data(self, frame):
+        """Analyze frame and return data without UI updates"""
+        landmarks = self.detect_landmarks(frame)
+
+        if landmarks is not None:
+            return self.analyze_landmarks(landmarks, frame.shape)
+
+        return {'pose_detected': False}
+
+    def analyze_landmarks(self, landmarks, frame_shape):
+        """Exercise and posture metrics for one (33, 7) array of detected landmarks"""
+        columns = self.score_landmarks(landmarks[np.newaxis], frame_shape)
+        data = {
+            'pose_detected': True,
+            'landmarks': [tuple(lm) for lm in landmarks[:, :3].tolist()]
+        }
+        data.update({key: values[0] for key, values in columns.items()})
+        return data
+
+    def score_landmarks(self, landmarks, frame_shape, exercise=None):
+        """Vectorized exercise and posture metrics for (N, 33, 7) landmarks.
+
+        Returns {result key: array of shape (N,)}, using the same keys as the
+        per-frame result dicts. exercise defaults to the engine's mode.
+        """
+        exercise = exercise or self.exercise_mode
+        scores = compiled_rules((exercise,), self.side, self.angle_space).evaluate(landmarks, frame_shape)
+        return self._columns(scores.get(exercise), exercise, self._posture_columns(landmarks, frame_shape))
+
+    def evaluate_all(self, landmarks, frame_shape):
+        """RuleEvaluator.evaluate result for every exercise, in one pass"""
+        return compiled_rules(EXERCISES, self.side, self.angle_space).evaluate(landmarks, frame_shape)
+
+    def score_all(self, landmarks, frame_shape, scores=None):
+        """score_landmarks for every exercise at once.
+
+        Returns {exercise: columns}. All exercises are scored in one rule
+        evaluation (or taken from scores, an evaluate_all result) and the
+        posture columns are shared.
+        """
+        if scores is None:
+            scores = self.evaluate_all(landmarks, frame_shape)
+        posture = self._posture_columns(landmarks, frame_shape)
+        return {exercise: self._columns(score, exercise, posture) for exercise, score in scores.items()}
+
+    @staticmethod
+    def _columns(score, exercise, posture):
+        # Exercise-specific analysis from the exercise's rules (exercise_rules.py)
+        columns = {}
+        if score is not None:
+            columns['exercise'] = np.full(len(score['good_form']), exercise)
+            columns.update(score['angles'])
+            columns.update(score['asymmetry'])
+            columns['form_status'] = np.where(score['good_form'], "Good Form", "Check Form")
+        columns.update(posture)
+        return columns
+
+    @staticmethod
+    def _posture_columns(landmarks, frame_shape):
+        points = pixel_coords(landmarks, frame_shape)
+        shoulder_symmetry = np.abs(points[:, LEFT_SHOULDER, 1] - points[:, RIGHT_SHOULDER, 1])
+        hip_symmetry = np.abs(points[:, LEFT_HIP, 1] - points[:, RIGHT_HIP, 1])
+        good_posture = (shoulder_symmetry <= 30) & (hip_symmetry <= 30)
+        return {
+            'shoulder_symmetry': shoulder_symmetry,
+            'hip_symmetry': hip_symmetry,
+            'posture_status': np.where(good_posture, "Good Posture", "Check Posture")
+        }
+
+    def extract_landmarks(self, video_path, progress_callback=None, workers=1, trace_path=None,
+                          live_summary=None, sampler=None):
+        """Raw per-frame landmarks of a clip as a LandmarkTrace.
+
+        Served from the landmark cache when possible. With workers > 1 a clip
+        of at least MIN_PARALLEL_FRAMES is split across a process pool.
+        progress_callback, if given, is
+        called as progress_callback(frames_done, total_frames). If trace_path
+        is given the landmarks are also written there as a binary trace.
+        live_summary, a StreamingSummary, is updated with the current
+        exercise's scores as frames are extracted, smoothed the same way as
+        in score_trace so the final summary matches it.
+
+        With a FrameSampler only keyframes are inferred and the other frames
+        are interpolated. Subsampled landmarks are approximate, so they are
+        neither read from nor written to the cache, and sampling always runs
+        on a single process: workers is ignored.
+        """
+        cache = self.cache if sampler is None else None
+        if cache:
+            trace = cache.load(video_path, self.settings)
+            if trace is not None:
+                if trace_path:
+                    write_trace(trace_path, self._trace_header(trace.fps, trace.width, trace.height),
+                                trace.landmarks)
+                if live_summary:
+                    live_summary.update_columns(trace.detected,
+                                                self.score_landmarks(self._smoothed(trace), trace.frame_shape))
+                if progress_callback:
+                    progress_callback(len(trace), len(trace))
+                return trace
+
+        total_frames, fps, width, height = probe_video(video_path)
+        header = self._trace_header(fps, width, height)
+        live_smoother = self.new_smoother(fps) if live_summary else None
+        with ExitStack() as stack:
+            # Traces are streamed to disk as frames are analyzed
+            writers = []
+            if trace_path:
+                writers.append(stack.enter_context(TraceWriter(trace_path, header)))
+            if cache:
+                writers.append(stack.enter_context(cache.writer(video_path, self.settings, header)))
+
+            if workers > 1 and total_frames >= MIN_PARALLEL_FRAMES and sampler is None:
+                def on_chunk(chunk_landmarks):
+                    if live_summary:
+                        # Chunks arrive in frame order, so one filter runs across them
+                        if live_smoother is not None:
+                            chunk_landmarks = smooth_trace(chunk_landmarks, live_smoother, reset=False)
+                        live_summary.update_columns(~np.isnan(chunk_landmarks[:, 0, 0]),
+                                                    self.score_landmarks(chunk_landmarks, (height, width)))
+
+                landmarks = _extract_landmarks_parallel(video_path, self.settings, workers,
+                                                        total_frames, progress_callback, on_chunk)
+                for writer in writers:
+                    writer.write(landmarks)
+            else:
+                landmarks = self._extract_landmarks_serial(video_path, total_frames, writers,
+                                                           progress_callback, live_summary, sampler,
+                                                           live_smoother)
+
+        return LandmarkTrace(landmarks, fps, width, height)
+
+    def _trace_header(self, fps, width, height):
+        return trace_header(fps, width, height, self.exercise_mode, self.settings)
+
+    def _extract_landmarks_serial(self, video_path, total_frames, writers, progress_callback=None,
+                                  live_summary=None, sampler=None, live_smoother=None):
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video: {video_path}")
+
+        self.reset_tracking()
+        frames = []
+
+        def emit(landmarks, frame_shape):
+            if live_summary:
+                scored = live_smoother.update(landmarks) if live_smoother is not None else landmarks
+                live_summary.update(self.analyze_landmarks(scored, frame_shape)
+                                    if scored is not None else {'pose_detected': False})
+            if landmarks is None:
+                landmarks = empty_landmarks()
+            frames.append(landmarks)
+            for writer in writers:
+                writer.write(landmarks)
+
+            if progress_callback:
+                progress_callback(len(frames), total_frames)
+
+        # Frames decoded since the last keyframe, waiting for the next one
+        pending = []
+        key_landmarks = None
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                if sampler and frames and not sampler.should_infer(frame, len(pending) + 1):
+                    pending.append(frame)
+                    continue
+
+                landmarks = self.detect_landmarks(frame)
+                if sampler:
+                    sampler.mark_keyframe(frame)
+                    self._fill_gap(sampler, key_landmarks, landmarks, pending, emit)
+                    pending = []
+                    key_landmarks = landmarks
+                emit(landmarks, frame.shape)
+
+            if pending:
+                # Close the last gap with the final decoded frame as its keyframe
+                frame = pending.pop()
+                landmarks = self.detect_landmarks(frame)
+                sampler.mark_keyframe(frame)
+                self._fill_gap(sampler, key_landmarks, landmarks, pending, emit)
+                emit(landmarks, frame.shape)
+        finally:
+            cap.release()
+            if self.pose_pool is not None:
+                # Hand the leased model back between clips
+                self.close()
+
+        return _stack_landmarks(frames)
+
+    def _fill_gap(self, sampler, start_landmarks, end_landmarks, pending, emit):
+        """Landmarks for the skipped frames between two keyframes"""
+        if not pending:
+            return
+        frame_shape = pending[0].shape
+        if sampler.needs_densify(start_landmarks, end_landmarks, frame_shape):
+            # The end keyframe has already gone through the tracking model
+            sampler.densified += len(pending)
+            for frame in pending:
+                emit(self.detect_landmarks_still(frame), frame_shape)
+        elif start_landmarks is None:
+            # No pose at either end
+            sampler.interpolated += len(pending)
+            for _ in pending:
+                emit(None, frame_shape)
+        else:
+            sampler.interpolated += len(pending)
+            for landmarks in interpolate_landmarks(start_landmarks, end_landmarks, len(pending)):
+                emit(landmarks, frame_shape)
+
+    def new_smoother(self, fps=30.0):
+        """Fresh landmark filter for one stream of frames, or None without smoothing"""
+        return make_filter(self.smoothing, fps)
+
+    def _smoothed(self, trace):
+        smoother = self.new_smoother(trace.fps)
+        return smooth_trace(trace.landmarks, smoother) if smoother is not None else trace.landmarks
+
+    def detect_exercise(self, trace, **options):
+        """ExerciseSegments of stored landmarks; see exercise_detection.detect_exercise"""
+        options.setdefault('side', self.side)
+        options.setdefault('space', self.angle_space)
+        return detect_exercise(self._smoothed(trace), trace.frame_shape, trace.fps, **options)
+
+    def score_trace(self, trace):
+        """VideoResultStore for the current exercise mode from stored landmarks.
+
+        In auto mode every frame is scored against every exercise in one
+        pass; see _score_segments.
+        """
+        landmarks = self._smoothed(trace)
+        if self.exercise_mode == AUTO_DETECT:
+            return self._score_segments(trace, landmarks)
+        columns = self.score_landmarks(landmarks, trace.frame_shape)
+        store = VideoResultStore(trace.fps, self.exercise_mode, capacity=len(trace))
+        store.extend_columns(landmarks, trace.detected, columns)
+        return store
+
+    def _score_segments(self, trace, landmarks):
+        """Auto mode: each detected ExerciseSegment is scored as its own exercise.
+
+        Frames keep the angles of every exercise and form verdicts for all of
+        them (store.exercise_form); form_status and the segment summaries use
+        the exercise of the frame's segment. The store's summary is titled
+        with the dominant exercise and counts only that exercise's reps.
+        """
+        frame_shape, detected = trace.frame_shape, trace.detected
+        scores = self.evaluate_all(landmarks, frame_shape)
+        segments = detect_exercise(landmarks, frame_shape, trace.fps, side=self.side,
+                                   space=self.angle_space, scores=scores)
+        by_exercise = self.score_all(landmarks, frame_shape, scores)
+        dominant = dominant_exercise(segments)
+
+        columns = {}
+        for exercise_columns in by_exercise.values():
+            columns.update(exercise_columns)
+        del columns['exercise']
+        columns['form_status'] = np.full(len(landmarks), "", dtype=object)
+        in_dominant = np.zeros(len(landmarks), dtype=bool)
+        store = VideoResultStore(trace.fps, dominant, capacity=len(trace))
+        for segment in segments:
+            rows = slice(segment.start_frame, segment.end_frame)
+            summary = None
+            if segment.exercise in by_exercise:
+                segment_columns = {key: values[rows] for key, values in by_exercise[segment.exercise].items()}
+                columns['form_status'][rows] = segment_columns['form_status']
+                in_dominant[rows] = segment.exercise == dominant
+                summary = StreamingSummary(segment.exercise, trace.fps)
+                summary.update_columns(detected[rows], segment_columns, start_frame=segment.start_frame)
+            store.segment_summaries.append(summary)
+        store.exercise_segments = segments
+        store.exercise_form = {exercise: exercise_columns['form_status'] == "Good Form"
+                               for exercise, exercise_columns in by_exercise.items()}
+
+        store.extend_columns(landmarks, detected, columns, summarize=False)
+        # Reps of the dominant exercise are only counted in its own segments
+        summary_columns = dict(columns)
+        if dominant in EXERCISES:
+            rep_key = EXERCISES[dominant].rep.key
+            summary_columns[rep_key] = np.where(in_dominant, columns[rep_key], np.nan)
+        store.summary.update_columns(detected, summary_columns)
+        return store
+
+    def analyze_video(self, video_path, progress_callback=None, workers=1, trace_path=None,
+                      sampler=None):
+        """Analyze every frame of a clip.
+
+        Returns (VideoResultStore, fps). See extract_landmarks for the other arguments.
+        """
+        trace = self.extract_landmarks(video_path, progress_callback, workers, trace_path,
+                                       sampler=sampler)
+        return self.score_trace(trace), trace.fps
+
+
+def _stack_landmarks(frames):
+    if not frames:
+        return np.empty((0,) + empty_landmarks().shape, dtype=np.float32)
+    return np.stack(frames)
+
+
+# Engine owned by each process-pool worker, created once by _init_worker
+_worker_engine = None
+
+
+def _init_worker(min_detection_confidence, min_tracking_confidence, model_complexity, roi_size):
+    global _worker_engine
+    # One decoder thread per process; parallelism comes from the pool
+    cv2.setNumThreads(1)
+    _worker_engine = VideoAnalysisEngine(min_detection_confidence=min_detection_confidence,
+                                         min_tracking_confidence=min_tracking_confidence,
+                                         model_complexity=model_complexity,
+                                         roi_size=roi_size)
+
+
+def _extract_chunk(video_path, start_frame, end_frame):
+    """Landmarks for frames [start_frame, end_frame) in a worker; end_frame None reads to EOF"""
+    cap = cv2.VideoCapture(video_path)
+    if start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    # Each chunk starts with a fresh detection rather than stale tracking state
+    _worker_engine.reset_tracking()
+    frames = []
+    try:
+        while end_frame is None or start_frame + len(frames) < end_frame:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            landmarks = _worker_engine.detect_landmarks(frame)
+            frames.append(landmarks if landmarks is not None else empty_landmarks())
+    finally:
+        cap.release()
+
+    return start_frame, _stack_landmarks(frames)
+
+
+def split_frame_range(total_frames, workers, min_chunk_frames=120):
+    """Split [0, total_frames) into (start, end) chunks, a few per worker for load balancing.
+
+    The last chunk's end is None so it reads to EOF even when the container's
+    frame count is wrong.
+    """
+    chunk_count = max(1, min(workers * 4, total_frames // min_chunk_frames))
+    bounds = [round(i * total_frames / chunk_count) for i in range(chunk_count)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:] + [None])]
+
+
+def probe_video(video_path):
+    """(frame count, fps, width, height) from the container metadata"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {video_path}")
+    try:
+        return (int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS) or 30,
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        cap.release()
+
+
+def _extract_landmarks_parallel(video_path, settings, workers, total_frames, progress_callback=None,
+                                chunk_callback=None):
+    """(N, 33, 7) landmarks of a clip extracted across a process pool, one Pose instance per worker"""
+    chunks = split_frame_range(total_frames, workers)
+    workers = min(workers, len(chunks))
+    starts = [start for start, _ in chunks]
+
+    # spawn rather than fork: the parent may be running Tk or MediaPipe threads
+    context = multiprocessing.get_context("spawn")
+    chunk_landmarks = {}
+    frames_done = 0
+    # Chunks finish in any order; chunk_callback gets them in frame order so
+    # streaming consumers (rep counting) only ever see contiguous frames
+    next_chunk = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=settings) as pool:
+        futures = [pool.submit(_extract_chunk, video_path, start, end) for start, end in chunks]
+        for future in as_completed(futures):
+            start, landmarks = future.result()
+            chunk_landmarks[start] = landmarks
+            frames_done += len(landmarks)
+            while next_chunk < len(starts) and starts[next_chunk] in chunk_landmarks:
+                if chunk_callback:
+                    chunk_callback(chunk_landmarks[starts[next_chunk]])
+                next_chunk += 1
+            if progress_callback:
+                progress_callback(frames_done, total_frames)
+
+    return np.concatenate([chunk_landmarks[start] for start in sorted(chunk_landmarks)])
+
+
+def generate_video_summary(video_results):
+    """Generate analysis summary text from a VideoResultStore"""
+    return video_results.summary.render()
+
+
+def format_segments(segments, fps, summaries=None):
+    """One line per ExerciseSegment with its time span, and its reps and form from summaries"""
+    lines = []
+    for segment, summary in zip(segments, summaries or [None] * len(segments)):
+        line = (f"  {segment.start_frame / fps:6.1f}s - {segment.end_frame / fps:6.1f}s: "
+                f"{segment.exercise} (score {segment.score:.2f})")
+        if summary is not None and summary.frames:
+            line += (f", {summary.reps.count} reps, "
+                     f"{summary.good_form / summary.frames * 100:.0f}% good form")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def rep_records(video_results):
+    """Every counted rep as a dict with its exercise, per segment in auto mode"""
+    if not video_results.segment_summaries:
+        return [dict(rep._asdict(), exercise=video_results.exercise)
+                for rep in video_results.summary.reps.records]
+    return [dict(rep._asdict(), exercise=summary.exercise)
+            for summary in video_results.segment_summaries if summary is not None
+            for rep in summary.reps.records]
+
+
+def export_results(output_path, video_path, exercise, fps, video_results, summary):
+    """Write analysis results for one clip to a JSON file"""
+    export_data = {
+        'exercise_mode': exercise,
+        'export_timestamp': datetime.now().isoformat(),
+        'video_file': video_path,
+        'fps': fps,
+        'summary': summary,
+        'reps': rep_records(video_results),
+        'exercise_segments': [segment._asdict() for segment in video_results.exercise_segments],
+        'video_analysis_results': list(video_results)
+    }
+    with open(output_path, 'w') as f:
+        json.dump(export_data, f, default=float)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch pose analysis of workout video clips")
+    parser.add_argument("videos", nargs="+", help="video files to analyze")
+    parser.add_argument("--exercise", choices=EXERCISE_MODES + [AUTO_DETECT], default="bicep_curl",
+                        help="exercise performed in the clips, or auto to detect it per clip")
+    parser.add_argument("--output-dir", help="write one <clip>.json result file per video here")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.7)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.7)
+    parser.add_argument("--model-complexity", type=int, choices=[0, 1, 2], default=1)
+    parser.add_argument("--roi-size", type=int,
+                        help="run inference on a crop around the tracked person, downscaled to this many pixels")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes per clip (0 = one per CPU core)")
+    parser.add_argument("--cache-dir", help="landmark cache directory (default: ~/.cache/smartan/landmarks)")
+    parser.add_argument("--no-cache", action="store_true", help="always run pose inference")
+    parser.add_argument("--trace-dir", help="also write one <clip>.smtrace binary landmark trace per video here")
+    parser.add_argument("--smoothing", choices=SMOOTHING_METHODS, default="none",
+                        help="temporal landmark filter applied before scoring")
+    parser.add_argument("--side", choices=SIDE_MODES, default="visible",
+                        help="body side joint angles are taken from: the more visible one per frame, "
+                             "a visibility-weighted mean, or always left/right")
+    parser.add_argument("--angles", choices=ANGLE_SPACES, default="2d",
+                        help="measure joint angles on the image (2d) or on metric world landmarks (3d)")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="run pose inference on every Nth frame and interpolate the rest "
+                             "(runs on one process; --workers is ignored)")
+    parser.add_argument("--motion-threshold", type=float,
+                        help="also infer any frame whose motion since the last keyframe reaches this (0-1)")
+    args = parser.parse_args(argv)
+
+    for directory in (args.output_dir, args.trace_dir):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    cache = None
+    if not args.no_cache:
+        cache = LandmarkCache(args.cache_dir) if args.cache_dir else LandmarkCache()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    engine = VideoAnalysisEngine(args.exercise,
+                                 min_detection_confidence=args.min_detection_confidence,
+                                 min_tracking_confidence=args.min_tracking_confidence,
+                                 model_complexity=args.model_complexity,
+                                 cache=cache, roi_size=args.roi_size, smoothing=args.smoothing,
+                                 side=args.side, angle_space=args.angles)
+    failures = 0
+    try:
+        for video_path in args.videos:
+            name = os.path.splitext(os.path.basename(video_path))[0]
+            trace_path = os.path.join(args.trace_dir, name + ".smtrace") if args.trace_dir else None
+            sampler = None
+            if args.stride > 1 or args.motion_threshold is not None:
+                sampler = FrameSampler(args.stride, args.motion_threshold, args.exercise, args.side)
+            try:
+                video_results, fps = engine.analyze_video(video_path, workers=workers,
+                                                          trace_path=trace_path, sampler=sampler)
+            except Exception as e:
+                print(f"{video_path}: analysis failed: {e}")
+                failures += 1
+                continue
+
+            summary = generate_video_summary(video_results)
+            print(f"{video_path}\n{summary}\n")
+            if video_results.exercise_segments:
+                print("Detected exercise:\n" + format_segments(video_results.exercise_segments, fps,
+                                                                video_results.segment_summaries) + "\n")
+            if sampler:
+                print(f"Frame sampling: {sampler.stats()}\n")
+
+            if args.output_dir:
+                export_results(os.path.join(args.output_dir, name + ".json"), video_path,
+                               video_results.exercise, fps, video_results, summary)
+    finally:
+        engine.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
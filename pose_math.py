@@ -0,0 +1,69 @@
+"""Vectorized joint-angle computation over whole landmark arrays.
+
+Works on (N, 33, C) arrays of normalized landmarks (x, y first) as stored in
+a LandmarkTrace, so a whole clip is scored in a handful of NumPy operations
+instead of one calculate_angle call per joint per frame.
+
+Angles are measured either in 2D on the image (the default) or in 3D on
+MediaPipe's world landmarks, which are metric and do not change with where
+the camera stands.
+"""
+import numpy as np
+
+from landmark_cache import WORLD_FIELDS
+
+ANGLE_SPACES = ('2d', '3d')
+
+# MediaPipe Pose landmark indices (mp.solutions.pose.PoseLandmark), kept here
+# so array code does not need to import mediapipe
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_ELBOW, RIGHT_ELBOW = 13, 14
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_HIP, RIGHT_HIP = 23, 24
+LEFT_KNEE, RIGHT_KNEE = 25, 26
+LEFT_ANKLE, RIGHT_ANKLE = 27, 28
+
+# Joint name -> (a, b, c) landmark indices; the angle is measured at b
+JOINT_TRIPLETS = {
+    'left_elbow': (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST),
+    'right_elbow': (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST),
+    'left_hip': (LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE),
+    'right_hip': (RIGHT_SHOULDER, RIGHT_HIP, RIGHT_KNEE),
+    'left_knee': (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE),
+    'right_knee': (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE),
+}
+
+
+def batch_angles(a, b, c):
+    """Angle at b in degrees for arrays of 2D points of shape (..., 2).
+
+    Same result as pose_engine.calculate_angle, element-wise.
+    """
+    ba = a - b
+    bc = c - b
+    radians = np.arctan2(bc[..., 1], bc[..., 0]) - np.arctan2(ba[..., 1], ba[..., 0])
+    angle = np.abs(np.degrees(radians))
+    return np.where(angle > 180.0, 360.0 - angle, angle)
+
+
+def pixel_coords(landmarks, frame_shape):
+    """(..., 33, 2) pixel coordinates from normalized landmarks and a frame shape (h, w, ...)"""
+    scale = np.array([frame_shape[1], frame_shape[0]], dtype=np.float32)
+    return landmarks[..., :2] * scale
+
+
+def batch_angles_3d(a, b, c):
+    """Angle at b in degrees for arrays of 3D points of shape (..., 3)"""
+    ba = a - b
+    bc = c - b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Coincident points give NaN, like frames without a pose
+        cosine = np.sum(ba * bc, axis=-1) / (np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1))
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def world_coords(landmarks):
+    """(..., 33, 3) metric world coordinates from (..., 33, 7) landmarks"""
+    if landmarks.shape[-1] <= WORLD_FIELDS.start:
+        raise ValueError("Landmarks have no world coordinates; run pose inference again to get them")
+    return landmarks[..., WORLD_FIELDS]
@@ -0,0 +1,152 @@
+"""Pool of reusable MediaPipe Pose instances.
+
+A Pose graph keeps tracking state between process() calls, so two jobs
+sharing one instance (say live webcam and clip playback) corrupt each
+other's tracking, and building a new one per job pays the model load each
+time. PosePool keeps idle instances per configuration and leases them out
+to one job at a time:
+
+    with pool.lease(static_image_mode=True) as pose:
+        results = pose.process(rgb_image)
+
+Still images should lease with static_image_mode=True (every call runs
+detection); video leases keep tracking between frames and are reset when
+returned. warm_async() builds instances on a background thread so the model
+load happens before the first analysis instead of during it.
+
+mediapipe itself is only imported when the first instance is built (see
+pose_solution), since importing it takes seconds.
+"""
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+# Blank frame pushed through a new instance so the graph is fully started
+WARMUP_IMAGE_SHAPE = (64, 64, 3)
+
+
+class PosePool:
+    def __init__(self, model_complexity=1, min_detection_confidence=0.7, min_tracking_confidence=0.7):
+        self.model_complexity = model_complexity
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self._idle = {}
+        self._keys = {}
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.created = 0
+
+    def _key(self, static_image_mode, model_complexity, min_detection_confidence, min_tracking_confidence):
+        return (bool(static_image_mode),
+                self.model_complexity if model_complexity is None else model_complexity,
+                self.min_detection_confidence if min_detection_confidence is None else min_detection_confidence,
+                self.min_tracking_confidence if min_tracking_confidence is None else min_tracking_confidence)
+
+    def _create(self, key):
+        static_image_mode, model_complexity, min_detection_confidence, min_tracking_confidence = key
+        pose = pose_solution().Pose(static_image_mode=static_image_mode, model_complexity=model_complexity,
+                            min_detection_confidence=min_detection_confidence,
+                            min_tracking_confidence=min_tracking_confidence)
+        pose.process(np.zeros(WARMUP_IMAGE_SHAPE, dtype=np.uint8))
+        if not static_image_mode:
+            _reset(pose)
+        return pose
+
+    def acquire(self, static_image_mode=False, model_complexity=None,
+                min_detection_confidence=None, min_tracking_confidence=None):
+        """Lease a Pose for exclusive use; settings left as None use the pool defaults.
+
+        Reuses an idle instance, waits for one that is being warmed, or
+        builds a new one. Give it back with release().
+        """
+        key = self._key(static_image_mode, model_complexity, min_detection_confidence, min_tracking_confidence)
+        with self._condition:
+            if self._closed:
+                raise ValueError("PosePool is closed")
+            while not self._idle.get(key) and self._pending.get(key):
+                self._condition.wait()
+            idle = self._idle.get(key)
+            if idle:
+                pose = idle.pop()
+                self._keys[id(pose)] = key
+                return pose
+        pose = self._create(key)
+        with self._condition:
+            self.created += 1
+            self._keys[id(pose)] = key
+        return pose
+
+    def release(self, pose):
+        """Return a leased instance; video instances have their tracking reset"""
+        with self._condition:
+            key = self._keys.pop(id(pose))
+            closed = self._closed
+        if closed:
+            pose.close()
+            return
+        if not key[0]:
+            _reset(pose)
+        with self._condition:
+            self._idle.setdefault(key, []).append(pose)
+            self._condition.notify_all()
+
+    @contextmanager
+    def lease(self, static_image_mode=False, **settings):
+        pose = self.acquire(static_image_mode, **settings)
+        try:
+            yield pose
+        finally:
+            self.release(pose)
+
+    def warm(self, static_image_modes=(False, True)):
+        """Make sure one idle instance per mode exists, building them in this thread"""
+        keys = [self._key(mode, None, None, None) for mode in static_image_modes]
+        with self._condition:
+            keys = [key for key in keys if not self._idle.get(key) and not self._pending.get(key)]
+            for key in keys:
+                self._pending[key] = self._pending.get(key, 0) + 1
+        for key in keys:
+            pose = None
+            try:
+                pose = self._create(key)
+            except Exception as e:
+                # Leave it to acquire() to build (and report) on first use
+                print(f"Pose model warm-up failed: {e}")
+            finally:
+                with self._condition:
+                    self._pending[key] -= 1
+                    if pose is not None:
+                        self.created += 1
+                        self._idle.setdefault(key, []).append(pose)
+                    self._condition.notify_all()
+
+    def warm_async(self, static_image_modes=(False, True)):
+        """warm() on a daemon thread; returns the thread"""
+        thread = threading.Thread(target=self.warm, args=(static_image_modes,), daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Close idle instances; leased ones are closed when released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, {}
+            self._condition.notify_all()
+        for poses in idle.values():
+            for pose in poses:
+                pose.close()
+
+
+def pose_solution():
+    """mediapipe.solutions.pose, importing mediapipe on first use"""
+    import mediapipe as mp
+    return mp.solutions.pose
+
+
+def _reset(pose):
+    # Pose.reset() restarts the graph, dropping the tracked ROI and smoothing state
+    reset = getattr(pose, 'reset', None)
+    if reset is not None:
+        reset()
@@ -0,0 +1,132 @@
+"""Streaming rep segmentation from an exercise's primary joint angle.
+
+Every supported exercise has a primary angle that is large at rest
+(extended) and small at the working end of the movement (flexed): the elbow
+for curls and push-ups, the knee for squats. RepDetector smooths that angle
+with an exponential moving average and runs a two-threshold (hysteresis)
+state machine over it: a rep is a movement from extended (above high) into
+flexed (below low) and back above high. Noise around a single threshold
+cannot count twice, and each frame costs O(1).
+"""
+import math
+from collections import namedtuple
+
+from exercise_rules import EXERCISES, check_for
+
+# Primary joint (exercise_rules joint name, e.g. 'elbow'), the per-frame
+# result key holding its angle, and the (low, high) hysteresis thresholds in degrees
+RepThresholds = namedtuple('RepThresholds', ['joint', 'result_key', 'low', 'high'])
+
+REP_THRESHOLDS = {
+    name: RepThresholds(check_for(rule, rule.rep.key).joint, rule.rep.key, rule.rep.low, rule.rep.high)
+    for name, rule in EXERCISES.items()
+}
+
+# One completed rep. Frames are indices into the stream; the rep starts on
+# the last extended frame, bottoms out at the smallest angle and ends on the
+# first extended frame after it. max_angle is the peak of the extended phase
+# before the descent (frames after end_frame belong to the next rep's
+# extended phase). Angles are EMA-smoothed; durations are in seconds.
+RepRecord = namedtuple('RepRecord', [
+    'index', 'start_frame', 'bottom_frame', 'end_frame', 'min_angle', 'max_angle',
+    'duration', 'eccentric', 'concentric',
+])
+
+
+class RepDetector:
+    """Counts reps and records per-rep metrics, one angle at a time.
+
+    alpha is the EMA weight of the newest angle (1 disables smoothing).
+    Modes without thresholds (general_pose) never count.
+    """
+
+    def __init__(self, exercise_mode, fps=30.0, alpha=0.5):
+        self.thresholds = REP_THRESHOLDS.get(exercise_mode)
+        self.joint = self.thresholds.joint if self.thresholds else None
+        self.result_key = self.thresholds.result_key if self.thresholds else None
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.records = []
+        self.phase = None
+        self.smoothed = None
+        self._frame = 0
+        self._start_frame = None
+        self._bottom_frame = None
+        self._min = None
+        self._max = None
+        # Highest angle of the current extended phase
+        self._peak = None
+
+    @property
+    def count(self):
+        return len(self.records)
+
+    def update(self, angle, frame_idx=None):
+        """Feed one frame's primary angle (NaN/None when no pose).
+
+        frame_idx defaults to one past the previous frame. Returns the
+        RepRecord completed by this frame, or None.
+        """
+        if frame_idx is None:
+            frame_idx = self._frame
+        self._frame = frame_idx + 1
+        if self.thresholds is None or angle is None or math.isnan(angle):
+            return None
+
+        angle = float(angle)
+        self.smoothed = angle if self.smoothed is None else self.smoothed + self.alpha * (angle - self.smoothed)
+        value = self.smoothed
+
+        if value > self.thresholds.high:
+            completed = None
+            if self.phase == 'flexed':
+                completed = self._complete(frame_idx, value)
+                # A new extended phase, and with it the next rep's peak, starts here
+                self._peak = value
+            else:
+                self._peak = value if self._peak is None else max(self._peak, value)
+            self.phase = 'extended'
+            # Until the angle drops again, the rep would start here, at the
+            # top it reached while extended
+            self._start_frame = self._bottom_frame = frame_idx
+            self._min = value
+            self._max = self._peak
+            return completed
+
+        if self._start_frame is not None:
+            if value < self._min:
+                self._min = value
+                self._bottom_frame = frame_idx
+            self._max = max(self._max, value)
+        if value < self.thresholds.low and self.phase == 'extended':
+            self.phase = 'flexed'
+        return None
+
+    def update_many(self, angles, start_frame=None):
+        """Feed consecutive frames; returns the RepRecords they complete"""
+        if start_frame is None:
+            start_frame = self._frame
+        completed = []
+        for offset, angle in enumerate(angles):
+            record = self.update(angle, start_frame + offset)
+            if record is not None:
+                completed.append(record)
+        return completed
+
+    def _complete(self, end_frame, value):
+        record = RepRecord(
+            index=len(self.records) + 1,
+            start_frame=self._start_frame,
+            bottom_frame=self._bottom_frame,
+            end_frame=end_frame,
+            min_angle=self._min,
+            max_angle=max(self._max, value),
+            duration=(end_frame - self._start_frame) / self.fps,
+            eccentric=(self._bottom_frame - self._start_frame) / self.fps,
+            concentric=(end_frame - self._bottom_frame) / self.fps,
+        )
+        self.records.append(record)
+        return record
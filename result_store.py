@@ -0,0 +1,142 @@
+"""Columnar storage for per-frame video analysis results.
+
+A list of result dicts costs several KB of Python objects per frame (33
+landmark tuples plus status strings); an hour of 60 fps footage runs into
+gigabytes. VideoResultStore keeps the same data in preallocated float32
+arrays and int8 status codes, so summaries become array reductions.
+
+Indexing or iterating the store still yields the familiar result dicts.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+from video_summary import SUMMARY_METRICS, StreamingSummary
+
+NUM_LANDMARKS = 33
+# Image x, y, z and visibility; world coordinates are not kept
+LANDMARK_FIELDS = 4
+
+# Status code 0 means "not scored" (no pose, or general_pose mode)
+FORM_STATUSES = ("", "Good Form", "Check Form")
+POSTURE_STATUSES = ("", "Good Posture", "Check Posture")
+
+# Angles and left/right differences, as summarized
+ANGLE_KEYS = SUMMARY_METRICS
+SCALAR_KEYS = ('shoulder_symmetry', 'hip_symmetry')
+
+
+def encode_statuses(values, statuses):
+    """int8 codes for an array of status strings"""
+    codes = np.zeros(len(values), dtype=np.int8)
+    for code, status in enumerate(statuses[1:], start=1):
+        codes[values == status] = code
+    return codes
+
+
+class VideoResultStore:
+    def __init__(self, fps=30.0, exercise=None, capacity=1024):
+        self.fps = fps
+        self.exercise = exercise
+        # Kept up to date as frames are added so the final summary is O(1)
+        self.summary = StreamingSummary(exercise, fps)
+        # When the exercise was auto-detected: the ExerciseSegments, each
+        # scored as its own exercise, with one StreamingSummary per segment
+        # (None for general_pose), and the per-frame good-form verdict of
+        # every exercise, {exercise: (N,) bool}
+        self.exercise_segments = []
+        self.segment_summaries = []
+        self.exercise_form = {}
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.landmarks = np.full((capacity, NUM_LANDMARKS, LANDMARK_FIELDS), np.nan, dtype=np.float32)
+        self.angles = np.full((capacity, len(ANGLE_KEYS)), np.nan, dtype=np.float32)
+        self.scalars = np.full((capacity, len(SCALAR_KEYS)), np.nan, dtype=np.float32)
+        self.detected = np.zeros(capacity, dtype=bool)
+        self.form_status = np.zeros(capacity, dtype=np.int8)
+        self.posture_status = np.zeros(capacity, dtype=np.int8)
+
+    def _columns(self):
+        return ('landmarks', 'angles', 'scalars', 'detected', 'form_status', 'posture_status')
+
+    def reserve(self, capacity):
+        """Grow the preallocated arrays to hold at least capacity frames"""
+        old_capacity = len(self.detected)
+        if capacity <= old_capacity:
+            return
+        new_capacity = max(capacity, old_capacity * 2)
+        old = {name: getattr(self, name) for name in self._columns()}
+        self._allocate(new_capacity)
+        for name, values in old.items():
+            getattr(self, name)[:self._size] = values[:self._size]
+
+    def extend_columns(self, landmarks, detected, columns, summarize=True):
+        """Append N frames at once from (N, 33, C) landmarks and vectorized score columns.
+
+        With summarize=False the caller updates self.summary itself.
+        """
+        n = len(landmarks)
+        self.reserve(self._size + n)
+        if summarize:
+            self.summary.update_columns(detected, columns)
+        rows = slice(self._size, self._size + n)
+        self._size += n
+
+        fields = min(landmarks.shape[2], LANDMARK_FIELDS)
+        self.landmarks[rows, :, :fields] = landmarks[:, :, :fields]
+        self.detected[rows] = detected
+        for j, key in enumerate(ANGLE_KEYS):
+            if key in columns:
+                self.angles[rows, j] = np.where(detected, columns[key], np.nan)
+        for j, key in enumerate(SCALAR_KEYS):
+            if key in columns:
+                self.scalars[rows, j] = np.where(detected, columns[key], np.nan)
+        if 'form_status' in columns:
+            self.form_status[rows] = np.where(detected, encode_statuses(columns['form_status'], FORM_STATUSES), 0)
+        if 'posture_status' in columns:
+            self.posture_status[rows] = np.where(detected, encode_statuses(columns['posture_status'], POSTURE_STATUSES), 0)
+
+    def exercise_at(self, i):
+        """Exercise frame i was scored as"""
+        if not self.exercise_segments:
+            return self.exercise
+        starts = [segment.start_frame for segment in self.exercise_segments]
+        return self.exercise_segments[bisect_right(starts, i) - 1].exercise
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        """Result dict for frame i, in the format produced by the per-frame analysis"""
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+
+        result = {'pose_detected': bool(self.detected[i])}
+        if result['pose_detected']:
+            result['landmarks'] = [tuple(lm) for lm in self.landmarks[i, :, :3].tolist()]
+            if self.form_status[i]:
+                result['exercise'] = self.exercise_at(i)
+            for j, key in enumerate(ANGLE_KEYS):
+                if not np.isnan(self.angles[i, j]):
+                    result[key] = float(self.angles[i, j])
+            if self.form_status[i]:
+                result['form_status'] = FORM_STATUSES[self.form_status[i]]
+            for j, key in enumerate(SCALAR_KEYS):
+                if not np.isnan(self.scalars[i, j]):
+                    result[key] = float(self.scalars[i, j])
+            if self.posture_status[i]:
+                result['posture_status'] = POSTURE_STATUSES[self.posture_status[i]]
+            if self.exercise_form:
+                result['form_by_exercise'] = {exercise: FORM_STATUSES[1] if good[i] else FORM_STATUSES[2]
+                                              for exercise, good in self.exercise_form.items()}
+        result['frame'] = i
+        result['timestamp'] = i / self.fps
+        return result
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
@@ -0,0 +1,130 @@
+"""Person region-of-interest tracking for cheaper pose inference.
+
+RoiTracker derives a bounding box from the previous frame's landmarks and
+hands pose inference a crop of just that region, downscaled to a target
+size, instead of the full-resolution frame. Landmarks found in the crop are
+mapped back to normalized full-frame coordinates, so everything downstream
+(get_coords, joint angles, drawing) works unchanged. When the person is
+lost the next frame is searched in full. The box only moves when the person
+nears its edge or changes size, so a still person keeps an identical crop
+from frame to frame.
+"""
+import numpy as np
+
+from frame_buffers import FrameBuffers
+
+
+class RoiTransform:
+    """Placement of a crop in the full frame, in pixels"""
+
+    def __init__(self, x0, y0, width, height, frame_width, frame_height):
+        self.x0 = x0
+        self.y0 = y0
+        self.width = width
+        self.height = height
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+
+    def map_array(self, landmarks):
+        """(33, C) crop-normalized landmarks -> full-frame normalized (new array)"""
+        mapped = landmarks.copy()
+        mapped[:, 0] = (self.x0 + landmarks[:, 0] * self.width) / self.frame_width
+        mapped[:, 1] = (self.y0 + landmarks[:, 1] * self.height) / self.frame_height
+        # MediaPipe z uses the same scale as x
+        mapped[:, 2] = landmarks[:, 2] * self.width / self.frame_width
+        return mapped
+
+    def map_landmark_list(self, landmark_list):
+        """Map a MediaPipe NormalizedLandmarkList to full-frame coordinates in place"""
+        for lm in landmark_list.landmark:
+            lm.x = (self.x0 + lm.x * self.width) / self.frame_width
+            lm.y = (self.y0 + lm.y * self.height) / self.frame_height
+            lm.z = lm.z * self.width / self.frame_width
+
+
+class RoiTracker:
+    """Tracks a square person box across frames.
+
+    target_size is the longest side, in pixels, of the image given to pose
+    inference; margin pads the landmark bounding box by that fraction of its
+    size on every side so fast movement stays inside the crop.
+
+    The box is kept while the landmarks stay keep_margin (a fraction of the
+    box side) inside its edges and the box they call for is within
+    resize_threshold of its size; otherwise it is recomputed around them.
+    """
+
+    def __init__(self, target_size=256, margin=0.3, min_visibility=0.5, keep_margin=0.1, resize_threshold=0.2):
+        self.target_size = target_size
+        self.margin = margin
+        self.min_visibility = min_visibility
+        self.keep_margin = keep_margin
+        self.resize_threshold = resize_threshold
+        self.box = None
+        # Side of the current box before clipping to the frame
+        self._side = None
+        self.full_frame_detections = 0
+        self.roi_detections = 0
+        self.buffers = FrameBuffers()
+
+    def reset(self):
+        self.box = None
+        self._side = None
+
+    def crop(self, frame):
+        """(image for inference, RoiTransform) for the current box.
+
+        Without a box the full frame is returned as is, with transform None.
+        A downscaled crop lives in a reused buffer, valid until the next call.
+        """
+        if self.box is None:
+            self.full_frame_detections += 1
+            return frame, None
+
+        self.roi_detections += 1
+        x0, y0, x1, y1 = self.box
+        crop = frame[y0:y1, x0:x1]
+        height, width = crop.shape[:2]
+        scale = self.target_size / max(width, height)
+        if scale < 1:
+            crop = self.buffers.resize(crop, (max(1, round(width * scale)), max(1, round(height * scale))))
+        return crop, RoiTransform(x0, y0, width, height, frame.shape[1], frame.shape[0])
+
+    def update(self, landmarks, frame_shape):
+        """Set the box for the next frame from full-frame normalized (33, 4) landmarks, or None if lost"""
+        if landmarks is None:
+            self.reset()
+            return
+
+        visible = landmarks[:, 3] >= self.min_visibility
+        if np.count_nonzero(visible) < 4:
+            self.reset()
+            return
+
+        frame_height, frame_width = frame_shape[:2]
+        xs = landmarks[visible, 0] * frame_width
+        ys = landmarks[visible, 1] * frame_height
+        center_x, center_y = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * self.margin)
+        side = min(max(side, self.target_size / 2), max(frame_width, frame_height))
+        if self.box is not None and self._keeps_box(xs, ys, side, frame_width, frame_height):
+            return
+
+        x0 = int(max(0, center_x - side / 2))
+        y0 = int(max(0, center_y - side / 2))
+        x1 = int(min(frame_width, center_x + side / 2))
+        y1 = int(min(frame_height, center_y + side / 2))
+        if x1 - x0 > 1 and y1 - y0 > 1:
+            self.box, self._side = (x0, y0, x1, y1), side
+        else:
+            self.reset()
+
+    def _keeps_box(self, xs, ys, side, frame_width, frame_height):
+        """True if the current box still fits landmarks spanning xs, ys that call for a box of side"""
+        if abs(side - self._side) > self.resize_threshold * self._side:
+            return False
+        inset = self.keep_margin * self._side
+        x0, y0, x1, y1 = self.box
+        # Edges on the frame border never need to move outwards
+        return ((x0 == 0 or xs.min() >= x0 + inset) and (x1 == frame_width or xs.max() <= x1 - inset) and
+                (y0 == 0 or ys.min() >= y0 + inset) and (y1 == frame_height or ys.max() <= y1 - inset))
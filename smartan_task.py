@@ -1,59 +1,117 @@
 import cv2
-import mediapipe as mp
-import numpy as np
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
 import os
 import threading
 import time
 import json
 from datetime import datetime
 
+from frame_buffers import FrameBuffers
+from live_pipeline import DropOldestQueue, LivePipeline
+from playback_clock import PlaybackClock
+from video_reader import LRUCache, SeekableVideoReader
+from landmark_cache import WORLD_FIELDS, LandmarkCache, landmarks_to_array
+from landmark_filters import make_filter
+from roi_tracking import RoiTracker
+from pose_pool import PosePool, pose_solution
+from rep_detector import RepDetector
+from exercise_rules import ASYMMETRY_WARNING, EXERCISES, EXERCISE_MODES, asymmetry_key, compiled_rules, hints_for
+from pose_math import LEFT_ELBOW, LEFT_HIP, LEFT_SHOULDER, LEFT_WRIST, RIGHT_HIP, RIGHT_SHOULDER
+from pose_engine import VideoAnalysisEngine, calculate_angle, generate_video_summary
+from ui_bridge import INITIAL_PROGRESS, INITIAL_SNAPSHOT, FeedbackBuffer, SnapshotSlot
+from video_summary import StreamingSummary
+
 class PoseAnalysisGUI:
-    def __init__(self, root):
+    def __init__(self, root, model_complexity=1, preload_model=True, smoothing="one_euro", angle_space="2d"):
         self.root = root
         self.root.title("Enhanced Pose Analysis Tool - Smartan FitTech")
         self.root.geometry("1500x1000")
         self.root.configure(bg='#f0f0f0')
         
-        # Initialize MediaPipe
-        self.mp_pose = mp.solutions.pose
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.pose = self.mp_pose.Pose(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        # Every job (live, playback, seek, still image, clip analysis) leases
+        # its own Pose. mediapipe is not imported until the first instance is
+        # built: in the background once the window is up (preload_model), or
+        # else by the first analysis action
+        self.pose_pool = PosePool(model_complexity=model_complexity,
+                                  min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        # Landmark filter for live, playback and clip analysis (landmark_filters.py)
+        self.smoothing = smoothing
+        self.live_smoother = None
+        # Joint angles from the image ('2d') or from metric world landmarks ('3d')
+        self.angle_space = angle_space
+        
+        # Headless engine used for whole-clip analysis
+        self.engine = VideoAnalysisEngine(min_detection_confidence=0.7, min_tracking_confidence=0.7,
+                                          model_complexity=model_complexity, cache=LandmarkCache(),
+                                          pose_pool=self.pose_pool, smoothing=smoothing,
+                                          angle_space=angle_space)
+        self.analysis_workers = max(1, (os.cpu_count() or 1) - 1)
         
         # Video capture and playback
         self.cap = None
         self.video_cap = None
+        self.video_reader = None
+        self.seek_pose_cache = LRUCache(256)
+        self.roi_tracker = RoiTracker(target_size=256)
         self.is_recording = False
         self.is_playing_video = False
-        self.video_thread = None
+        self.live_pipeline = None
         self.video_playback_thread = None
+        self.playback_clock = None
+        # When playback falls behind, skipped frames are only grabbed; with this
+        # set they are also run through pose tracking (not analyzed or drawn)
+        # so tracking stays continuous across the gap
+        self.track_dropped_frames = False
         
         # Video clip analysis
         self.video_file_path = None
         self.current_frame_idx = 0
         self.total_frames = 0
-        self.fps = 30
+        self.fps = 30.0
         self.video_analysis_results = []
+        self.video_trace = None
         
         # Variables
         self.current_image = None
+        self.canvas_image_id = None
+        self.display_buffers = FrameBuffers()
+        # Inference runs on several threads; FrameBuffers are single-threaded
+        self.inference_buffers = threading.local()
         self.analyzed_image = None
         self.original_frame = None
         
         # Exercise tracking
         self.exercise_mode = tk.StringVar(value="bicep_curl")
-        self.exercise_state = "down"  
-        self.pushup_state = "up"
+        # Plain copy of exercise_mode for the analysis threads, which must not
+        # touch Tk variables; kept in sync by on_exercise_change
+        self.current_exercise = self.exercise_mode.get()
+        self.rep_detector = RepDetector(self.current_exercise)
         self.rep_count = 0
         
         # Exercise history
-        self.bicep_angles = []
-        self.pushup_angles = []
+        # Primary (rep) angle of every analyzed frame
+        self.exercise_angles = []
         self.analysis_data = []
         
+        # Output of analysis threads, drawn on a fixed UI tick; analysis
+        # never touches Tk variables or widgets directly
+        self.feedback = FeedbackBuffer()
+        self.ui_state = SnapshotSlot(INITIAL_SNAPSHOT)
+        self.applied_state = None
+        self.ui_interval_ms = 100
+        # Playback frames, shown by playback_tick at its own faster rate
+        self.playback_frames = DropOldestQueue(1)
+        self.playback_interval_ms = 10
+        self.playback_ticking = False
+        # Running clip analysis: (progress slot, progress dialog widgets,
+        # last progress applied), polled by ui_tick
+        self.clip_analysis = None
+        
         self.setup_ui()
+        self.root.after(self.ui_interval_ms, self.ui_tick)
+        if preload_model:
+            self.root.after_idle(self.pose_pool.warm_async)
     
     def setup_ui(self):
         # Main title
@@ -77,7 +135,7 @@ class PoseAnalysisGUI:
                 bg='#f0f0f0').pack()
         
         exercise_combo = ttk.Combobox(exercise_frame, textvariable=self.exercise_mode,
-                                    values=["bicep_curl", "pushup", "squat", "general_pose"],
+                                    values=EXERCISE_MODES,
                                     state="readonly", width=15)
         exercise_combo.pack(pady=5)
         exercise_combo.bind("<<ComboboxSelected>>", self.on_exercise_change)
@@ -215,6 +273,9 @@ class PoseAnalysisGUI:
         self.form_status_label = tk.Label(self.exercise_frame, textvariable=self.form_status_var, 
                                          font=('Arial', 10, 'bold'), bg='#f0f0f0')
         self.form_status_label.pack(pady=2)
+        self.rep_count_var = tk.StringVar(value="Reps: 0")
+        tk.Label(self.exercise_frame, textvariable=self.rep_count_var, 
+                font=('Arial', 10), bg='#f0f0f0').pack(pady=1)
         
         # Posture Analysis
         posture_frame = tk.LabelFrame(results_frame, text="🏃 Posture Analysis", 
@@ -266,18 +327,30 @@ class PoseAnalysisGUI:
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
     
     def on_exercise_change(self, event=None):
+        mode = self.current_exercise = self.exercise_mode.get()
         self.reset_count()
-        mode = self.exercise_mode.get()
-        if mode == "bicep_curl":
-            self.exercise_frame.config(text="Bicep Curl Analysis")
-        elif mode == "pushup":
-            self.exercise_frame.config(text="Push-up Analysis")
-        elif mode == "squat":
-            self.exercise_frame.config(text="Squat Analysis")
-        else:
-            self.exercise_frame.config(text="General Pose Analysis")
+        rule = EXERCISES.get(mode)
+        self.exercise_frame.config(text=f"{rule.title if rule else 'General Pose'} Analysis")
         
         self.status_var.set(f"Exercise mode changed to: {mode.replace('_', ' ').title()}")
+        
+        # Landmarks don't depend on the exercise, so an analyzed clip is just re-scored
+        if self.video_trace is not None:
+            self.engine.exercise_mode = mode
+            self.video_analysis_results = self.engine.score_trace(self.video_trace)
+            self.generate_video_summary()
+    
+    def reset_count(self):
+        self.rep_detector = RepDetector(self.current_exercise)
+        self.rep_count = 0
+        self.ui_state.update(reps="Reps: 0")
+    
+    def count_reps(self, angle):
+        # Same smoothed, hysteresis-based detector as clip analysis (rep_detector.py)
+        if self.rep_detector.update(angle) is not None:
+            self.rep_count = self.rep_detector.count
+            self.ui_state.update(reps=f"Reps: {self.rep_count}")
+        return self.rep_detector.phase or "ready"
     
     
     def browse_image(self):
@@ -311,11 +384,16 @@ class PoseAnalysisGUI:
     
     def load_video_info(self, file_path):
         try:
+            if self.video_reader:
+                self.video_reader.close()
+            self.seek_pose_cache.clear()
+            self.video_trace = None
+            self.video_analysis_results = []
+            
             self.video_file_path = file_path
-            cap = cv2.VideoCapture(file_path)
-            self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            self.fps = int(cap.get(cv2.CAP_PROP_FPS))
-            cap.release()
+            self.video_reader = SeekableVideoReader(file_path)
+            self.total_frames = self.video_reader.frame_count
+            self.fps = float(self.video_reader.fps)
             
             self.current_frame_idx = 0
             self.video_progress.config(to=self.total_frames-1)
@@ -323,31 +401,35 @@ class PoseAnalysisGUI:
             self.play_video_btn.config(state=tk.NORMAL)
             
             # Load first frame
-            cap = cv2.VideoCapture(file_path)
-            ret, frame = cap.read()
-            if ret:
+            frame = self.video_reader.read(0)
+            if frame is not None:
                 self.display_image(frame)
-            cap.release()
             
-            self.status_var.set(f"Video loaded: {os.path.basename(file_path)} ({self.total_frames} frames, {self.fps} FPS)")
+            self.status_var.set(f"Video loaded: {os.path.basename(file_path)} ({self.total_frames} frames, {self.fps:.2f} FPS)")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load video: {str(e)}")
             self.status_var.set("Error loading video")
     
     def on_video_seek(self, value):
-        if self.video_file_path and not self.is_playing_video:
+        if self.video_reader and not self.is_playing_video:
             try:
                 frame_idx = int(float(value))
-                cap = cv2.VideoCapture(self.video_file_path)
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                if ret:
+                frame = self.video_reader.read(frame_idx)
+                if frame is not None:
                     self.current_frame_idx = frame_idx
                     self.frame_info_var.set(f"Frame: {frame_idx}/{self.total_frames}")
-                    analyzed_frame = self.analyze_frame(frame.copy())
+                    
+                    # Reuse pose results for frames visited recently
+                    results = self.seek_pose_cache.get(frame_idx)
+                    if results is None:
+                        # Seeks jump around the clip, so run detection on every frame
+                        with self.pose_pool.lease(static_image_mode=True) as pose:
+                            results = self.detect_pose(frame, pose)
+                        self.seek_pose_cache.put(frame_idx, results)
+                    
+                    analyzed_frame = self.analyze_frame(frame.copy(), results)
                     self.display_image(analyzed_frame)
-                cap.release()
             except Exception as e:
                 print(f"Seek error: {e}")
     
@@ -361,36 +443,95 @@ class PoseAnalysisGUI:
             self.play_video_btn.config(text="Pause", bg='#f39c12')
             self.video_playback_thread = threading.Thread(target=self.video_playback_loop, daemon=True)
             self.video_playback_thread.start()
+            if not self.playback_ticking:
+                self.playback_ticking = True
+                self.root.after(self.playback_interval_ms, self.playback_tick)
+            self.root.after(1000, self.update_playback_stats)
         else:
             self.is_playing_video = False
             self.play_video_btn.config(text="Play Video", bg='#e67e22')
     
     def video_playback_loop(self):
+        with self.pose_pool.lease() as pose:
+            self.play_frames(pose, RoiTracker(target_size=256), make_filter(self.smoothing, self.fps))
+        # playback_tick reports the end once this thread is gone
+        self.is_playing_video = False
+    
+    def playback_tick(self):
+        # Frames from the playback thread are drawn here, on the UI thread
+        shown = self.playback_frames.get_nowait()
+        if shown is not None:
+            self.update_video_playback(*shown)
+        if self.video_playback_thread.is_alive() or len(self.playback_frames):
+            self.root.after(self.playback_interval_ms, self.playback_tick)
+            return
+        self.playback_ticking = False
+        stats = self.playback_clock.stats()
+        self.status_var.set(f"Playback stopped - average {stats['average_fps']:.1f} FPS, "
+                            f"{stats['presented']} frames shown, {stats['dropped']} dropped")
+        self.play_video_btn.config(text="Play Video", bg='#e67e22')
+    
+    def play_frames(self, pose, roi_tracker, smoother):
         cap = cv2.VideoCapture(self.video_file_path)
         cap.set(cv2.CAP_PROP_POS_FRAMES, self.current_frame_idx)
+        # Frames are shown at their presentation time rather than after a fixed sleep
+        clock = self.playback_clock = PlaybackClock(self.fps, self.current_frame_idx)
         
         while self.is_playing_video and self.current_frame_idx < self.total_frames:
+            # Behind schedule: skip the frames whose time has passed
+            behind = min(clock.frames_behind(self.current_frame_idx),
+                         self.total_frames - 1 - self.current_frame_idx)
+            if behind > 0:
+                if not self.skip_frames(cap, behind, pose, roi_tracker):
+                    break
+                clock.drop(behind)
+                self.current_frame_idx += behind
+            
             ret, frame = cap.read()
             if not ret:
                 break
             
-            analyzed_frame = self.analyze_frame(frame.copy())
+            results = self.detect_pose(frame, pose, roi_tracker, smoother, self.current_frame_idx / self.fps)
+            analyzed_frame = self.analyze_frame(frame, results)
             
-            # Update UI in main thread
-            self.root.after(0, self.update_video_playback, analyzed_frame)
-            
-            # Control playback speed
-            time.sleep(1.0 / max(self.fps, 1))
+            # Hand the frame to the UI thread once it is due
+            clock.wait_until(self.current_frame_idx)
+            self.playback_frames.put((analyzed_frame, self.current_frame_idx))
+            clock.present()
             self.current_frame_idx += 1
         
         cap.release()
-        self.is_playing_video = False
-        self.root.after(0, lambda: self.play_video_btn.config(text="Play Video", bg='#e67e22'))
     
-    def update_video_playback(self, frame):
+    def skip_frames(self, cap, count, pose, roi_tracker):
+        for _ in range(count):
+            if not self.track_dropped_frames:
+                # grab() still decodes (FFmpeg needs every frame for the next
+                # ones) but skips the BGR conversion and copy that read() does
+                if not cap.grab():
+                    return False
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                return False
+            self.detect_pose(frame, pose, roi_tracker)
+        if not self.track_dropped_frames:
+            # The person may have moved across the gap; search the full frame
+            roi_tracker.reset()
+        return True
+    
+    def update_video_playback(self, frame, frame_idx):
         self.display_image(frame)
-        self.video_progress.set(self.current_frame_idx)
-        self.frame_info_var.set(f"Frame: {self.current_frame_idx}/{self.total_frames}")
+        self.video_progress.set(frame_idx)
+        self.frame_info_var.set(f"Frame: {frame_idx}/{self.total_frames}")
+    
+    def update_playback_stats(self):
+        if not self.is_playing_video or self.playback_clock is None:
+            return
+        stats = self.playback_clock.stats()
+        self.status_var.set(
+            f"Playback - {stats['fps']:.1f} of {stats['target_fps']:.2f} FPS | "
+            f"presented {stats['presented']}, dropped {stats['dropped']}")
+        self.root.after(1000, self.update_playback_stats)
     
     def analyze_video_clip(self):
         if not self.video_file_path:
@@ -413,225 +554,79 @@ class PoseAnalysisGUI:
         progress_label = tk.Label(progress_window, text="Frame: 0/0")
         progress_label.pack(pady=5)
         
+        # Read the mode once here; the worker thread must not touch Tk variables
+        exercise = self.exercise_mode.get()
+        self.engine.exercise_mode = exercise
+        
+        # The analysis thread only publishes into this slot; ui_tick shows it
+        progress = SnapshotSlot(INITIAL_PROGRESS)
+        self.clip_analysis = (progress, progress_window, progress_bar, progress_label, [None])
+        
         # Start analysis in separate thread
         def analyze_thread():
             try:
-                self.video_analysis_results = []
-                cap = cv2.VideoCapture(self.video_file_path)
-                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                # Running summary shown while the clip is still being analyzed
+                live_summary = StreamingSummary(exercise, self.fps)
+                last_refresh = [-1]
                 
-                frame_idx = 0
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
-                    # Analyze frame
-                    results = self.analyze_frame_for_data(frame)
-                    if results:
-                        results['frame'] = frame_idx
-                        results['timestamp'] = frame_idx / self.fps
-                        self.video_analysis_results.append(results)
-                    
-                    # Update progress
-                    progress = (frame_idx / total_frames) * 100
-                    progress_window.after(0, lambda p=progress, f=frame_idx, t=total_frames: 
-                                        self.update_progress(progress_bar, progress_label, p, f, t))
-                    
-                    frame_idx += 1
+                def on_progress(frame_idx, total_frames):
+                    progress.update(frame=frame_idx, total=total_frames)
+                    # Progress comes a frame at a time (serial) or a chunk at a
+                    # time (process pool); refresh whenever another 30 frames are done
+                    if frame_idx // 30 != last_refresh[0]:
+                        last_refresh[0] = frame_idx // 30
+                        progress.update(summary=live_summary.render())
                 
-                cap.release()
-                
-                # Generate summary
-                self.generate_video_summary()
-                
-                # Close progress dialog
-                progress_window.after(0, progress_window.destroy)
-                self.status_var.set(f"Video analysis complete - {len(self.video_analysis_results)} frames analyzed")
+                self.video_trace = self.engine.extract_landmarks(
+                    self.video_file_path, progress_callback=on_progress,
+                    workers=self.analysis_workers, live_summary=live_summary)
+                self.video_analysis_results = self.engine.score_trace(self.video_trace)
+                self.fps = self.video_trace.fps
+                progress.update(done=True)
                 
             except Exception as e:
-                progress_window.after(0, progress_window.destroy)
-                messagebox.showerror("Error", f"Video analysis failed: {str(e)}")
+                progress.update(error=str(e))
         
         analysis_thread = threading.Thread(target=analyze_thread, daemon=True)
         analysis_thread.start()
     
+    def poll_clip_analysis(self):
+        """Show the progress of a running clip analysis; called from ui_tick"""
+        if self.clip_analysis is None:
+            return
+        progress, progress_window, progress_bar, progress_label, applied = self.clip_analysis
+        state = progress.latest()
+        previous = applied[0]
+        if state is previous:
+            return
+        applied[0] = state
+        if previous is None or (state.frame, state.total) != (previous.frame, previous.total):
+            self.update_progress(progress_bar, progress_label,
+                                 state.frame / max(state.total, 1) * 100, state.frame, state.total)
+        if state.summary is not None and (previous is None or state.summary != previous.summary):
+            self.show_summary(state.summary)
+        
+        if state.done or state.error is not None:
+            self.clip_analysis = None
+            progress_window.destroy()
+            if state.error is not None:
+                messagebox.showerror("Error", f"Video analysis failed: {state.error}")
+                return
+            self.generate_video_summary()
+            self.status_var.set(f"Video analysis complete - {len(self.video_analysis_results)} frames analyzed")
+    
     def update_progress(self, progress_bar, progress_label, progress, frame, total):
         progress_bar['value'] = progress
         progress_label.config(text=f"Frame: {frame}/{total}")
     
-    def analyze_frame_for_data(self, frame):
-        """Analyze frame and return data without UI updates"""
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.pose.process(image)
-        
-        if results.pose_landmarks:
-            landmarks = results.pose_landmarks.landmark
-            
-            data = {
-                'pose_detected': True,
-                'landmarks': [(lm.x, lm.y, lm.z) for lm in landmarks]
-            }
-            
-            # Exercise-specific analysis
-            if self.exercise_mode.get() == "bicep_curl":
-                elbow_angle, form_status = self.analyze_bicep_curl_data(landmarks, frame)
-                data.update({
-                    'exercise': 'bicep_curl',
-                    'elbow_angle': elbow_angle,
-                    'form_status': form_status
-                })
-            elif self.exercise_mode.get() == "pushup":
-                elbow_angle, body_angle, form_status = self.analyze_pushup_data(landmarks, frame)
-                data.update({
-                    'exercise': 'pushup',
-                    'elbow_angle': elbow_angle,
-                    'body_angle': body_angle,
-                    'form_status': form_status
-                })
-            elif self.exercise_mode.get() == "squat":
-                knee_angle, hip_angle, form_status = self.analyze_squat_data(landmarks, frame)
-                data.update({
-                    'exercise': 'squat',
-                    'knee_angle': knee_angle,
-                    'hip_angle': hip_angle,
-                    'form_status': form_status
-                })
-            
-            # Posture analysis
-            posture_data = self.analyze_posture_data(landmarks, frame)
-            data.update(posture_data)
-            
-            return data
-        
-        return {'pose_detected': False}
-    
-    def analyze_bicep_curl_data(self, landmarks, frame):
-        """Analyze bicep curl without UI updates"""
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        l_elbow = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ELBOW.value, frame)
-        l_wrist = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_WRIST.value, frame)
-        
-        elbow_angle = self.calculate_angle(l_shoulder, l_elbow, l_wrist)
-        form_status = "Good Form" if 30 <= elbow_angle <= 170 else "Check Form"
-        
-        return elbow_angle, form_status
-    
-    def analyze_pushup_data(self, landmarks, frame):
-        """Analyze pushup without UI updates"""
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        l_elbow = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ELBOW.value, frame)
-        l_wrist = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_WRIST.value, frame)
-        l_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_HIP.value, frame)
-        l_knee = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_KNEE.value, frame)
-        
-        elbow_angle = self.calculate_angle(l_shoulder, l_elbow, l_wrist)
-        body_angle = self.calculate_angle(l_shoulder, l_hip, l_knee)
-        
-        elbow_form = "Good" if 70 <= elbow_angle <= 180 else "Check Elbow"
-        body_form = "Good" if 160 <= body_angle <= 180 else "Straighten Body"
-        form_status = "Good Form" if elbow_form == "Good" and body_form == "Good" else "Check Form"
-        
-        return elbow_angle, body_angle, form_status
-    
-    def analyze_squat_data(self, landmarks, frame):
-        """Analyze squat without UI updates"""
-        l_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_HIP.value, frame)
-        l_knee = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_KNEE.value, frame)
-        l_ankle = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ANKLE.value, frame)
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        
-        knee_angle = self.calculate_angle(l_hip, l_knee, l_ankle)
-        hip_angle = self.calculate_angle(l_shoulder, l_hip, l_knee)
-        
-        knee_form = "Good" if 70 <= knee_angle <= 180 else "Check Depth"
-        hip_form = "Good" if 160 <= hip_angle <= 180 else "Check Posture"
-        form_status = "Good Form" if knee_form == "Good" and hip_form == "Good" else "Check Form"
-        
-        return knee_angle, hip_angle, form_status
-    
-    def analyze_posture_data(self, landmarks, frame):
-        """Analyze posture without UI updates"""
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        r_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value, frame)
-        l_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_HIP.value, frame)
-        r_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.RIGHT_HIP.value, frame)
-        
-        shoulder_symmetry = abs(l_shoulder[1] - r_shoulder[1])
-        hip_symmetry = abs(l_hip[1] - r_hip[1])
-        
-        posture_status = "Good Posture" if shoulder_symmetry <= 30 and hip_symmetry <= 30 else "Check Posture"
-        
-        return {
-            'shoulder_symmetry': shoulder_symmetry,
-            'hip_symmetry': hip_symmetry,
-            'posture_status': posture_status
-        }
-    
     def generate_video_summary(self):
         """Generate analysis summary from video results"""
         if not self.video_analysis_results:
             return
         
-        exercise = self.exercise_mode.get()
-        total_frames = len(self.video_analysis_results)
-        duration = total_frames / self.fps if self.fps > 0 else 0
-        
-        # Calculate statistics
-        good_form_count = sum(1 for r in self.video_analysis_results 
-                             if r.get('form_status') == 'Good Form')
-        good_form_percentage = (good_form_count / total_frames) * 100 if total_frames > 0 else 0
-        
-        good_posture_count = sum(1 for r in self.video_analysis_results 
-                                if r.get('posture_status') == 'Good Posture')
-        good_posture_percentage = (good_posture_count / total_frames) * 100 if total_frames > 0 else 0
-        
-        summary = f"=== VIDEO ANALYSIS SUMMARY ===\n"
-        summary += f"Exercise: {exercise.replace('_', ' ').title()}\n"
-        summary += f"Duration: {duration:.1f} seconds\n"
-        summary += f"Frames Analyzed: {total_frames}\n\n"
-        
-        summary += f"FORM ANALYSIS:\n"
-        summary += f"• Good Form: {good_form_percentage:.1f}% ({good_form_count}/{total_frames} frames)\n"
-        summary += f"• Posture Quality: {good_posture_percentage:.1f}% good posture\n\n"
-        
-        if exercise == "bicep_curl":
-            angles = [r.get('elbow_angle', 0) for r in self.video_analysis_results if 'elbow_angle' in r]
-            if angles:
-                summary += f"BICEP CURL METRICS:\n"
-                summary += f"• Average Elbow Angle: {np.mean(angles):.1f}\n"
-                summary += f"• Range: {min(angles):.1f} - {max(angles):.1f}\n"
-                summary += f"• Recommended Range: 30° - 170°\n\n"
-        
-        elif exercise == "pushup":
-            elbow_angles = [r.get('elbow_angle', 0) for r in self.video_analysis_results if 'elbow_angle' in r]
-            body_angles = [r.get('body_angle', 0) for r in self.video_analysis_results if 'body_angle' in r]
-            if elbow_angles and body_angles:
-                summary += f"PUSH-UP METRICS:\n"
-                summary += f"• Average Elbow Angle: {np.mean(elbow_angles):.1f}\n"
-                summary += f"• Average Body Alignment: {np.mean(body_angles):.1f}\n"
-                summary += f"• Elbow Range: {min(elbow_angles):.1f} - {max(elbow_angles):.1f}\n\n"
-        
-        elif exercise == "squat":
-            knee_angles = [r.get('knee_angle', 0) for r in self.video_analysis_results if 'knee_angle' in r]
-            hip_angles = [r.get('hip_angle', 0) for r in self.video_analysis_results if 'hip_angle' in r]
-            if knee_angles and hip_angles:
-                summary += f"SQUAT METRICS:\n"
-                summary += f"• Average Knee Angle: {np.mean(knee_angles):.1f}°\n"
-                summary += f"• Average Hip Angle: {np.mean(hip_angles):.1f}°\n"
-                summary += f"• Knee Range: {min(knee_angles):.1f}° - {max(knee_angles):.1f}°\n\n"
-        
-        # Recommendations
-        summary += f"RECOMMENDATIONS:\n"
-        if good_form_percentage < 80:
-            summary += f"• Focus on maintaining proper form throughout the movement\n"
-        if good_posture_percentage < 80:
-            summary += f"• Work on body alignment and posture\n"
-        if good_form_percentage >= 90:
-            summary += f"• Excellent form consistency!\n"
-        
-        summary += f"\nAnalysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
+        self.show_summary(generate_video_summary(self.video_analysis_results))
+    
+    def show_summary(self, summary):
         # Update summary text widget
         self.summary_text.delete(1.0, tk.END)
         self.summary_text.insert(1.0, summary)
@@ -680,11 +675,22 @@ class PoseAnalysisGUI:
                     return
                 
                 self.is_recording = True
+                self.roi_tracker.reset()
+                pose = self.pose_pool.acquire()
+                self.live_smoother = make_filter(self.smoothing)
                 self.start_video_btn.config(state=tk.DISABLED)
                 self.stop_video_btn.config(state=tk.NORMAL)
                 
-                self.video_thread = threading.Thread(target=self.video_loop, daemon=True)
-                self.video_thread.start()
+                # Capture and inference run on their own threads; frames are
+                # rendered from the Tk loop so the display always shows the newest one
+                # The model belongs to the inference thread, which hands it
+                # back when it exits, so it is never closed or reused while
+                # process() is still running on it
+                self.live_pipeline = LivePipeline(self.cap, lambda frame: self.process_live_frame(frame, pose),
+                                                  self.display_image, self.root.after,
+                                                  on_exit=lambda: self.pose_pool.release(pose))
+                self.live_pipeline.start()
+                self.root.after(1000, self.update_live_stats)
                 
                 self.status_var.set("Real-time webcam analysis started")
                 
@@ -694,6 +700,10 @@ class PoseAnalysisGUI:
     def stop_video(self):
         self.is_recording = False
         self.is_playing_video = False
+        if self.live_pipeline:
+            # The inference thread releases its model as it exits
+            self.live_pipeline.stop()
+            self.live_pipeline = None
         if self.cap:
             self.cap.release()
         
@@ -702,22 +712,24 @@ class PoseAnalysisGUI:
         self.play_video_btn.config(text="Play Video", bg='#e67e22')
         self.status_var.set("Video analysis stopped")
     
-    def video_loop(self):
-        while self.is_recording:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
-            
-            # Flip frame horizontally for mirror effect
-            frame = cv2.flip(frame, 1)
-            
-            # Analyze the frame
-            analyzed_frame = self.analyze_frame(frame)
-            
-            # Display the frame
-            self.root.after(0, self.display_image, analyzed_frame)
-            
-            time.sleep(0.03)  # ~30 FPS
+    def update_live_stats(self):
+        if not self.is_recording or not self.live_pipeline:
+            return
+        if not self.live_pipeline.running:
+            # Camera stopped delivering frames
+            self.stop_video()
+            return
+        
+        stats = self.live_pipeline.stats()
+        self.status_var.set(
+            f"Live - capture {stats['capture']['fps']:.1f} FPS | "
+            f"inference {stats['inference']['fps']:.1f} FPS (queue {stats['capture']['queue_depth']}, "
+            f"dropped {stats['capture']['dropped']}) | display {stats['render']['fps']:.1f} FPS")
+        self.root.after(1000, self.update_live_stats)
+    
+    def process_live_frame(self, frame, pose):
+        results = self.detect_pose(frame, pose, self.roi_tracker, self.live_smoother, time.monotonic())
+        return self.analyze_frame(frame, results)
     
     def load_image(self, file_path):
         try:
@@ -736,9 +748,6 @@ class PoseAnalysisGUI:
     
     def display_image(self, cv_image):
         try:
-            # Convert from BGR to RGB
-            rgb_image = cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB)
-            
             canvas_width = self.canvas.winfo_width()
             canvas_height = self.canvas.winfo_height()
             
@@ -746,164 +755,127 @@ class PoseAnalysisGUI:
                 canvas_width, canvas_height = 800, 600
             
             # Calculate scaling to fit canvas while maintaining aspect ratio
-            img_height, img_width = rgb_image.shape[:2]
+            img_height, img_width = cv_image.shape[:2]
             scale = min(canvas_width/img_width, canvas_height/img_height)
             
             new_width = int(img_width * scale)
             new_height = int(img_height * scale)
             
-            # Resize image
-            resized_image = cv2.resize(rgb_image, (new_width, new_height))
+            # Resize and convert BGR to RGB into reused buffers (resizing first when shrinking)
+            rgb_image = self.display_buffers.resize_to_rgb(cv_image, (new_width, new_height))
             
-            # Convert to PIL Image and then to PhotoImage
-            pil_image = Image.fromarray(resized_image)
-            self.current_image = ImageTk.PhotoImage(pil_image)
+            # Convert to PIL Image and then to PhotoImage, reusing the PhotoImage while the size is unchanged
+            # (PIL is imported on the first display, not at startup)
+            from PIL import Image, ImageTk
+            pil_image = Image.fromarray(rgb_image)
+            if (self.current_image is not None and
+                    (self.current_image.width(), self.current_image.height()) == (new_width, new_height)):
+                self.current_image.paste(pil_image)
+            else:
+                self.current_image = ImageTk.PhotoImage(pil_image)
             
-            # Clear canvas and display image
-            self.canvas.delete("all")
+            # Display image, moving the existing canvas item rather than recreating it
             x = (canvas_width - new_width) // 2
             y = (canvas_height - new_height) // 2
-            self.canvas.create_image(x, y, anchor=tk.NW, image=self.current_image)
+            if self.canvas_image_id is None:
+                self.canvas.delete("all")
+                self.canvas_image_id = self.canvas.create_image(x, y, anchor=tk.NW, image=self.current_image)
+            else:
+                self.canvas.coords(self.canvas_image_id, x, y)
+                self.canvas.itemconfig(self.canvas_image_id, image=self.current_image)
             
         except Exception as e:
             print(f"Display error: {e}")
     
     def calculate_angle(self, a, b, c):
-        a = np.array(a)
-        b = np.array(b)
-        c = np.array(c)
-        radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - \
-                  np.arctan2(a[1] - b[1], a[0] - b[0])
-        angle = np.abs(radians * 180.0 / np.pi)
-        if angle > 180.0:
-            angle = 360 - angle
-        return angle
-    
-    def analyze_bicep_curl(self, landmarks, frame):
-        # Get left arm keypoints
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        l_elbow = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ELBOW.value, frame)
-        l_wrist = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_WRIST.value, frame)
-        
-        # Calculate elbow angle
-        elbow_angle = self.calculate_angle(l_shoulder, l_elbow, l_wrist)
-        self.bicep_angles.append(elbow_angle)
-        
-        # # Rep counting logic
-        # if elbow_angle > 160 and self.exercise_state == "up":
-        #     self.exercise_state = "down"
-        # elif elbow_angle < 50 and self.exercise_state == "down":
-        #     self.exercise_state = "up"
-        #     self.rep_count += 1
-        #     self.rep_count_var.set(f"Reps: {self.rep_count}")
-            
-        
-        # Form analysis
-        form_status = "Good Form" if 30 <= elbow_angle <= 170 else "Check Form"
-        
-        # Update UI
-        self.primary_angle_var.set(f"Elbow Angle: {int(elbow_angle)}°")
-        self.secondary_angle_var.set(f"Range: 30-170°")
-        self.form_status_var.set(f"Form: {form_status}")
-        self.form_status_label.config(fg='green' if form_status == "Good Form" else 'red')
-        self.exercise_state_var.set(f"State: {self.exercise_state.title()}")
-        
-        return elbow_angle, form_status
-    
-    def analyze_pushup(self, landmarks, frame):
-        # Get keypoints for pushup analysis
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        l_elbow = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ELBOW.value, frame)
-        l_wrist = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_WRIST.value, frame)
-        l_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_HIP.value, frame)
-        l_knee = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_KNEE.value, frame)
-        
-        # Calculate angles
-        elbow_angle = self.calculate_angle(l_shoulder, l_elbow, l_wrist)
-        body_angle = self.calculate_angle(l_shoulder, l_hip, l_knee)
-        
-        self.pushup_angles.append(elbow_angle)
-        
-        # Rep counting for pushups
-        if elbow_angle < 90 and self.pushup_state == "up":
-            self.pushup_state = "down"
-        elif elbow_angle > 160 and self.pushup_state == "down":
-            self.pushup_state = "up"
-            self.rep_count += 1
-            self.rep_count_var.set(f"Reps: {self.rep_count}")
+        return calculate_angle(a, b, c)
     
-        # Form analysis
-        elbow_form = "Good" if 70 <= elbow_angle <= 180 else "Check Elbow"
-        body_form = "Good" if 160 <= body_angle <= 180 else "Straighten Body"
-        overall_form = "Good Form" if elbow_form == "Good" and body_form == "Good" else "Check Form"
-        
-        # Update UI
-        self.primary_angle_var.set(f"Elbow Angle: {int(elbow_angle)}")
-        self.secondary_angle_var.set(f"Body Angle: {int(body_angle)}")
-        self.form_status_var.set(f"Form: {overall_form}")
-        self.form_status_label.config(fg='green' if overall_form == "Good Form" else 'red')
-        self.exercise_state_var.set(f"State: {self.pushup_state.title()}")
+    def analyze_exercise(self, landmarks, frame, rule):
+        # Score the frame against the exercise's rules (exercise_rules.py)
+        scores = compiled_rules((rule.name,), space=self.angle_space).evaluate(landmarks, frame.shape)
+        score = scores[rule.name]
+        angles = {key: float(angle) for key, angle in score['angles'].items()}
+        angles.update({key: float(value) for key, value in score['asymmetry'].items()})
+        form_status = "Good Form" if score['good_form'] else "Check Form"
 
-        
-        return elbow_angle, body_angle, overall_form
-    
-    def analyze_squat(self, landmarks, frame):
-        # Get keypoints for squat analysis
-        l_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_HIP.value, frame)
-        l_knee = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_KNEE.value, frame)
-        l_ankle = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ANKLE.value, frame)
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        
-        # Calculate angles
-        knee_angle = self.calculate_angle(l_hip, l_knee, l_ankle)
-        hip_angle = self.calculate_angle(l_shoulder, l_hip, l_knee)
-        
-        # Rep counting for squats
-        if knee_angle < 90 and self.exercise_state == "up":
-            self.exercise_state = "down"
-        elif knee_angle > 90 and self.exercise_state == "down":
-            self.exercise_state = "up"
-            self.rep_count += 1
-            self.rep_count_var.set(f"Reps: {self.rep_count}")
-        
-        # Form analysis
-        knee_form = "Good" if 70 <= knee_angle <= 180 else "Check Depth"
-        hip_form = "Good" if 70 <= hip_angle <= 180 else "Check Posture"
-        overall_form = "Good Form" if knee_form == "Good" and hip_form == "Good" else "Check Form"
-        
-        # Update UI
-        self.primary_angle_var.set(f"Knee Angle: {int(knee_angle)}°")
-        self.secondary_angle_var.set(f"Hip Angle: {int(hip_angle)}°")
-        self.form_status_var.set(f"Form: {overall_form}")
-        self.form_status_label.config(fg='green' if overall_form == "Good Form" else 'red')
-        self.exercise_state_var.set(f"State: {self.exercise_state.title()}")
+        rep_angle = angles[rule.rep.key]
+        self.exercise_angles.append(rep_angle)
+        state = self.count_reps(rep_angle)
+
+        primary = rule.checks[0]
+        if len(rule.checks) > 1:
+            secondary = f"{rule.checks[1].label}: {int(angles[rule.checks[1].key])}°"
+        else:
+            secondary = f"Range: {primary.low}-{primary.high}°"
 
-        return knee_angle, hip_angle, overall_form
+        # Publish for the next UI tick
+        self.ui_state.update(
+            primary_angle=f"{primary.label}: {int(angles[primary.key])}°",
+            secondary_angle=secondary,
+            form_status=f"Form: {form_status}",
+            form_color='green' if form_status == "Good Form" else 'red',
+            exercise_state=f"State: {state.title()}")
+
+        return angles, form_status
     
     def get_coords(self, landmarks, idx, frame):
         lm = landmarks[idx]
         return [lm.x * frame.shape[1], lm.y * frame.shape[0]]
     
-    def analyze_frame(self, frame):
-        # Convert to RGB for MediaPipe
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.pose.process(image)
-        
+    def detect_pose(self, frame, pose, roi_tracker=None, smoother=None, timestamp=None):
+        # Convert to RGB for MediaPipe (into a buffer reused per thread)
+        buffers = getattr(self.inference_buffers, 'buffers', None)
+        if buffers is None:
+            buffers = self.inference_buffers.buffers = FrameBuffers()
+        if roi_tracker is None:
+            results = pose.process(buffers.bgr_to_rgb(frame))
+        else:
+            # Run on a downscaled crop around the person tracked in the previous frame
+            image, transform = roi_tracker.crop(frame)
+            results = pose.process(buffers.bgr_to_rgb(image))
+            
+            if transform is not None:
+                if results.pose_landmarks:
+                    transform.map_landmark_list(results.pose_landmarks)
+                else:
+                    # Lost the person inside the crop; search the full frame
+                    roi_tracker.reset()
+                    results = pose.process(buffers.bgr_to_rgb(frame))
+        
+        if roi_tracker is None and smoother is None:
+            return results
+        
+        landmarks = self.landmark_array(results)
+        if smoother is not None:
+            landmarks = smoother.update(landmarks, timestamp)
+            if landmarks is not None:
+                # Analyze and draw the filtered pose
+                for lm, (x, y, z) in zip(results.pose_landmarks.landmark, landmarks[:, :3].tolist()):
+                    lm.x, lm.y, lm.z = x, y, z
+                if results.pose_world_landmarks:
+                    for lm, (x, y, z) in zip(results.pose_world_landmarks.landmark,
+                                             landmarks[:, WORLD_FIELDS].tolist()):
+                        lm.x, lm.y, lm.z = x, y, z
+        if roi_tracker is not None:
+            roi_tracker.update(landmarks, frame.shape)
+        return results
+    
+    def landmark_array(self, results):
+        """(33, 7) image and world landmarks of a Pose result, or None without a pose"""
+        if not results.pose_landmarks:
+            return None
+        world = results.pose_world_landmarks
+        return landmarks_to_array(results.pose_landmarks.landmark, world.landmark if world else None)
+    
+    def analyze_frame(self, frame, results):
         if results.pose_landmarks:
             landmarks = results.pose_landmarks.landmark
             
             # Exercise-specific analysis
-            if self.exercise_mode.get() == "bicep_curl":
-                elbow_angle, form_status = self.analyze_bicep_curl(landmarks, frame)
-                self.update_realtime_feedback_bicep(elbow_angle, form_status)
-                
-            elif self.exercise_mode.get() == "pushup":
-                elbow_angle, body_angle, form_status = self.analyze_pushup(landmarks, frame)
-                self.update_realtime_feedback_pushup(elbow_angle, body_angle, form_status)
-                
-            elif self.exercise_mode.get() == "squat":
-                knee_angle, hip_angle, form_status = self.analyze_squat(landmarks, frame)
-                self.update_realtime_feedback_squat(knee_angle, hip_angle, form_status)
+            rule = EXERCISES.get(self.current_exercise)
+            if rule is not None:
+                angles, form_status = self.analyze_exercise(self.landmark_array(results), frame, rule)
+                self.update_realtime_feedback(rule, angles, form_status)
                 
             else:  # general_pose
                 self.analyze_general_pose(landmarks, frame)
@@ -912,114 +884,105 @@ class PoseAnalysisGUI:
             self.analyze_posture(landmarks, frame)
             
             # Draw pose landmarks
-            self.mp_drawing.draw_landmarks(
-                frame, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS,
-                self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                self.mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=2)
+            # mediapipe is already loaded once there are results to draw
+            from mediapipe import solutions
+            solutions.drawing_utils.draw_landmarks(
+                frame, results.pose_landmarks, pose_solution().POSE_CONNECTIONS,
+                solutions.drawing_utils.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                solutions.drawing_utils.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=2)
             )
         
         return frame
     
     def analyze_general_pose(self, landmarks, frame):
         # General pose analysis (similar to original code)
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        l_elbow = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_ELBOW.value, frame)
-        l_wrist = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_WRIST.value, frame)
+        l_shoulder = self.get_coords(landmarks, LEFT_SHOULDER, frame)
+        l_elbow = self.get_coords(landmarks, LEFT_ELBOW, frame)
+        l_wrist = self.get_coords(landmarks, LEFT_WRIST, frame)
         
         elbow_angle = self.calculate_angle(l_shoulder, l_elbow, l_wrist)
         
-        self.primary_angle_var.set(f"Elbow Angle: {int(elbow_angle)}°")
-        self.secondary_angle_var.set(f"General Analysis")
-        self.form_status_var.set("Pose Detected")
-        self.form_status_label.config(fg='blue')
+        self.ui_state.update(
+            primary_angle=f"Elbow Angle: {int(elbow_angle)}°",
+            secondary_angle=f"General Analysis",
+            form_status="Pose Detected",
+            form_color='blue')
     
     def analyze_posture(self, landmarks, frame):
         # Posture analysis
-        l_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, frame)
-        r_shoulder = self.get_coords(landmarks, self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value, frame)
-        l_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.LEFT_HIP.value, frame)
-        r_hip = self.get_coords(landmarks, self.mp_pose.PoseLandmark.RIGHT_HIP.value, frame)
+        l_shoulder = self.get_coords(landmarks, LEFT_SHOULDER, frame)
+        r_shoulder = self.get_coords(landmarks, RIGHT_SHOULDER, frame)
+        l_hip = self.get_coords(landmarks, LEFT_HIP, frame)
+        r_hip = self.get_coords(landmarks, RIGHT_HIP, frame)
         
         shoulder_symmetry = abs(l_shoulder[1] - r_shoulder[1])
         hip_symmetry = abs(l_hip[1] - r_hip[1])
         
         posture_status = "Good Posture" if shoulder_symmetry <= 30 and hip_symmetry <= 30 else "Check Posture"
         
-        self.posture_status_var.set(f"Status: {posture_status}")
-        self.posture_status_label.config(fg='green' if posture_status == "Good Posture" else 'orange')
+        self.ui_state.update(
+            posture_status=f"Status: {posture_status}",
+            posture_color='green' if posture_status == "Good Posture" else 'orange')
     
-    def update_realtime_feedback_bicep(self, elbow_angle, form_status):
-        feedback = f"[{time.strftime('%H:%M:%S')}] Bicep Curl\n"
-        feedback += f"• Elbow angle: {int(elbow_angle)}°\n"
+    def update_realtime_feedback(self, rule, angles, form_status):
+        feedback = f"[{time.strftime('%H:%M:%S')}] {rule.title}\n"
+        for check in rule.checks:
+            feedback += f"• {check.label}: {int(angles[check.key])}°\n"
         feedback += f"• Form: {form_status}\n"
         feedback += f"• Reps completed: {self.rep_count}\n"
         
         if form_status == "Good Form":
-            feedback += "• Keep it up! Excellent form!\n"
+            feedback += f"• {rule.good_form_message}\n"
         else:
-            if elbow_angle < 30:
-                feedback += "• Angle too small, extend more\n"
-            elif elbow_angle > 170:
-                feedback += "• Lower the weight, bring curl closer\n"
+            for hint in hints_for(rule, angles):
+                feedback += f"• {hint}\n"
+        for joint in dict.fromkeys(check.joint for check in rule.checks):
+            # NaN (one side hidden) compares False
+            if angles[asymmetry_key(joint)] > ASYMMETRY_WARNING:
+                feedback += f"• Left and right {joint} differ by {int(angles[asymmetry_key(joint)])}°, keep both sides even\n"
         
         feedback += "\n"
         
-        # Update feedback text (keep last 20 lines)
-        self.feedback_text.insert(tk.END, feedback)
-        lines = self.feedback_text.get("1.0", tk.END).split('\n')
-        if len(lines) > 50:
-            self.feedback_text.delete("1.0", f"{len(lines)-50}.0")
-        self.feedback_text.see(tk.END)
+        # Queue for the next UI tick (see ui_tick)
+        self.feedback.push(feedback)
     
-    def update_realtime_feedback_pushup(self, elbow_angle, body_angle, form_status):
-        feedback = f"[{time.strftime('%H:%M:%S')}] Push-up\n"
-        feedback += f"• Elbow angle: {int(elbow_angle)}\n"
-        feedback += f"• Body alignment: {int(body_angle)}\n"
-        feedback += f"• Form: {form_status}\n"
-        feedback += f"• Reps completed: {self.rep_count}\n"
-        
-        if form_status == "Good Form":
-            feedback += "• Excellent form! Keep going!\n"
-        else:
-            if elbow_angle < 70:
-                feedback += "• Go deeper for a full push-up\n"
-            if body_angle < 160:
-                feedback += "• Keep your body straight\n"
-        
-        feedback += "\n"
-        
-        # Update feedback text
-        self.feedback_text.insert(tk.END, feedback)
-        lines = self.feedback_text.get("1.0", tk.END).split('\n')
-        if len(lines) > 50:
-            self.feedback_text.delete("1.0", f"{len(lines)-50}.0")
-        self.feedback_text.see(tk.END)
+    def ui_tick(self):
+        # Redraw analysis output at most once per tick, however fast frames arrive
+        self.flush_feedback()
+        self.apply_ui_state()
+        self.poll_clip_analysis()
+        self.root.after(self.ui_interval_ms, self.ui_tick)
     
-    def update_realtime_feedback_squat(self, knee_angle, hip_angle, form_status):
-        feedback = f"[{time.strftime('%H:%M:%S')}] Squat\n"
-        feedback += f"• Knee angle: {int(knee_angle)}\n"
-        feedback += f"• Hip angle: {int(hip_angle)}\n"
-        feedback += f"• Form: {form_status}\n"
-        feedback += f"• Reps completed: {self.rep_count}\n"
-        
-        if form_status == "Good Form":
-            feedback += "• Perfect squat form!\n"
-        else:
-            if knee_angle < 70:
-                feedback += "• Great depth! Keep it up\n"
-            elif knee_angle > 160:
-                feedback += "• Go deeper for better results\n"
-            if hip_angle < 160:
-                feedback += "• Keep chest up and back straight\n"
-        
-        feedback += "\n"
-        
-        # Update feedback text
-        self.feedback_text.insert(tk.END, feedback)
-        lines = self.feedback_text.get("1.0", tk.END).split('\n')
-        if len(lines) > 50:
-            self.feedback_text.delete("1.0", f"{len(lines)-50}.0")
-        self.feedback_text.see(tk.END)
+    def flush_feedback(self):
+        text = self.feedback.render_if_changed()
+        if text is not None:
+            self.feedback_text.delete("1.0", tk.END)
+            self.feedback_text.insert(tk.END, text)
+            self.feedback_text.see(tk.END)
+    
+    def apply_ui_state(self):
+        state = self.ui_state.latest()
+        previous = self.applied_state
+        if state is previous:
+            return
+        # Only touch the variables and widgets whose content changed
+        if previous is None or state.primary_angle != previous.primary_angle:
+            self.primary_angle_var.set(state.primary_angle)
+        if previous is None or state.secondary_angle != previous.secondary_angle:
+            self.secondary_angle_var.set(state.secondary_angle)
+        if previous is None or state.form_status != previous.form_status:
+            self.form_status_var.set(state.form_status)
+        if previous is None or state.form_color != previous.form_color:
+            self.form_status_label.config(fg=state.form_color)
+        if previous is None or state.exercise_state != previous.exercise_state:
+            self.exercise_state_var.set(state.exercise_state)
+        if previous is None or state.posture_status != previous.posture_status:
+            self.posture_status_var.set(state.posture_status)
+        if previous is None or state.posture_color != previous.posture_color:
+            self.posture_status_label.config(fg=state.posture_color)
+        if previous is None or state.reps != previous.reps:
+            self.rep_count_var.set(state.reps)
+        self.applied_state = state
     
     def analyze_pose(self):
         if self.original_frame is None:
@@ -1031,7 +994,9 @@ class PoseAnalysisGUI:
             self.root.update()
             
             # Analyze the loaded image
-            analyzed_frame = self.analyze_frame(self.original_frame.copy())
+            with self.pose_pool.lease(static_image_mode=True) as pose:
+                results = self.detect_pose(self.original_frame, pose)
+            analyzed_frame = self.analyze_frame(self.original_frame.copy(), results)
             self.display_image(analyzed_frame)
             
             self.status_var.set("Analysis complete")
@@ -1046,6 +1011,9 @@ class PoseAnalysisGUI:
             self.cap.release()
         if self.video_cap:
             self.video_cap.release()
+        if self.video_reader:
+            self.video_reader.close()
+        self.pose_pool.close()
         cv2.destroyAllWindows()
 
 def main():
@@ -1061,4 +1029,4 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
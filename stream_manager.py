@@ -0,0 +1,336 @@
+"""Live pose analysis of several camera streams on a shared worker pool.
+
+Each source (a device index, a video file or an RTSP/HTTP URL) gets its own
+capture thread, Pose model, exercise state and summary (with its rep detector). Inference
+for all streams runs on one pool of worker threads: a scheduler hands the
+newest frame of each stream to a free worker in round-robin order, with at
+most one frame per stream in flight, so a busy stream cannot starve the
+others and a slow one drops frames instead of building a backlog.
+
+    python stream_manager.py 0 1 rtsp://cam3/stream clip.mp4 --exercise squat --workers 4
+
+Video files stand in for cameras: they are read at their own frame rate.
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from landmark_filters import SMOOTHING_METHODS
+from live_pipeline import DropOldestQueue, StageStats
+from playback_clock import PlaybackClock
+from pose_engine import EXERCISE_MODES, VideoAnalysisEngine
+from pose_math import ANGLE_SPACES
+from video_summary import StreamingSummary
+
+
+def open_source(source):
+    """cv2.VideoCapture for a device index ("0" or 0), file path or URL"""
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Could not open stream: {source}")
+    return cap
+
+
+def is_file_source(source):
+    return isinstance(source, str) and not source.isdigit() and "://" not in source
+
+
+def split_source(source):
+    """(source, exercise) from a command-line source with an optional =EXERCISE suffix.
+
+    Only a known exercise mode after the last '=' counts as a suffix, so
+    stream URLs with query strings (rtsp://cam/stream?channel=1) stay whole.
+    """
+    head, _, exercise = source.rpartition("=")
+    if head and exercise in EXERCISE_MODES:
+        return head, exercise
+    return source, None
+
+
+class AnalysisStream:
+    """One source with its own model, exercise state and counters"""
+
+    def __init__(self, name, source, engine, realtime=None):
+        self.name = name
+        self.source = source
+        self.engine = engine
+        # Files are paced to their frame rate so they behave like cameras
+        self.realtime = is_file_source(source) if realtime is None else realtime
+        self.cap = None
+        self.fps = 30.0
+        self.smoother = None
+        self.frames = DropOldestQueue(1)
+        self.capture_stats = StageStats()
+        self.inference_stats = StageStats()
+        self.inference_time = 0.0
+        self.busy = False
+        self.finished = False
+        self.error = None
+        self.detected = 0
+        self.summary = None
+        self.last_result = None
+
+    def open(self):
+        self.cap = open_source(self.source)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.summary = StreamingSummary(self.engine.exercise_mode, self.fps)
+        self.smoother = self.engine.new_smoother(self.fps)
+
+    def analyze(self, frame_idx, frame):
+        """Pose inference and scoring for one captured frame; called on a pool worker"""
+        start = time.perf_counter()
+        landmarks = self.engine.detect_landmarks(frame)
+        if self.smoother is not None:
+            landmarks = self.smoother.update(landmarks, time.monotonic())
+        if landmarks is not None:
+            result = self.engine.analyze_landmarks(landmarks, frame.shape)
+            self.detected += 1
+        else:
+            result = {'pose_detected': False}
+        self.summary.update(result, frame_idx)
+        self.last_result = result
+        self.inference_time += time.perf_counter() - start
+        self.inference_stats.tick()
+
+    def stats(self):
+        inferred = self.inference_stats.frames
+        return {'source': str(self.source), 'exercise': self.engine.exercise_mode,
+                'capture_fps': self.capture_stats.fps, 'inference_fps': self.inference_stats.fps,
+                'captured': self.capture_stats.frames, 'inferred': inferred,
+                'dropped': self.frames.dropped, 'detected': self.detected, 'reps': self.summary.reps.count,
+                'inference_ms': self.inference_time / inferred * 1000 if inferred else 0.0,
+                'finished': self.finished, 'error': self.error}
+
+
+class StreamManager:
+    """Opens N sources and schedules their inference fairly over a shared pool.
+
+    workers is the number of inference threads (default: one per CPU core,
+    capped at the number of streams). Model settings apply to every stream;
+    the exercise mode is chosen per stream in add_stream().
+    """
+
+    def __init__(self, workers=None, min_detection_confidence=0.7, min_tracking_confidence=0.7,
+                 model_complexity=1, roi_size=None, smoothing=None, angle_space="2d"):
+        self.workers = workers
+        self.model_settings = {'min_detection_confidence': min_detection_confidence,
+                               'min_tracking_confidence': min_tracking_confidence,
+                               'model_complexity': model_complexity,
+                               'roi_size': roi_size,
+                               'smoothing': smoothing,
+                               'angle_space': angle_space}
+        self.streams = []
+        self.running = False
+        self.started_at = None
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._pool_size = 0
+        self._next_stream = 0
+        self._threads = []
+        self._executor = None
+
+    def add_stream(self, source, exercise_mode="bicep_curl", name=None, realtime=None):
+        if self.running:
+            raise ValueError("Streams must be added before start()")
+        engine = VideoAnalysisEngine(exercise_mode, **self.model_settings)
+        stream = AnalysisStream(name or f"stream{len(self.streams)}", source, engine, realtime)
+        self.streams.append(stream)
+        return stream
+
+    def start(self):
+        if not self.streams:
+            raise ValueError("No streams to analyze")
+        for stream in self.streams:
+            stream.open()
+
+        workers = self.workers or min(len(self.streams), os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="pose")
+        self._pool_size = workers
+        self.running = True
+        self.started_at = time.monotonic()
+        self._threads = [threading.Thread(target=self._capture_loop, args=(stream,), daemon=True)
+                         for stream in self.streams]
+        self._threads.append(threading.Thread(target=self._schedule_loop, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        for stream in self.streams:
+            stream.frames.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for stream in self.streams:
+            stream.engine.close()
+            if stream.cap:
+                stream.cap.release()
+
+    @property
+    def finished(self):
+        """True once every stream has ended and no inference is running"""
+        with self._cond:
+            return self._in_flight == 0 and all(stream.finished and not len(stream.frames)
+                                                for stream in self.streams)
+
+    def _capture_loop(self, stream):
+        clock = PlaybackClock(stream.fps) if stream.realtime else None
+        frame_idx = 0
+        while self.running:
+            ret, frame = stream.cap.read()
+            if not ret:
+                break
+            if clock:
+                clock.wait_until(frame_idx)
+            # Frames carry their capture index: under load the queue drops
+            # some, and rep timing must still count every captured frame
+            stream.frames.put((frame_idx, frame))
+            frame_idx += 1
+            stream.capture_stats.tick()
+            with self._cond:
+                self._cond.notify_all()
+
+        with self._cond:
+            stream.finished = True
+            self._cond.notify_all()
+
+    def _ready_streams(self):
+        # Round-robin from the stream after the last one served
+        count = len(self.streams)
+        order = [self.streams[(self._next_stream + i) % count] for i in range(count)]
+        return [stream for stream in order if not stream.busy and len(stream.frames)]
+
+    def _schedule_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: not self.running or
+                                    (self._in_flight < self._pool_size and self._ready_streams()))
+                if not self.running:
+                    return
+                batch = self._ready_streams()[:self._pool_size - self._in_flight]
+                for stream in batch:
+                    stream.busy = True
+                    self._in_flight += 1
+                self._next_stream = (self.streams.index(batch[-1]) + 1) % len(self.streams)
+
+            for stream in batch:
+                captured = stream.frames.get_nowait()
+                self._executor.submit(self._run_inference, stream, captured)
+
+    def _run_inference(self, stream, captured):
+        try:
+            if captured is not None:
+                stream.analyze(*captured)
+        except Exception as e:
+            stream.error = str(e)
+        finally:
+            with self._cond:
+                stream.busy = False
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def stats(self):
+        """Per-stream counters plus aggregate throughput"""
+        streams = {stream.name: stream.stats() for stream in self.streams}
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        inferred = sum(s['inferred'] for s in streams.values())
+        return {
+            'streams': streams,
+            'total': {
+                'streams': len(streams),
+                'workers': self._pool_size,
+                'capture_fps': sum(s['capture_fps'] for s in streams.values()),
+                'inference_fps': sum(s['inference_fps'] for s in streams.values()),
+                'average_inference_fps': inferred / elapsed if elapsed > 0 else 0.0,
+                'inferred': inferred,
+                'dropped': sum(s['dropped'] for s in streams.values()),
+                'reps': sum(s['reps'] for s in streams.values()),
+            },
+        }
+
+
+def format_stats(stats):
+    total = stats['total']
+    lines = [f"{total['streams']} streams on {total['workers']} workers: "
+             f"inference {total['inference_fps']:.1f} FPS (avg {total['average_inference_fps']:.1f}), "
+             f"capture {total['capture_fps']:.1f} FPS, dropped {total['dropped']}, reps {total['reps']}"]
+    for name, s in stats['streams'].items():
+        state = " [ended]" if s['finished'] else ""
+        if s['error']:
+            state += f" [error: {s['error']}]"
+        lines.append(f"  {name} ({s['source']}, {s['exercise']}): inference {s['inference_fps']:.1f}/"
+                     f"{s['capture_fps']:.1f} FPS, {s['inference_ms']:.0f} ms/frame, "
+                     f"dropped {s['dropped']}, pose in {s['detected']}/{s['inferred']}, reps {s['reps']}{state}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live pose analysis of several camera streams")
+    parser.add_argument("sources", nargs="+",
+                        help="device indices, video files or stream URLs; append =EXERCISE to set "
+                             "the exercise of one stream (e.g. 0=squat)")
+    parser.add_argument("--exercise", choices=EXERCISE_MODES, default="bicep_curl",
+                        help="exercise for streams without their own")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="inference threads shared by all streams (0 = one per CPU core)")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.7)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.7)
+    parser.add_argument("--model-complexity", type=int, choices=[0, 1, 2], default=1)
+    parser.add_argument("--roi-size", type=int,
+                        help="run inference on a crop around the tracked person, downscaled to this many pixels")
+    parser.add_argument("--smoothing", choices=SMOOTHING_METHODS, default="none",
+                        help="temporal landmark filter applied before scoring")
+    parser.add_argument("--angles", choices=ANGLE_SPACES, default="2d",
+                        help="measure joint angles on the image (2d) or on metric world landmarks (3d)")
+    parser.add_argument("--no-realtime", action="store_true",
+                        help="read video files as fast as possible instead of at their frame rate")
+    parser.add_argument("--summary", action="store_true", help="print each stream's summary at the end")
+    args = parser.parse_args(argv)
+
+    manager = StreamManager(args.workers or None,
+                            min_detection_confidence=args.min_detection_confidence,
+                            min_tracking_confidence=args.min_tracking_confidence,
+                            model_complexity=args.model_complexity, roi_size=args.roi_size,
+                            smoothing=args.smoothing, angle_space=args.angles)
+    for source in args.sources:
+        source, exercise = split_source(source)
+        manager.add_stream(source, exercise or args.exercise,
+                           realtime=False if args.no_realtime else None)
+
+    try:
+        manager.start()
+    except IOError as e:
+        print(e)
+        manager.stop()
+        return 1
+
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while not manager.finished and (deadline is None or time.monotonic() < deadline):
+            time.sleep(1.0)
+            print(format_stats(manager.stats()) + "\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.stop()
+
+    print(format_stats(manager.stats()))
+    if args.summary:
+        for stream in manager.streams:
+            print(f"\n{stream.name} ({stream.source})\n{stream.summary.render()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,39 @@
+"""Synthetic landmark traces with known ground truth.
+
+Used by bench_filters.py and the landmark filter tests: every landmark
+either moves on a circle (about a curl's speed) or stands still, and
+Gaussian jitter is added to the detected x, y, z.
+"""
+import numpy as np
+
+from landmark_cache import LANDMARK_FIELDS, NUM_LANDMARKS
+from landmark_filters import filtered_fields
+
+
+def synthetic_trace(frames=600, fps=30.0, moving=True, jitter=0.005, radius=0.1, frequency=0.5, seed=0):
+    """(truth, noisy) (N, 33, 7) landmark traces.
+
+    Moving landmarks go round a circle of the given radius (normalized frame
+    units) at frequency Hz, each with its own phase; still ones stay put.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames)[:, np.newaxis] / fps
+    centers = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 3))
+    phases = rng.uniform(0, 2 * np.pi, NUM_LANDMARKS)
+    truth = np.empty((frames, NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+    truth[:] = np.concatenate([centers, np.ones((NUM_LANDMARKS, 1)), centers], axis=1)
+    if moving:
+        angle = 2 * np.pi * frequency * t + phases
+        for offset in (0, 4):
+            truth[:, :, offset] += radius * np.cos(angle)
+            truth[:, :, offset + 1] += radius * np.sin(angle)
+
+    noisy = truth.copy()
+    fields = filtered_fields(truth)
+    noisy[:, :, fields] += rng.normal(0, jitter, noisy[:, :, fields].shape)
+    return truth, noisy
+
+
+def rms_error(landmarks, truth):
+    """RMS error of the image x, y coordinates"""
+    return float(np.sqrt(np.mean((landmarks[:, :, :2] - truth[:, :, :2]) ** 2)))
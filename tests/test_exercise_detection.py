@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from exercise_detection import (ExerciseSegment, detect_exercise, dominant_exercise, window_bounds,
+                                window_scores)
+from landmark_cache import VISIBILITY_FIELD, LandmarkTrace, empty_landmarks
+from pose_engine import VideoAnalysisEngine
+from pose_math import (LEFT_ANKLE, LEFT_ELBOW, LEFT_HIP, LEFT_KNEE, LEFT_SHOULDER, LEFT_WRIST, RIGHT_ANKLE,
+                       RIGHT_ELBOW, RIGHT_HIP, RIGHT_KNEE, RIGHT_SHOULDER, RIGHT_WRIST)
+
+FPS = 30.0
+# Square frames keep normalized and pixel angles equal
+FRAME_SHAPE = (100, 100)
+SIDES = ((LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, -0.05),
+         (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST, RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE, 0.05))
+
+
+def bend(a, b, angle, length):
+    """Point at length from b whose angle a-b-point is angle degrees"""
+    direction = (a - b) / np.linalg.norm(a - b)
+    radians = np.radians(angle)
+    rotation = np.array([[np.cos(radians), -np.sin(radians)], [np.sin(radians), np.cos(radians)]])
+    return b + length * rotation @ direction
+
+
+def pose(elbow=170.0, hip=175.0, knee=175.0, horizontal=False):
+    """(33, 7) landmarks with the given joint angles on both sides"""
+    landmarks = empty_landmarks()
+    landmarks[:, :3] = 0.5
+    landmarks[:, VISIBILITY_FIELD] = 1.0
+    for shoulder, elbow_i, wrist, hip_i, knee_i, ankle, offset in SIDES:
+        top = np.array([0.5 + offset, 0.3])
+        torso = np.array([0.3, 0.0]) if horizontal else np.array([0.0, 0.3])
+        s, h = top, top + torso
+        e = bend(h, s, 20.0, 0.15)
+        points = {shoulder: s, hip_i: h, elbow_i: e, wrist: bend(s, e, elbow, 0.15)}
+        k = bend(s, h, hip, 0.2)
+        points.update({knee_i: k, ankle: bend(h, k, knee, 0.2)})
+        for index, point in points.items():
+            landmarks[index, :2] = point
+    return landmarks
+
+
+def reps(count, period=60, horizontal=False, **angles):
+    """count reps; each keyword is (top, bottom) of a joint angle, the rest held"""
+    phase = (1 - np.cos(2 * np.pi * np.arange(count * period) / period)) / 2
+    frames = [pose(horizontal=horizontal, **{joint: top + (bottom - top) * p for joint, (top, bottom) in angles.items()})
+              for p in phase]
+    return np.stack(frames)
+
+
+def curls(count):
+    return reps(count, elbow=(170, 40))
+
+
+def squats(count):
+    return reps(count, hip=(175, 80), knee=(175, 80))
+
+
+def pushups(count):
+    return reps(count, horizontal=True, elbow=(170, 60))
+
+
+def test_windows():
+    assert window_bounds(300, 90) == [0, 90, 180, 300]
+    assert window_bounds(320, 90) == [0, 90, 180, 270, 320]
+    assert window_bounds(50, 90) == [0, 50]
+
+
+def test_window_scores_tell_exercises_apart():
+    landmarks = np.concatenate([curls(3), squats(3), pushups(3)])
+    names, scores = window_scores(landmarks, FRAME_SHAPE, [0, 180, 360, 540])
+    assert [names[i] for i in scores.argmax(axis=1)] == ['bicep_curl', 'squat', 'pushup']
+    assert (scores.max(axis=1) > 0.5).all()
+
+
+def test_window_without_pose_scores_zero():
+    landmarks = curls(2)
+    landmarks[:100] = empty_landmarks()
+    _, scores = window_scores(landmarks, FRAME_SHAPE, [0, 120])
+    assert not scores.any()
+
+
+def test_detect_exercise_segments():
+    landmarks = np.concatenate([curls(3), squats(6), np.stack([pose()] * 90)])
+    segments = detect_exercise(landmarks, FRAME_SHAPE, FPS)
+    assert [(s.exercise, s.start_frame, s.end_frame) for s in segments] == [
+        ('bicep_curl', 0, 180), ('squat', 180, 540), ('general_pose', 540, 630)]
+    assert dominant_exercise(segments) == 'squat'
+    assert detect_exercise(landmarks[:0], FRAME_SHAPE, FPS) == []
+
+
+def test_dominant_exercise():
+    segments = [ExerciseSegment('squat', 0, 100, 0.9), ExerciseSegment('general_pose', 100, 400, 0.0),
+                ExerciseSegment('bicep_curl', 400, 450, 0.8), ExerciseSegment('bicep_curl', 500, 580, 0.7)]
+    assert dominant_exercise(segments) == 'bicep_curl'
+    assert dominant_exercise(segments[1:2]) == 'general_pose'
+    assert dominant_exercise([]) == 'general_pose'
+
+
+def test_auto_mode_scores_each_segment_as_its_exercise():
+    landmarks = np.concatenate([curls(3), squats(3)])
+    store = VideoAnalysisEngine('auto').score_trace(LandmarkTrace(landmarks, FPS, 100, 100))
+
+    assert [s.exercise for s in store.exercise_segments] == ['bicep_curl', 'squat']
+    assert [s.reps.count for s in store.segment_summaries] == [3, 3]
+    curl_reps, squat_reps = [s.reps.records for s in store.segment_summaries]
+    assert all(180 <= rep.start_frame < rep.end_frame < 360 for rep in squat_reps)
+
+    assert store[30]['exercise'] == 'bicep_curl'
+    assert store[210]['exercise'] == 'squat'
+    # Squat frames get the squat's verdict and keep every exercise's angles
+    assert store[210]['form_status'] == ('Good Form' if store[210]['knee_angle'] >= 70 else 'Check Form')
+    assert {'elbow_angle', 'knee_angle', 'hip_angle', 'body_angle'} <= set(store[210])
+    assert set(store[210]['form_by_exercise']) == {'bicep_curl', 'pushup', 'squat'}
+    # The summary counts the dominant exercise's reps in its own segments only
+    assert store.summary.reps.count == 3
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from exercise_rules import RuleEvaluator, asymmetry_key
+from landmark_cache import VISIBILITY_FIELD, empty_landmarks
+from pose_math import JOINT_TRIPLETS
+
+FRAME_SHAPE = (100, 100)
+
+
+def pose_with_angles(**angles):
+    """(33, 7) landmarks with the given joint angles (e.g. left_elbow=90) in degrees"""
+    landmarks = empty_landmarks()
+    landmarks[:, :VISIBILITY_FIELD] = 0.5
+    landmarks[:, VISIBILITY_FIELD] = 1.0
+    for joint, angle in angles.items():
+        a, b, c = JOINT_TRIPLETS[joint]
+        radians = np.radians(angle)
+        landmarks[b, :2] = (0.5, 0.5)
+        landmarks[a, :2] = (0.5, 0.3)
+        landmarks[c, :2] = (0.5 + 0.2 * np.sin(radians), 0.5 - 0.2 * np.cos(radians))
+    return landmarks
+
+
+def test_angles_and_form():
+    landmarks = np.stack([pose_with_angles(left_elbow=90, right_elbow=90),
+                          pose_with_angles(left_elbow=175, right_elbow=175)])
+    scores = RuleEvaluator(['bicep_curl']).evaluate(landmarks, FRAME_SHAPE)['bicep_curl']
+    np.testing.assert_allclose(scores['angles']['elbow_angle'], [90, 175], atol=1e-3)
+    # The curl's good-form range is 30-170 degrees
+    assert scores['good_form'].tolist() == [True, False]
+
+
+def test_exercises_are_scored_independently():
+    landmarks = pose_with_angles(left_elbow=60, right_elbow=60, left_hip=120, right_hip=120)[np.newaxis]
+    scores = RuleEvaluator().evaluate(landmarks, FRAME_SHAPE)
+    assert scores['bicep_curl']['good_form'].tolist() == [True]
+    # Elbow below 70 and a bent body both fail the push-up
+    assert scores['pushup']['good_form'].tolist() == [False]
+    np.testing.assert_allclose(scores['pushup']['angles']['body_angle'], [120], atol=1e-3)
+
+
+def test_side_selection_and_asymmetry():
+    landmarks = pose_with_angles(left_elbow=80, right_elbow=140)
+    right_elbow = JOINT_TRIPLETS['right_elbow']
+    landmarks[list(right_elbow), VISIBILITY_FIELD] = 0.9
+    landmarks[list(JOINT_TRIPLETS['left_elbow']), VISIBILITY_FIELD] = 0.6
+    landmarks = landmarks[np.newaxis]
+
+    def elbow(side):
+        scores = RuleEvaluator(['bicep_curl'], side=side).evaluate(landmarks, FRAME_SHAPE)['bicep_curl']
+        return scores['angles']['elbow_angle'][0], scores['asymmetry'][asymmetry_key('elbow')][0]
+
+    assert elbow('visible') == pytest.approx((140, 60), abs=1e-3)
+    assert elbow('left')[0] == pytest.approx(80, abs=1e-3)
+    assert elbow('weighted')[0] == pytest.approx((80 * 0.6 + 140 * 0.9) / 1.5, abs=1e-3)
+
+    # Asymmetry needs both sides visible
+    landmarks[0, list(JOINT_TRIPLETS['left_elbow']), VISIBILITY_FIELD] = 0.1
+    assert np.isnan(elbow('visible')[1])
+
+
+def test_frames_without_pose_give_nan():
+    landmarks = np.stack([empty_landmarks(), pose_with_angles(left_elbow=90, right_elbow=90)])
+    scores = RuleEvaluator(['bicep_curl']).evaluate(landmarks, FRAME_SHAPE)['bicep_curl']
+    assert np.isnan(scores['angles']['elbow_angle'][0])
+    assert scores['good_form'].tolist() == [False, True]
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        RuleEvaluator(side='both')
+    with pytest.raises(ValueError):
+        RuleEvaluator(space='4d')
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from exercise_rules import AUTO_DETECT
+from frame_sampling import FrameSampler, interpolate_landmarks
+from landmark_cache import VISIBILITY_FIELD, empty_landmarks
+from pose_math import JOINT_TRIPLETS
+
+FRAME_SHAPE = (100, 100)
+
+
+def pose_with_elbows(angle):
+    """(33, 7) landmarks with both elbows bent to angle degrees"""
+    landmarks = empty_landmarks()
+    landmarks[:, :VISIBILITY_FIELD] = 0.5
+    landmarks[:, VISIBILITY_FIELD] = 1.0
+    for joint in ('left_elbow', 'right_elbow'):
+        a, b, c = JOINT_TRIPLETS[joint]
+        radians = np.radians(angle)
+        landmarks[b, :2] = (0.5, 0.5)
+        landmarks[a, :2] = (0.5, 0.3)
+        landmarks[c, :2] = (0.5 + 0.2 * np.sin(radians), 0.5 - 0.2 * np.cos(radians))
+    return landmarks
+
+
+def test_stride_picks_keyframes():
+    sampler = FrameSampler(stride=3)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    assert [sampler.should_infer(frame, gap) for gap in range(5)] == [False, False, False, True, True]
+
+
+def test_motion_triggers_a_keyframe():
+    sampler = FrameSampler(stride=10, motion_threshold=0.1)
+    still = np.zeros((48, 64, 3), dtype=np.uint8)
+    sampler.mark_keyframe(still)
+    assert not sampler.should_infer(still, 1)
+    assert sampler.should_infer(np.full_like(still, 255), 1)
+    assert sampler.stats() == {'inferred': 1, 'interpolated': 0, 'densified': 0}
+
+
+@pytest.mark.parametrize("exercise_mode", ['bicep_curl', AUTO_DETECT])
+def test_turning_point_is_densified(exercise_mode):
+    sampler = FrameSampler(exercise_mode=exercise_mode)
+    # The curl counts a rep below 50 and above 160 degrees
+    assert sampler.needs_densify(pose_with_elbows(175), pose_with_elbows(30), FRAME_SHAPE)
+    assert not sampler.needs_densify(pose_with_elbows(175), pose_with_elbows(170), FRAME_SHAPE)
+
+
+def test_pose_appearing_or_missing():
+    sampler = FrameSampler(exercise_mode='bicep_curl')
+    landmarks = pose_with_elbows(90)
+    assert sampler.needs_densify(None, landmarks, FRAME_SHAPE)
+    assert sampler.needs_densify(landmarks, None, FRAME_SHAPE)
+    # No pose at either end: the whole gap is taken as pose-less
+    assert not sampler.needs_densify(None, None, FRAME_SHAPE)
+
+
+def test_interpolation_is_strictly_between_keyframes():
+    start = np.zeros((33, 7), dtype=np.float32)
+    end = np.full((33, 7), 4.0, dtype=np.float32)
+    frames = interpolate_landmarks(start, end, 3)
+    assert frames.shape == (3, 33, 7)
+    np.testing.assert_allclose(frames[:, 0, 0], [1.0, 2.0, 3.0])
+
+
+def test_invalid_stride():
+    with pytest.raises(ValueError):
+        FrameSampler(stride=0)
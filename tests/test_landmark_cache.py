@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+from landmark_cache import TraceWriter, empty_landmarks, read_trace, trace_header, write_trace
+
+
+def random_landmarks(frames, seed=0):
+    landmarks = np.random.default_rng(seed).random((frames, 33, 7), dtype=np.float32)
+    landmarks[frames // 2] = empty_landmarks()
+    return landmarks
+
+
+def test_trace_round_trip(tmp_path):
+    path = str(tmp_path / "clip.smtrace")
+    landmarks = random_landmarks(25)
+    write_trace(path, trace_header(29.97, 640, 480, 'squat'), landmarks)
+
+    trace, header = read_trace(path)
+    np.testing.assert_array_equal(trace.landmarks, landmarks)
+    assert (trace.fps, trace.frame_shape, len(trace)) == (29.97, (480, 640), 25)
+    assert header['exercise'] == 'squat'
+    assert trace.has_world
+    assert trace.detected.tolist() == [i != 12 for i in range(25)]
+
+
+def test_streamed_frames_match_block_write(tmp_path):
+    landmarks = random_landmarks(10)
+    path = str(tmp_path / "streamed.smtrace")
+    with TraceWriter(path, trace_header(30, 64, 48)) as writer:
+        for frame in landmarks:
+            writer.write(frame)
+    assert writer.frames == 10
+    np.testing.assert_array_equal(read_trace(path)[0].landmarks, landmarks)
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    path = str(tmp_path / "failed.smtrace")
+    with pytest.raises(RuntimeError):
+        with TraceWriter(path, trace_header(30, 64, 48)) as writer:
+            writer.write(random_landmarks(3))
+            raise RuntimeError("inference failed")
+    assert os.listdir(tmp_path) == []
+
+
+def test_empty_trace(tmp_path):
+    path = str(tmp_path / "empty.smtrace")
+    write_trace(path, trace_header(30, 64, 48), np.empty((0, 33, 7), dtype=np.float32))
+    assert len(read_trace(path)[0]) == 0
+
+
+def test_not_a_trace(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"\x00\x00\x00\x18ftypmp42")
+    with pytest.raises(ValueError):
+        read_trace(str(path))
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from landmark_cache import VISIBILITY_FIELD, empty_landmarks
+from landmark_filters import make_filter, smooth_trace
+from synthetic_traces import rms_error, synthetic_trace
+
+METHODS = ('one_euro', 'kalman')
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_still_landmarks_are_smoothed(method):
+    truth, noisy = synthetic_trace(300, moving=False, jitter=0.005)
+    smoothed = smooth_trace(noisy, make_filter(method))
+    assert rms_error(smoothed, truth) < 0.7 * rms_error(noisy, truth)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_moving_landmarks_are_followed(method):
+    truth, noisy = synthetic_trace(300, moving=True, jitter=0.0)
+    smoothed = smooth_trace(noisy, make_filter(method))
+    # Lag behind a 0.1-radius circle at 0.5 Hz stays within a few pixels
+    assert rms_error(smoothed, truth) < 0.01
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_jittery_moving_landmarks_beat_raw(method):
+    truth, noisy = synthetic_trace(600, moving=True, jitter=0.005)
+    smoothed = smooth_trace(noisy, make_filter(method))
+    assert rms_error(smoothed, truth) < rms_error(noisy, truth)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_visibility_passes_through(method):
+    _, noisy = synthetic_trace(50, moving=True)
+    noisy[:, :, VISIBILITY_FIELD] = np.linspace(0, 1, 50)[:, np.newaxis]
+    smoothed = smooth_trace(noisy, make_filter(method))
+    np.testing.assert_array_equal(smoothed[:, :, VISIBILITY_FIELD], noisy[:, :, VISIBILITY_FIELD])
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_missing_pose_resets_the_filter(method):
+    _, noisy = synthetic_trace(40, moving=True)
+    noisy[20] = empty_landmarks()
+    smoothed = smooth_trace(noisy, make_filter(method))
+    assert np.isnan(smoothed[20]).all()
+    # The first frame after a gap starts a new track at the measurement
+    np.testing.assert_array_equal(smoothed[21], noisy[21])
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_blockwise_smoothing_matches_whole_trace(method):
+    _, noisy = synthetic_trace(90, moving=True)
+    whole = smooth_trace(noisy, make_filter(method))
+    landmark_filter = make_filter(method)
+    blocks = [smooth_trace(noisy[start:start + 30], landmark_filter, reset=(start == 0))
+              for start in range(0, 90, 30)]
+    np.testing.assert_allclose(np.concatenate(blocks), whole)
+
+
+def test_unknown_method():
+    assert make_filter('none') is None
+    with pytest.raises(ValueError):
+        make_filter('median')
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from landmark_cache import VISIBILITY_FIELD, empty_landmarks
+from multi_person import PersonTracker, box_iou, landmark_boxes
+
+
+def person(x, y, size=0.2):
+    """(33, 7) landmarks spread over a size x size box at x, y"""
+    landmarks = empty_landmarks()
+    grid = np.linspace(0, size, 33)
+    landmarks[:, 0] = x + grid
+    landmarks[:, 1] = y + grid[::-1]
+    landmarks[:, VISIBILITY_FIELD] = 1.0
+    return landmarks
+
+
+def test_box_iou():
+    a = np.array([[0, 0, 2, 2], [0, 0, 1, 1]], dtype=float)
+    b = np.array([[1, 1, 3, 3], [0, 0, 2, 2], [5, 5, 5, 5]], dtype=float)
+    np.testing.assert_allclose(box_iou(a, b), [[1 / 7, 1, 0], [0, 0.25, 0]])
+
+
+def test_landmark_boxes_use_visible_points():
+    landmarks = person(0.1, 0.1)[np.newaxis].copy()
+    landmarks[0, 0, :2] = (0.9, 0.9)
+    landmarks[0, 0, VISIBILITY_FIELD] = 0.1
+    visible = landmarks[0, 1:, :2]
+    np.testing.assert_allclose(landmark_boxes(landmarks)[0], [*visible.min(axis=0), *visible.max(axis=0)])
+
+
+def test_ids_follow_people_across_frames():
+    tracker = PersonTracker('bicep_curl')
+    first = tracker.update(np.stack([person(0.1, 0.1), person(0.6, 0.5)]), 0)
+    # Listed in the other order and moved a little
+    second = tracker.update(np.stack([person(0.62, 0.5), person(0.12, 0.1)]), 1)
+    assert [track.id for track in first] == [1, 2]
+    assert [track.id for track in second] == [2, 1]
+
+    # A newcomer far from both gets a new ID
+    third = tracker.update(np.stack([person(0.12, 0.1), person(0.62, 0.5), person(0.7, 0.0)]), 2)
+    assert [track.id for track in third] == [1, 2, 3]
+
+
+def test_lost_people_are_dropped_after_max_missing():
+    tracker = PersonTracker('bicep_curl', max_missing=2)
+    tracker.update(np.stack([person(0.1, 0.1), person(0.6, 0.5)]), 0)
+    for frame_idx in range(1, 4):
+        tracker.update(person(0.1, 0.1)[np.newaxis], frame_idx)
+    assert [track.id for track in tracker.tracks] == [1]
+    assert [track.id for track in tracker.people()] == [1, 2]
+    assert tracker.update(np.empty((0, 33, 7), dtype=np.float32), 4) == []
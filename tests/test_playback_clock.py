@@ -0,0 +1,63 @@
+import pytest
+
+import playback_clock
+from playback_clock import PlaybackClock
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_presentation_times_follow_fps():
+    clock = PlaybackClock(25, start_frame=50, clock=FakeClock())
+    assert clock.presentation_time(50) == 100.0
+    assert clock.presentation_time(75) == pytest.approx(101.0)
+
+
+def test_falling_behind_skips_to_the_due_frame():
+    now = FakeClock()
+    clock = PlaybackClock(30, start_frame=10, clock=now)
+    assert (clock.due_frame(), clock.frames_behind(10)) == (10, 0)
+
+    # Processing took 0.2 s: six frames' worth
+    now.now += 0.2
+    assert clock.due_frame() == 16
+    assert clock.frames_behind(11) == 5
+    assert clock.frames_behind(20) == 0
+
+
+def test_wait_until(monkeypatch):
+    now = FakeClock()
+    sleeps = []
+    monkeypatch.setattr(playback_clock.time, 'sleep', sleeps.append)
+    clock = PlaybackClock(10, clock=now)
+
+    # Early: sleeps the rest of the way
+    now.now += 0.05
+    assert clock.wait_until(1) == 0.0
+    assert sleeps == [pytest.approx(0.05)]
+    # Late: returns the lateness without sleeping
+    now.now += 0.25
+    assert clock.wait_until(2) == pytest.approx(0.1)
+    assert len(sleeps) == 1
+
+
+def test_stats_count_presented_and_dropped_frames():
+    now = FakeClock()
+    clock = PlaybackClock(30, clock=now)
+    for _ in range(3):
+        clock.present()
+    clock.drop(2)
+    now.now += 1.0
+    stats = clock.stats()
+    assert (stats['presented'], stats['dropped'], stats['target_fps']) == (3, 2, 30.0)
+    assert stats['average_fps'] == pytest.approx(3.0)
+
+
+def test_invalid_fps():
+    with pytest.raises(ValueError):
+        PlaybackClock(0)
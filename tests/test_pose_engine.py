@@ -0,0 +1,21 @@
+import pytest
+
+from pose_engine import split_frame_range
+
+
+@pytest.mark.parametrize('total_frames, workers', [(1000, 3), (9000, 4), (480, 8), (121, 2)])
+def test_chunks_cover_the_clip(total_frames, workers):
+    chunks = split_frame_range(total_frames, workers)
+    starts = [start for start, _ in chunks]
+    ends = [end for _, end in chunks]
+    assert starts[0] == 0
+    # Contiguous, and the last chunk reads to EOF
+    assert ends[:-1] == starts[1:]
+    assert ends[-1] is None
+    assert len(chunks) <= workers * 4
+    assert all(end - start >= 120 for start, end in chunks[:-1])
+
+
+def test_short_clip_is_one_chunk():
+    assert split_frame_range(100, 8) == [(0, None)]
+    assert split_frame_range(0, 8) == [(0, None)]
@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+
+from rep_detector import RepDetector
+
+
+def curl(top=178.0, bottom=40.0, hold=10, ramp=30):
+    """One rep: hold at top, down to bottom, back up, hold"""
+    down = np.linspace(top, bottom, ramp)
+    up = np.linspace(bottom, top, ramp)
+    return np.concatenate([np.full(hold, top), down, up[1:], np.full(hold, top)])
+
+
+def test_single_rep_record():
+    angles = curl()
+    detector = RepDetector('bicep_curl', fps=30, alpha=1.0)
+    records = detector.update_many(angles)
+
+    assert detector.count == 1
+    (record,) = records
+    assert record.max_angle == 178.0
+    assert record.min_angle == 40.0
+    assert record.bottom_frame == int(np.argmin(angles))
+    # Starts on the last frame above high (160), ends on the first one after the bottom
+    assert record.start_frame == np.flatnonzero(angles[:record.bottom_frame] > 160)[-1]
+    assert record.end_frame == record.bottom_frame + np.flatnonzero(angles[record.bottom_frame:] > 160)[0]
+    assert math.isclose(record.duration, (record.end_frame - record.start_frame) / 30)
+    assert math.isclose(record.eccentric + record.concentric, record.duration)
+
+
+def test_peak_of_each_rep():
+    angles = np.concatenate([curl(top=175.0), curl(top=168.0)])
+    detector = RepDetector('bicep_curl', fps=30, alpha=1.0)
+    records = detector.update_many(angles)
+    assert [r.max_angle for r in records] == [175.0, 175.0]
+
+    # The second rep's top is the extended phase before its descent
+    angles = np.concatenate([curl(top=168.0, hold=5), np.full(5, 177.0), curl(top=168.0)])
+    detector = RepDetector('bicep_curl', fps=30, alpha=1.0)
+    records = detector.update_many(angles)
+    assert [r.max_angle for r in records] == [168.0, 177.0]
+
+
+def test_noise_around_one_threshold_does_not_count():
+    rng = np.random.default_rng(0)
+    detector = RepDetector('squat', alpha=1.0)
+    detector.update_many(90 + rng.normal(0, 5, 500))
+    assert detector.count == 0
+
+
+def test_missing_frames_keep_frame_indices():
+    angles = curl()
+    with_gaps = angles.copy()
+    with_gaps[45:50] = np.nan
+    a = RepDetector('bicep_curl', alpha=1.0)
+    b = RepDetector('bicep_curl', alpha=1.0)
+    (ra,) = a.update_many(angles)
+    (rb,) = b.update_many(with_gaps)
+    assert (ra.start_frame, ra.end_frame) == (rb.start_frame, rb.end_frame)
+
+
+def test_general_pose_never_counts():
+    detector = RepDetector('general_pose')
+    detector.update_many(curl())
+    assert detector.count == 0
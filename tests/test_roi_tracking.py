@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from landmark_cache import VISIBILITY_FIELD, empty_landmarks
+from roi_tracking import RoiTracker, RoiTransform
+
+FRAME_SHAPE = (480, 640)
+
+
+def person(center_x, center_y, size):
+    """(33, 7) landmarks filling a size x size pixel square around center_x, center_y"""
+    landmarks = empty_landmarks()
+    grid = np.linspace(-size / 2, size / 2, 33)
+    landmarks[:, 0] = (center_x + grid) / FRAME_SHAPE[1]
+    landmarks[:, 1] = (center_y + grid[::-1]) / FRAME_SHAPE[0]
+    landmarks[:, 2] = 0.1
+    landmarks[:, VISIBILITY_FIELD] = 1.0
+    return landmarks
+
+
+def test_map_array_to_full_frame():
+    transform = RoiTransform(100, 50, 200, 200, 640, 480)
+    landmarks = np.zeros((33, 7), dtype=np.float32)
+    landmarks[0, :4] = (0.5, 0.25, 0.1, 0.8)
+    mapped = transform.map_array(landmarks)
+    np.testing.assert_allclose(mapped[0, :4], [200 / 640, 100 / 480, 0.1 * 200 / 640, 0.8])
+    # The input is left as is
+    assert landmarks[0, 0] == pytest.approx(0.5)
+
+
+def test_crop_maps_back_to_the_frame():
+    tracker = RoiTracker(target_size=100)
+    tracker.update(person(320, 240, 100), FRAME_SHAPE)
+    frame = np.zeros(FRAME_SHAPE + (3,), dtype=np.uint8)
+    crop, transform = tracker.crop(frame)
+    x0, y0, x1, y1 = tracker.box
+    # Padded by the margin on every side, then downscaled to target_size
+    assert (x1 - x0, y1 - y0) == (160, 160)
+    assert max(crop.shape[:2]) == 100
+    crop_landmarks = np.zeros((33, 7), dtype=np.float32)
+    crop_landmarks[0, :2] = (0.5, 0.5)
+    np.testing.assert_allclose(transform.map_array(crop_landmarks)[0, :2], [320 / 640, 240 / 480])
+
+
+def test_box_is_kept_for_small_movements():
+    tracker = RoiTracker(target_size=100)
+    tracker.update(person(320, 240, 100), FRAME_SHAPE)
+    box = tracker.box
+    tracker.update(person(325, 236, 104), FRAME_SHAPE)
+    assert tracker.box == box
+
+
+def test_box_follows_the_person_to_its_edge():
+    tracker = RoiTracker(target_size=100)
+    tracker.update(person(320, 240, 100), FRAME_SHAPE)
+    box = tracker.box
+    tracker.update(person(350, 240, 100), FRAME_SHAPE)
+    assert tracker.box != box
+    x0, _, x1, _ = tracker.box
+    assert (x0 + x1) / 2 == pytest.approx(350, abs=1)
+
+
+def test_box_is_resized_when_the_person_grows_or_shrinks():
+    tracker = RoiTracker(target_size=100)
+    tracker.update(person(320, 240, 200), FRAME_SHAPE)
+    tracker.update(person(320, 240, 120), FRAME_SHAPE)
+    x0, _, x1, _ = tracker.box
+    assert x1 - x0 == 192
+
+
+def test_box_on_the_frame_border_is_kept():
+    tracker = RoiTracker(target_size=100)
+    tracker.update(person(60, 240, 100), FRAME_SHAPE)
+    box = tracker.box
+    assert box[0] == 0
+    tracker.update(person(55, 240, 100), FRAME_SHAPE)
+    assert tracker.box == box
+
+
+def test_lost_person_drops_the_box():
+    tracker = RoiTracker(target_size=100)
+    tracker.update(person(320, 240, 100), FRAME_SHAPE)
+    tracker.update(None, FRAME_SHAPE)
+    assert tracker.box is None
+    hidden = person(320, 240, 100)
+    hidden[:, VISIBILITY_FIELD] = 0.1
+    tracker.update(person(320, 240, 100), FRAME_SHAPE)
+    tracker.update(hidden, FRAME_SHAPE)
+    assert tracker.box is None
@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stream_manager import StreamManager, split_source
+
+
+@pytest.mark.parametrize('argument, expected', [
+    ("0", ("0", None)),
+    ("0=squat", ("0", "squat")),
+    ("clip.mp4=general_pose", ("clip.mp4", "general_pose")),
+    ("rtsp://cam/stream?channel=1", ("rtsp://cam/stream?channel=1", None)),
+    ("rtsp://cam/stream?channel=1&subtype=0=pushup", ("rtsp://cam/stream?channel=1&subtype=0", "pushup")),
+    ("http://cam/video?user=admin=bicep_curl", ("http://cam/video?user=admin", "bicep_curl")),
+    ("=squat", ("=squat", None)),
+])
+def test_split_source(argument, expected):
+    assert split_source(argument) == expected
+
+
+def scheduled_manager(stream_count, workers, analyze):
+    """StreamManager running only its scheduler, with analyze(stream, frame_idx, frame) as inference"""
+    manager = StreamManager(workers)
+    for i in range(stream_count):
+        stream = manager.add_stream(str(i))
+        stream.analyze = lambda frame_idx, frame, stream=stream: analyze(stream, frame_idx, frame)
+    manager._executor = ThreadPoolExecutor(workers)
+    manager._pool_size = workers
+    manager.running = True
+    manager._threads = [threading.Thread(target=manager._schedule_loop, daemon=True)]
+    manager._threads[0].start()
+    return manager
+
+
+def capture(manager, frame_idx):
+    with manager._cond:
+        for stream in manager.streams:
+            stream.frames.put((frame_idx, None))
+        manager._cond.notify_all()
+
+
+def wait_idle(manager, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with manager._cond:
+            if manager._in_flight == 0 and not any(len(stream.frames) for stream in manager.streams):
+                return
+        time.sleep(0.001)
+    raise AssertionError("scheduler did not drain the streams")
+
+
+def test_ready_streams_rotate_and_skip_busy_ones():
+    manager = StreamManager(1)
+    streams = [manager.add_stream(str(i)) for i in range(4)]
+    for stream in streams[:3]:
+        stream.frames.put((0, None))
+    streams[1].busy = True
+    manager._next_stream = 2
+    # stream3 has no frame, stream1 is still being analyzed
+    assert manager._ready_streams() == [streams[2], streams[0]]
+
+
+def test_every_stream_is_served_in_turn():
+    lock = threading.Lock()
+    served, active, overlaps = [], set(), []
+
+    def analyze(stream, frame_idx, frame):
+        with lock:
+            if stream.name in active:
+                overlaps.append(stream.name)
+            active.add(stream.name)
+            served.append((stream.name, frame_idx))
+        time.sleep(0.002)
+        with lock:
+            active.discard(stream.name)
+
+    # More streams than workers
+    manager = scheduled_manager(3, 2, analyze)
+    try:
+        for frame_idx in range(4):
+            capture(manager, frame_idx)
+            wait_idle(manager)
+    finally:
+        manager.stop()
+
+    assert not overlaps
+    for stream in manager.streams:
+        assert [i for name, i in served if name == stream.name] == [0, 1, 2, 3]
+
+
+def test_failing_stream_does_not_stop_the_others():
+    served = []
+
+    def analyze(stream, frame_idx, frame):
+        if stream.name == 'stream0':
+            raise RuntimeError("camera unplugged")
+        served.append(stream.name)
+
+    manager = scheduled_manager(2, 1, analyze)
+    try:
+        for frame_idx in range(2):
+            capture(manager, frame_idx)
+            wait_idle(manager)
+    finally:
+        manager.stop()
+
+    assert manager.streams[0].error == "camera unplugged"
+    assert served == ['stream1', 'stream1']
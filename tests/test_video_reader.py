@@ -0,0 +1,40 @@
+import numpy as np
+
+from video_reader import LRUCache
+
+
+def frame(value, size=100):
+    return np.full(size, value, dtype=np.uint8)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put(1, frame(1))
+    cache.put(2, frame(2))
+    cache.get(1)
+    cache.put(3, frame(3))
+    assert 1 in cache and 3 in cache and 2 not in cache
+    assert cache.get(2, 'missing') == 'missing'
+
+
+def test_byte_bound():
+    cache = LRUCache(maxsize=10, max_bytes=250)
+    for key in range(4):
+        cache.put(key, frame(key))
+    assert len(cache) == 2 and cache.nbytes == 200
+    assert 2 in cache and 3 in cache
+
+    # Replacing an entry counts its new size, not both
+    cache.put(3, frame(3, 200))
+    assert len(cache) == 1 and cache.nbytes == 200
+
+
+def test_newest_entry_is_kept_even_if_too_large():
+    cache = LRUCache(maxsize=10, max_bytes=50)
+    cache.put(0, frame(0))
+    cache.put(1, frame(1))
+    assert len(cache) == 1 and 1 in cache
+    assert cache.nbytes == 100
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from landmark_cache import VISIBILITY_FIELD, empty_landmarks
+from pose_engine import VideoAnalysisEngine
+from pose_math import LEFT_ELBOW, LEFT_SHOULDER, LEFT_WRIST
+from video_summary import RunningStats, StreamingSummary
+
+FRAME_SHAPE = (480, 640)
+
+
+def random_landmarks(frames, seed=0):
+    rng = np.random.default_rng(seed)
+    landmarks = rng.random((frames, 33, 7), dtype=np.float32)
+    landmarks[:, :, VISIBILITY_FIELD] = 0.9
+    # Left arm hidden on some frames, no pose on others
+    landmarks[::4][:, [LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST], VISIBILITY_FIELD] = 0.1
+    landmarks[::7] = empty_landmarks()
+    return landmarks
+
+
+def test_running_stats_single_and_block_updates_agree():
+    values = np.random.default_rng(0).normal(90, 20, 100)
+    single, blocks = RunningStats(), RunningStats()
+    for value in values:
+        single.update(value)
+    for start in range(0, 100, 30):
+        blocks.update_many(values[start:start + 30])
+    blocks.update_many([])
+
+    for stats in (single, blocks):
+        assert stats.count == 100
+        assert stats.mean == pytest.approx(values.mean())
+        assert stats.std == pytest.approx(values.std())
+        assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_empty_summary():
+    summary = StreamingSummary('bicep_curl', 30)
+    assert summary.metrics['elbow_angle'].std == 0.0
+    assert summary.render() == ""
+
+
+def test_per_frame_updates_match_columns():
+    engine = VideoAnalysisEngine('bicep_curl')
+    landmarks = random_landmarks(60)
+    detected = ~np.isnan(landmarks[:, 0, 0])
+
+    per_frame = StreamingSummary('bicep_curl', 30)
+    for frame, found in zip(landmarks, detected):
+        per_frame.update(engine.analyze_landmarks(frame, FRAME_SHAPE) if found else {'pose_detected': False})
+    columns = StreamingSummary('bicep_curl', 30)
+    columns.update_columns(detected, engine.score_landmarks(landmarks, FRAME_SHAPE))
+
+    assert (per_frame.frames, per_frame.good_form, per_frame.good_posture) == \
+           (columns.frames, columns.good_form, columns.good_posture)
+    for key, stats in per_frame.metrics.items():
+        expected = columns.metrics[key]
+        assert stats.count == expected.count, key
+        if stats.count:
+            assert not np.isnan(stats.mean)
+            assert stats.mean == pytest.approx(expected.mean)
+            assert stats.std == pytest.approx(expected.std)
+    # One side was hidden on some frames, so fewer asymmetry samples than angles
+    assert 0 < per_frame.metrics['elbow_asymmetry'].count < per_frame.metrics['elbow_angle'].count
+
+
+def test_dropped_frames_keep_rep_timing_and_duration():
+    angles = np.concatenate([np.full(10, 170.0), np.linspace(170, 40, 30), np.linspace(40, 170, 30),
+                             np.full(10, 170.0)])
+    full, sparse = StreamingSummary('bicep_curl', 30), StreamingSummary('bicep_curl', 30)
+    for frame_idx, angle in enumerate(angles):
+        full.update({'elbow_angle': angle}, frame_idx)
+        # Every other frame dropped before inference
+        if frame_idx % 2 == 0:
+            sparse.update({'elbow_angle': angle}, frame_idx)
+
+    (rep,), (sparse_rep,) = full.reps.records, sparse.reps.records
+    assert sparse.frames == len(angles) // 2
+    # Within a few frames (the angle smoothing sees fewer samples); without
+    # capture indices it would be half as long
+    assert sparse_rep.duration == pytest.approx(rep.duration, abs=4 / 30)
+    assert 'Duration: 2.6 seconds' in sparse.render()
@@ -0,0 +1,87 @@
+"""Hand-off of analysis output from worker threads to the Tk UI.
+
+Analysis runs on background threads at inference rate, but Tk widgets may
+only be touched from the main loop. Workers publish into the objects here;
+the UI drains them on its own fixed tick via root.after.
+"""
+import threading
+from collections import deque, namedtuple
+
+
+class FeedbackBuffer:
+    """Ring buffer of the most recent feedback entries.
+
+    push() may be called from any thread at any rate; render_if_changed()
+    is called from the UI tick and returns the text to show, or None when
+    nothing was pushed since the last call.
+    """
+
+    def __init__(self, max_entries=8):
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._version = 0
+        self._rendered_version = 0
+
+    def push(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            self._version += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+    def render_if_changed(self):
+        with self._lock:
+            if self._version == self._rendered_version:
+                return None
+            self._rendered_version = self._version
+            return "".join(self._entries)
+
+
+# Everything the exercise and posture panels show; all text is preformatted
+AnalysisSnapshot = namedtuple('AnalysisSnapshot', [
+    'primary_angle', 'secondary_angle', 'form_status', 'form_color',
+    'exercise_state', 'posture_status', 'posture_color', 'reps',
+])
+
+INITIAL_SNAPSHOT = AnalysisSnapshot(
+    primary_angle="Primary Angle: --°",
+    secondary_angle="Secondary Angle: --°",
+    form_status="Form: Not analyzed",
+    form_color='black',
+    exercise_state="State: Ready",
+    posture_status="Status: Not analyzed",
+    posture_color='black',
+    reps="Reps: 0",
+)
+
+
+# State of a background clip analysis: frames done out of total, the latest
+# live summary text, and the outcome once finished (done, or an error message)
+AnalysisProgress = namedtuple('AnalysisProgress', ['frame', 'total', 'summary', 'done', 'error'])
+
+INITIAL_PROGRESS = AnalysisProgress(frame=0, total=0, summary=None, done=False, error=None)
+
+
+class SnapshotSlot:
+    """Latest-value hand-off of immutable snapshots, without locks.
+
+    update() publishes a new snapshot by swapping the stored reference with
+    a single assignment, which is atomic in CPython, and latest() returns
+    whatever is current, so neither side ever waits on the other. Snapshots
+    must not be mutated once published. update() is a read-modify-write and
+    assumes one publishing thread at a time; a concurrent writer can only
+    lose a field update, never tear a snapshot.
+    """
+
+    def __init__(self, initial):
+        self._snapshot = initial
+
+    def update(self, **changes):
+        """Publish a copy of the current snapshot with some fields replaced"""
+        self._snapshot = self._snapshot._replace(**changes)
+
+    def latest(self):
+        return self._snapshot
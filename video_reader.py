@@ -0,0 +1,97 @@
+"""Random-access video frame reader for the seek slider."""
+from collections import OrderedDict
+
+import cv2
+
+
+class LRUCache:
+    """Small least-recently-used mapping with a fixed number of entries.
+
+    With max_bytes it is also bounded by the total nbytes of its values
+    (numpy arrays); the newest entry is always kept.
+    """
+
+    def __init__(self, maxsize=64, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        if key in self._items:
+            self.nbytes -= getattr(self._items[key], 'nbytes', 0)
+        self._items[key] = value
+        self._items.move_to_end(key)
+        self.nbytes += getattr(value, 'nbytes', 0)
+        while len(self._items) > self.maxsize or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._items) > 1):
+            _, evicted = self._items.popitem(last=False)
+            self.nbytes -= getattr(evicted, 'nbytes', 0)
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SeekableVideoReader:
+    """Keeps one decoder open and serves frames by index.
+
+    Targets a few frames ahead of the decoder position are reached by
+    grabbing forward instead of seeking, which avoids re-decoding from the
+    previous keyframe. Recently decoded frames are kept in an LRU cache of
+    at most cache_size frames and cache_bytes bytes (a 4K frame is ~25 MB).
+    """
+
+    def __init__(self, video_path, cache_size=64, cache_bytes=256 << 20, max_forward_grab=30):
+        self.video_path = video_path
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video: {video_path}")
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.max_forward_grab = max_forward_grab
+        self.frames = LRUCache(cache_size, cache_bytes)
+        self._next_idx = 0
+
+    def read(self, frame_idx):
+        """Decoded BGR frame at frame_idx, or None past the end of the clip.
+
+        Cached frames are shared; copy before drawing on them.
+        """
+        frame = self.frames.get(frame_idx)
+        if frame is not None:
+            return frame
+
+        if self._next_idx is not None and 0 <= frame_idx - self._next_idx <= self.max_forward_grab:
+            for _ in range(frame_idx - self._next_idx):
+                if not self.cap.grab():
+                    self._next_idx = None
+                    return None
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+
+        ret, frame = self.cap.read()
+        if not ret:
+            # Decoder position is unknown after a failed read; force a seek next time
+            self._next_idx = None
+            return None
+
+        self._next_idx = frame_idx + 1
+        self.frames.put(frame_idx, frame)
+        return frame
+
+    def close(self):
+        self.cap.release()
+        self.frames.clear()
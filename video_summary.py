@@ -0,0 +1,195 @@
+"""Incremental video analysis summary.
+
+StreamingSummary is updated as frame results arrive (one at a time or in
+vectorized blocks) and keeps running counts plus Welford mean/variance and
+min/max per metric, plus a RepDetector over the exercise's primary angle,
+so a summary can be rendered at any point during an analysis and the final
+one costs O(1).
+"""
+from datetime import datetime
+
+import numpy as np
+
+from exercise_rules import EXERCISES, asymmetry_key
+from rep_detector import RepDetector
+
+# Angle metrics with running statistics: every angle any exercise checks,
+# then the left/right difference of every joint they are measured at
+SUMMARY_METRICS = tuple(dict.fromkeys(
+    [check.key for rule in EXERCISES.values() for check in rule.checks] +
+    [asymmetry_key(check.joint) for rule in EXERCISES.values() for check in rule.checks]))
+
+
+class RunningStats:
+    """Welford running mean/variance with min and max"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update_many(self, values):
+        """Merge a block of values (Chan et al. parallel update)"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        block_mean = values.mean()
+        block_m2 = ((values - block_mean) ** 2).sum()
+        total = self.count + n
+        delta = block_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += block_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+class StreamingSummary:
+    def __init__(self, exercise, fps):
+        self.exercise = exercise
+        self.fps = fps
+        self.frames = 0
+        self.good_form = 0
+        self.good_posture = 0
+        self.metrics = {key: RunningStats() for key in SUMMARY_METRICS}
+        self.reps = RepDetector(exercise, fps)
+        # First and one-past-last frame index seen; the duration spans them
+        # even when frames in between were dropped
+        self.first_frame = None
+        self.end_frame = 0
+
+    def _span(self, start_frame, count):
+        if self.first_frame is None:
+            self.first_frame = start_frame
+        self.end_frame = max(self.end_frame, start_frame + count)
+
+    def update(self, result, frame_idx=None):
+        """Add one per-frame result dict.
+
+        frame_idx is the frame's index in the clip, used for rep frame
+        numbers when results skip frames; it defaults to the number of
+        results added before.
+        """
+        if frame_idx is None:
+            frame_idx = self.frames
+        self._span(frame_idx, 1)
+        if self.reps.result_key:
+            self.reps.update(result.get(self.reps.result_key), frame_idx)
+        self.frames += 1
+        if result.get('form_status') == 'Good Form':
+            self.good_form += 1
+        if result.get('posture_status') == 'Good Posture':
+            self.good_posture += 1
+        for key, stats in self.metrics.items():
+            # Asymmetry is NaN when a side is hidden, angles when landmarks are missing
+            value = result.get(key)
+            if value is not None and not np.isnan(value):
+                stats.update(float(value))
+
+    def update_columns(self, detected, columns, start_frame=None):
+        """Add a block of frames from vectorized score columns (see VideoAnalysisEngine.score_landmarks).
+
+        start_frame is the block's first frame index in the clip, for rep
+        frame numbers; it defaults to the number of frames added before.
+        """
+        if start_frame is None:
+            start_frame = self.frames
+        self._span(start_frame, len(detected))
+        if self.reps.result_key in columns:
+            self.reps.update_many(np.where(detected, columns[self.reps.result_key], np.nan), start_frame)
+        self.frames += len(detected)
+        if 'form_status' in columns:
+            self.good_form += int(np.count_nonzero(detected & (columns['form_status'] == 'Good Form')))
+        if 'posture_status' in columns:
+            self.good_posture += int(np.count_nonzero(detected & (columns['posture_status'] == 'Good Posture')))
+        for key, stats in self.metrics.items():
+            if key in columns:
+                values = columns[key][detected]
+                stats.update_many(values[~np.isnan(values)])
+
+    def render(self):
+        """Summary text for the frames seen so far"""
+        if not self.frames:
+            return ""
+
+        exercise = self.exercise
+        total_frames = self.frames
+        duration = (self.end_frame - self.first_frame) / self.fps if self.fps > 0 else 0
+        good_form_percentage = (self.good_form / total_frames) * 100
+        good_posture_percentage = (self.good_posture / total_frames) * 100
+        m = self.metrics
+
+        summary = f"=== VIDEO ANALYSIS SUMMARY ===\n"
+        summary += f"Exercise: {exercise.replace('_', ' ').title()}\n"
+        summary += f"Duration: {duration:.1f} seconds\n"
+        summary += f"Frames Analyzed: {total_frames}\n\n"
+
+        summary += f"FORM ANALYSIS:\n"
+        summary += f"• Good Form: {good_form_percentage:.1f}% ({self.good_form}/{total_frames} frames)\n"
+        summary += f"• Posture Quality: {good_posture_percentage:.1f}% good posture\n\n"
+
+        records = self.reps.records
+        if self.reps.thresholds is not None:
+            summary += f"REPS:\n"
+            summary += f"• Completed: {len(records)}\n"
+            if records:
+                count = len(records)
+                summary += (f"• Average Duration: {sum(r.duration for r in records) / count:.1f} s "
+                            f"(down {sum(r.eccentric for r in records) / count:.1f} s, "
+                            f"up {sum(r.concentric for r in records) / count:.1f} s)\n")
+                summary += (f"• Average Range of Motion: {sum(r.min_angle for r in records) / count:.1f}° - "
+                            f"{sum(r.max_angle for r in records) / count:.1f}°\n")
+            summary += "\n"
+
+        rule = EXERCISES.get(exercise)
+        if rule and all(m[check.key].count for check in rule.checks):
+            summary += f"{rule.title.upper()} METRICS:\n"
+            for check in rule.checks:
+                stats = m[check.key]
+                summary += f"• Average {check.label}: {stats.mean:.1f}° (±{stats.std:.1f}°)\n"
+                summary += (f"• {check.label} Range: {stats.min:.1f}° - {stats.max:.1f}° "
+                            f"(recommended {check.low}° - {check.high}°)\n")
+            summary += "\n"
+
+        if rule:
+            joints = [joint for joint in dict.fromkeys(check.joint for check in rule.checks)
+                      if m[asymmetry_key(joint)].count]
+            if joints:
+                summary += f"LEFT/RIGHT SYMMETRY:\n"
+                for joint in joints:
+                    stats = m[asymmetry_key(joint)]
+                    summary += (f"• {joint.title()} Difference: {stats.mean:.1f}° average, "
+                                f"{stats.max:.1f}° max ({stats.count} frames with both sides visible)\n")
+                summary += "\n"
+
+        # Recommendations
+        summary += f"RECOMMENDATIONS:\n"
+        if good_form_percentage < 80:
+            summary += f"• Focus on maintaining proper form throughout the movement\n"
+        if good_posture_percentage < 80:
+            summary += f"• Work on body alignment and posture\n"
+        if good_form_percentage >= 90:
+            summary += f"• Excellent form consistency!\n"
+
+        summary += f"\nAnalysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+        return summary